@@ -20,6 +20,10 @@ class Settings(BaseSettings):
     debug: bool = True
     database_url: str = "sqlite:///./hord_manager.db"
     secret_key: str = "CHANGE_ME"
+    ledger_check_interval_seconds: float = 3600  # background ledger integrity check; 0 disables it
+    inbox_archive_interval_seconds: float = 3600  # background inbox archival; 0 disables it
+    # Settled messages untouched this long leave the live inbox
+    inbox_archive_after_days: float = 30
 
     # Pylance may not resolve SettingsConfigDict type when fallback is active; ignore type.
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")  # type: ignore[arg-type]
@@ -1,13 +1,37 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .core.database import engine, Base
-from .utils.migrations import ensure_migrations, get_migration_status
-from .routers import health, sessions, currencies, gm, gemstones, art, real_estate, businesses, metals, materials, auth, data_management, data_management
-from .models import gemstone as _gemstone_models  # noqa: F401 ensure table registration
+
+from .core.config import get_settings
+from .core.database import SessionLocal, engine
 from .models import art as _art_models  # noqa: F401 ensure table registration
 from .models import business as _business_models  # noqa: F401 ensure table registration
-from .models import metal as _metal_models  # noqa: F401 ensure table registration
+from .models import gemstone as _gemstone_models  # noqa: F401 ensure table registration
+from .models import income as _income_models  # noqa: F401 ensure table registration
+from .models import ledger as _ledger_models  # noqa: F401 ensure table registration
+from .models import loan as _loan_models  # noqa: F401 ensure table registration
 from .models import material as _material_models  # noqa: F401 ensure table registration
+from .models import metal as _metal_models  # noqa: F401 ensure table registration
+from .models import portfolio as _portfolio_models  # noqa: F401 ensure table registration
+from .routers import (
+    art,
+    auth,
+    banking,
+    businesses,
+    currencies,
+    data_management,
+    gemstones,
+    gm,
+    health,
+    materials,
+    metals,
+    players,
+    real_estate,
+    sessions,
+)
+from .services.inbox_archive import start_inbox_archiver
+from .services.ledger import start_integrity_checker
+from .utils.migrations import ensure_migrations, get_migration_status
+from .utils.pagination import NEXT_CURSOR_HEADER
 
 # Alembic manages schema; create_all removed.
 
@@ -26,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # keyset pagination token on list endpoints
 )
 
 _migration_status_cache = {}
@@ -35,6 +60,36 @@ def _check_migrations():  # pragma: no cover simple startup hook
     global _migration_status_cache
     _migration_status_cache = ensure_migrations(engine)
 
+_ledger_checker_stop = None
+
+@app.on_event("startup")
+def _start_ledger_checker():  # pragma: no cover simple startup hook
+    global _ledger_checker_stop
+    _ledger_checker_stop = start_integrity_checker(
+        SessionLocal, get_settings().ledger_check_interval_seconds
+    )
+
+
+@app.on_event("shutdown")
+def _stop_ledger_checker():  # pragma: no cover simple shutdown hook
+    if _ledger_checker_stop is not None:
+        _ledger_checker_stop.set()
+
+_inbox_archiver_stop = None
+
+@app.on_event("startup")
+def _start_inbox_archiver():  # pragma: no cover simple startup hook
+    global _inbox_archiver_stop
+    settings = get_settings()
+    _inbox_archiver_stop = start_inbox_archiver(
+        SessionLocal, settings.inbox_archive_interval_seconds, settings.inbox_archive_after_days
+    )
+
+@app.on_event("shutdown")
+def _stop_inbox_archiver():  # pragma: no cover simple shutdown hook
+    if _inbox_archiver_stop is not None:
+        _inbox_archiver_stop.set()
+
 migration_router = APIRouter(prefix="/health", tags=["health"])
 
 @migration_router.get("/migrations")
@@ -56,6 +111,8 @@ app.include_router(metals.router)
 app.include_router(materials.router)
 app.include_router(auth.router)
 app.include_router(data_management.router)
+app.include_router(players.router)
+app.include_router(banking.router)
 app.include_router(migration_router)
 
 @app.get("/")
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Float, DateTime, ForeignKey, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.database import Base
@@ -6,6 +6,10 @@ from ..core.database import Base
 
 class ArtItem(Base):
     __tablename__ = "art_items"
+    __table_args__ = (
+        Index("ix_art_items_created_at", "created_at"),
+        Index("ix_art_items_player_created_at", "player_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     player_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("players.id", ondelete="SET NULL"), nullable=True)
@@ -19,6 +23,10 @@ class ArtItem(Base):
 
 class RealEstateProperty(Base):
     __tablename__ = "real_estate_properties"
+    __table_args__ = (
+        Index("ix_real_estate_properties_created_at", "created_at"),
+        Index("ix_real_estate_properties_player_created_at", "player_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     player_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("players.id", ondelete="SET NULL"), nullable=True)
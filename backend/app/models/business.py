@@ -1,11 +1,13 @@
-from sqlalchemy import Integer, String, Float, DateTime, ForeignKey, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.database import Base
 from .player import Player  # noqa: F401
 
+
 class Business(Base):
     __tablename__ = "businesses"
+    __table_args__ = (Index("ix_businesses_created_at", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String, index=True)
@@ -22,6 +24,10 @@ class Business(Base):
 
 class BusinessInvestor(Base):
     __tablename__ = "business_investors"
+    __table_args__ = (
+        Index("ix_business_investors_business_player", "business_id", "player_id"),
+        Index("ix_business_investors_player_business", "player_id", "business_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     business_id: Mapped[int] = mapped_column(Integer, ForeignKey("businesses.id", ondelete="CASCADE"))
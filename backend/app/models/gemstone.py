@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Float, DateTime, ForeignKey, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, false, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.database import Base
@@ -19,12 +19,18 @@ class Gemstone(Base):
 
 class PlayerGemstone(Base):
     __tablename__ = "player_gemstones"
+    __table_args__ = (
+        Index("ix_player_gemstones_player_created_at", "player_id", "created_at"),
+        Index("ix_player_gemstones_gemstone_id", "gemstone_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     player_id: Mapped[int] = mapped_column(Integer, ForeignKey("players.id", ondelete="CASCADE"))
     gemstone_id: Mapped[int] = mapped_column(Integer, ForeignKey("gemstones.id", ondelete="CASCADE"))
     carats: Mapped[float] = mapped_column(Float, default=0.0)
     appraised_value_oz_gold: Mapped[float] = mapped_column(Float, default=0.0)
+    # Manually appraised holdings keep their value when the catalog price changes
+    manual_appraisal: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -1,8 +1,20 @@
 from enum import Enum
-from sqlalchemy import Integer, String, Boolean, DateTime, ForeignKey, func, JSON
-from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import TYPE_CHECKING
 
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
 from ..core.database import Base
 
 if TYPE_CHECKING:
@@ -24,13 +36,32 @@ class InboxMessageStatus(str, Enum):
     RESOLVED = "resolved"
 
 
+# Payload keys the GM filters on, surfaced as VIRTUAL generated columns so SQLite can index them.
+# The amount is whichever of the request forms' amount keys is present.
+PAYLOAD_PLAYER_ID = "json_extract(payload, '$.player_id')"
+PAYLOAD_ITEM_TYPE = "json_extract(payload, '$.item_type')"
+PAYLOAD_AMOUNT = (
+    "CAST(coalesce("
+    "json_extract(payload, '$.amount_requested'), "
+    "json_extract(payload, '$.requested_amount'), "
+    "json_extract(payload, '$.investment_amount'), "
+    "json_extract(payload, '$.initial_investment_oz_gold')"
+    ") AS REAL)"
+)
+
+
 class GMSettings(Base):
     __tablename__ = "gm_settings"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     # Economic controls
     exchange_fee_percent: Mapped[float] = mapped_column(default=0.0)
+    # Per session, on bank balances
     interest_rate_percent: Mapped[float] = mapped_column(default=0.0)
+    # "session" or "simple"
+    interest_compounding: Mapped[str] = mapped_column(
+        String, default="session", server_default="session"
+    )
     growth_factor_percent: Mapped[float] = mapped_column(default=0.0)
     # Feature flags / visibility
     hide_dollar_from_players: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -41,6 +72,16 @@ class GMSettings(Base):
 
 class InboxMessage(Base):
     __tablename__ = "inbox_messages"
+    __table_args__ = (
+        Index("ix_inbox_messages_created_at", "created_at"),
+        Index("ix_inbox_messages_status_created_at", "status", "created_at"),
+        Index("ix_inbox_messages_player_created_at", "player_id", "created_at"),
+        Index("ix_inbox_messages_payload_player_created_at", "payload_player_id", "created_at"),
+        Index("ix_inbox_messages_item_type_created_at", "payload_item_type", "created_at"),
+        Index("ix_inbox_messages_payload_amount", "payload_amount"),
+        # Archived messages keep their ids; AUTOINCREMENT stops SQLite handing them out again
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     type: Mapped[str] = mapped_column(String, index=True)
@@ -49,6 +90,48 @@ class InboxMessage(Base):
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     player_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("players.id", ondelete="SET NULL"), nullable=True)
+    # Derived from payload by SQLite; never written
+    payload_player_id: Mapped[int | None] = mapped_column(
+        Integer, Computed(PAYLOAD_PLAYER_ID, persisted=False)
+    )
+    payload_item_type: Mapped[str | None] = mapped_column(
+        String, Computed(PAYLOAD_ITEM_TYPE, persisted=False)
+    )
+    payload_amount: Mapped[float | None] = mapped_column(
+        Float, Computed(PAYLOAD_AMOUNT, persisted=False)
+    )
 
     # Relationship to Player
     player: Mapped["Player"] = relationship("Player")
+
+
+class ArchivedInboxMessage(Base):
+    """A settled inbox message the archiver moved out of ``inbox_messages``, keeping its id."""
+
+    __tablename__ = "inbox_archive"
+    __table_args__ = (
+        Index("ix_inbox_archive_created_at", "created_at"),
+        Index("ix_inbox_archive_player_created_at", "player_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    type: Mapped[str] = mapped_column(String, index=True)
+    status: Mapped[str] = mapped_column(String)
+    payload: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[str] = mapped_column(DateTime(timezone=True))
+    player_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("players.id", ondelete="SET NULL"), nullable=True
+    )
+    archived_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    payload_player_id: Mapped[int | None] = mapped_column(
+        Integer, Computed(PAYLOAD_PLAYER_ID, persisted=False)
+    )
+    payload_item_type: Mapped[str | None] = mapped_column(
+        String, Computed(PAYLOAD_ITEM_TYPE, persisted=False)
+    )
+    payload_amount: Mapped[float | None] = mapped_column(
+        Float, Computed(PAYLOAD_AMOUNT, persisted=False)
+    )
+
+    player: Mapped["Player"] = relationship("Player")
@@ -0,0 +1,29 @@
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.database import Base
+from .player import Player  # noqa: F401
+
+
+class IncomeAccrual(Base):
+    """Income credited to a player for one session from one source (a business or a property)."""
+    __tablename__ = "income_accruals"
+    __table_args__ = (
+        # One accrual per source and player per session, so re-running a session cannot double-pay
+        UniqueConstraint(
+            "session_number",
+            "source_type",
+            "source_id",
+            "player_id",
+            name="uq_income_accruals_source",
+        ),
+        Index("ix_income_accruals_player_session", "player_id", "session_number"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    session_number: Mapped[int] = mapped_column(Integer)
+    player_id: Mapped[int] = mapped_column(Integer, ForeignKey("players.id", ondelete="CASCADE"))
+    source_type: Mapped[str] = mapped_column(String)  # "business" or "real_estate"
+    source_id: Mapped[int] = mapped_column(Integer)
+    amount_oz_gold: Mapped[float] = mapped_column(Float, default=0.0)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
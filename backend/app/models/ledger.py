@@ -0,0 +1,46 @@
+from sqlalchemy import DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.database import Base
+
+UNITS_PER_OZ = 1_000_000  # ledger amounts are whole micro-ounces of gold, so sums reconcile exactly
+
+
+class LedgerEntry(Base):
+    """One leg of a balanced ledger transaction.
+
+    Append-only: corrections are posted as new transactions.
+    """
+
+    __tablename__ = "ledger_entries"
+    __table_args__ = (
+        # Statements are keyset pages over one account ordered by (created_at, id)
+        Index("ix_ledger_entries_account_created", "account", "created_at", "id"),
+        Index("ix_ledger_entries_transaction", "transaction_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    transaction_id: Mapped[str] = mapped_column(String)
+    # "player:<id>" or one of the bank's own "bank:<name>" accounts
+    account: Mapped[str] = mapped_column(String)
+    kind: Mapped[str] = mapped_column(String)  # "deposit", "withdrawal", ...
+    units: Mapped[int] = mapped_column(Integer)  # signed; the legs of a transaction sum to zero
+    memo: Mapped[str | None] = mapped_column(String, nullable=True)
+    session_number: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    @property
+    def amount_oz_gold(self) -> float:
+        return self.units / UNITS_PER_OZ
+
+
+class AccountBalance(Base):
+    """Running balance per account, moved in the same transaction as the entries that change it."""
+    __tablename__ = "account_balances"
+
+    account: Mapped[str] = mapped_column(String, primary_key=True)
+    units: Mapped[int] = mapped_column(Integer, default=0)
+    entries: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
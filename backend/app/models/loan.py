@@ -0,0 +1,54 @@
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.database import Base
+from .ledger import UNITS_PER_OZ
+from .player import Player  # noqa: F401
+
+
+class Loan(Base):
+    """A loan granted by the bank. Amounts are micro-ounces, like the ledger it posts to."""
+    __tablename__ = "loans"
+    __table_args__ = (
+        # Session advance picks up every active loan in one scan
+        Index("ix_loans_status", "status"),
+        Index("ix_loans_player_id", "player_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    player_id: Mapped[int] = mapped_column(Integer, ForeignKey("players.id", ondelete="CASCADE"))
+    inbox_message_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("inbox_messages.id", ondelete="SET NULL"), nullable=True
+    )
+    principal_units: Mapped[int] = mapped_column(Integer)
+    rate_percent: Mapped[float] = mapped_column(Float, default=0.0)  # per session
+    term_sessions: Mapped[int] = mapped_column(Integer)
+    payment_type: Mapped[str] = mapped_column(String, default="per_session")  # or "lump_sum"
+    interest_method: Mapped[str] = mapped_column(String, default="flat")  # or "declining"
+    # Fixed per-session payment; 0 for lump sums
+    payment_units: Mapped[int] = mapped_column(Integer, default=0)
+    balance_units: Mapped[int] = mapped_column(Integer)  # outstanding, interest included
+    periods_paid: Mapped[int] = mapped_column(Integer, default=0)
+    interest_paid_units: Mapped[int] = mapped_column(Integer, default=0)
+    status: Mapped[str] = mapped_column(String, default="active")  # or "paid_off"
+    start_session: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    @property
+    def principal_oz_gold(self) -> float:
+        return self.principal_units / UNITS_PER_OZ
+
+    @property
+    def payment_oz_gold(self) -> float:
+        return self.payment_units / UNITS_PER_OZ
+
+    @property
+    def balance_oz_gold(self) -> float:
+        return self.balance_units / UNITS_PER_OZ
+
+    @property
+    def interest_paid_oz_gold(self) -> float:
+        return self.interest_paid_units / UNITS_PER_OZ
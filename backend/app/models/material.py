@@ -1,9 +1,19 @@
-from sqlalchemy import Integer, String, Float, DateTime, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
+
 from ..core.database import Base
+from .player import Player  # noqa: F401
+
 
 class MaterialPriceHistory(Base):
     __tablename__ = "material_price_history"
+    __table_args__ = (
+        Index(
+            "ix_material_price_history_name_unit_created_at", "material_name", "unit", "created_at"
+        ),
+        Index("ix_material_price_history_session_created_at", "session_number", "created_at"),
+        Index("ix_material_price_history_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     material_name: Mapped[str] = mapped_column(String, index=True)
@@ -11,4 +21,23 @@ class MaterialPriceHistory(Base):
     price_per_unit_usd: Mapped[float] = mapped_column(Float)
     price_per_oz_gold: Mapped[float] = mapped_column(Float)
     session_number: Mapped[int] = mapped_column(Integer, index=True)
-    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class PlayerMaterialHolding(Base):
+    """A quantity of material owned by a player; valued against the latest material price."""
+    __tablename__ = "player_material_holdings"
+    __table_args__ = (
+        Index("ix_player_material_holdings_player_created_at", "player_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    player_id: Mapped[int] = mapped_column(Integer, ForeignKey("players.id", ondelete="CASCADE"))
+    material_name: Mapped[str] = mapped_column(String, index=True)
+    quantity: Mapped[float] = mapped_column(Float, default=0.0)
+    # oz, lb, kg, ton or the price's own unit
+    unit: Mapped[str] = mapped_column(String, default="lb")
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -1,9 +1,17 @@
-from sqlalchemy import Integer, String, Float, DateTime, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
+
 from ..core.database import Base
+from .player import Player  # noqa: F401
+
 
 class MetalPriceHistory(Base):
     __tablename__ = "metal_price_history"
+    __table_args__ = (
+        Index("ix_metal_price_history_name_unit_created_at", "metal_name", "unit", "created_at"),
+        Index("ix_metal_price_history_session_created_at", "session_number", "created_at"),
+        Index("ix_metal_price_history_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     metal_name: Mapped[str] = mapped_column(String, index=True)
@@ -12,3 +20,22 @@ class MetalPriceHistory(Base):
     price_per_oz_gold: Mapped[float] = mapped_column(Float)
     session_number: Mapped[int] = mapped_column(Integer, index=True)
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class PlayerMetalHolding(Base):
+    """A quantity of metal owned by a player; valued against the latest metal price."""
+    __tablename__ = "player_metal_holdings"
+    __table_args__ = (
+        Index("ix_player_metal_holdings_player_created_at", "player_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    player_id: Mapped[int] = mapped_column(Integer, ForeignKey("players.id", ondelete="CASCADE"))
+    metal_name: Mapped[str] = mapped_column(String, index=True)
+    quantity: Mapped[float] = mapped_column(Float, default=0.0)
+    # oz, lb, kg, ton or the price's own unit
+    unit: Mapped[str] = mapped_column(String, default="oz")
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -1,7 +1,11 @@
-from sqlalchemy import Integer, String, DateTime, func, Boolean
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
+
 from ..core.database import Base
 
+
 class Player(Base):
     __tablename__ = "players"
 
@@ -10,5 +14,5 @@ class Player(Base):
     password_hash: Mapped[str | None] = mapped_column(String, nullable=True)  # For new accounts
     is_approved: Mapped[bool] = mapped_column(Boolean, default=False)  # GM approval status
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    approved_at: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    approved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
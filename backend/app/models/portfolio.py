@@ -0,0 +1,33 @@
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.database import Base
+
+
+class PlayerPortfolioTotal(Base):
+    """Read model: one row per (player, holding category), kept current by the write paths."""
+    __tablename__ = "player_portfolio_totals"
+
+    player_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True
+    )
+    category: Mapped[str] = mapped_column(String, primary_key=True)
+    value_oz_gold: Mapped[float] = mapped_column(Float, default=0.0)
+    items: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[str] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class NetWorthHistory(Base):
+    """Per-session snapshot of player_portfolio_totals, written when the session advances."""
+    __tablename__ = "net_worth_history"
+
+    # (player_id, session_number) leads the key so a player's series is one range scan
+    player_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True
+    )
+    session_number: Mapped[int] = mapped_column(Integer, primary_key=True)
+    category: Mapped[str] = mapped_column(String, primary_key=True)
+    value_oz_gold: Mapped[float] = mapped_column(Float, default=0.0)
+    items: Mapped[int] = mapped_column(Integer, default=0)
@@ -7,5 +7,7 @@ class GlobalState(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     current_session: Mapped[int] = mapped_column(Integer, default=0)
+    # Bumped by each sessions reset, so session-keyed records (interest) start afresh
+    reset_epoch: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+
 from ..core.database import get_db
 from ..models.art import ArtItem
 from ..schemas.common import ArtItemCreate, ArtItemRead, ArtItemUpdate
+from ..services.portfolio import apply_deltas, holding_change
+from ..utils.pagination import MAX_PAGE_SIZE, paginate, set_next_cursor
 
 router = APIRouter(prefix="/art", tags=["art"]) 
 
@@ -14,24 +17,45 @@ def create_art(payload: ArtItemCreate, db: Session = Depends(get_db)):
         player_id=payload.player_id,
     )
     db.add(art)
+    apply_deltas(db, holding_change("art", None, 0.0, payload.player_id, 0.0))
     db.commit()
     db.refresh(art)
     return art
 
 @router.get("/", response_model=list[ArtItemRead])
-def list_art(db: Session = Depends(get_db)):
-    items = db.query(ArtItem).all()
-    return items
+def list_art(
+    response: Response,
+    player_id: int | None = Query(None, description="Only items owned by this player"),
+    pending_appraisal: bool | None = Query(None, description="Filter by appraisal status"),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to return every row"
+    ),
+    db: Session = Depends(get_db),
+):
+    query = db.query(ArtItem)
+    if player_id is not None:
+        query = query.filter(ArtItem.player_id == player_id)
+    if pending_appraisal is not None:
+        query = query.filter(ArtItem.pending_appraisal == int(pending_appraisal))
+    page = paginate(query, ArtItem, cursor, limit)
+    set_next_cursor(response, page.next_cursor)
+    return page.items
 
 @router.patch("/{art_id}", response_model=ArtItemRead)
 def patch_art(art_id: int, payload: ArtItemUpdate, db: Session = Depends(get_db)):
     art = db.query(ArtItem).filter(ArtItem.id == art_id).first()
     if not art:
         raise HTTPException(status_code=404, detail="Art item not found")
+    old_player_id, old_value = art.player_id, art.appraised_value_oz_gold
     data = payload.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(art, field, value)
     db.add(art)
+    apply_deltas(
+        db,
+        holding_change("art", old_player_id, old_value, art.player_id, art.appraised_value_oz_gold),
+    )
     db.commit()
     db.refresh(art)
     return art
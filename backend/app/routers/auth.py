@@ -1,16 +1,18 @@
+import hashlib
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-import hashlib
 
 from ..core.database import get_db
-from ..models.player import Player
 from ..models.gm import InboxMessage
+from ..models.player import Player
 from ..schemas.common import (
-    PlayerRegistrationCreate, 
-    PlayerRegistrationRead, 
-    PlayerLoginRequest, 
-    PlayerLoginResponse
+    PlayerLoginRequest,
+    PlayerLoginResponse,
+    PlayerRegistrationCreate,
+    PlayerRegistrationRead,
 )
+from ..services.inbox_events import publish_inbox_change
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -67,6 +69,8 @@ def register_player(payload: PlayerRegistrationCreate, db: Session = Depends(get
     
     db.add(inbox_message)
     db.commit()
+    db.refresh(inbox_message)
+    publish_inbox_change("created", inbox_message)
     
     return {
         "success": True, 
@@ -133,7 +137,7 @@ def approve_registration(player_id: int, db: Session = Depends(get_db)):
     # Approve the player
     player.is_approved = True
     from datetime import datetime
-    player.approved_at = datetime.utcnow().isoformat()
+    player.approved_at = datetime.utcnow()
     
     db.add(player)
     db.commit()
@@ -0,0 +1,204 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db
+from ..models.gm import InboxMessage
+from ..models.ledger import UNITS_PER_OZ
+from ..models.loan import Loan
+from ..models.player import Player
+from ..schemas.common import (
+    BankAccountRead,
+    BankTransactionCreate,
+    LedgerEntryRead,
+    LedgerIntegrityRead,
+    LoanCreate,
+    LoanQuoteRead,
+    LoanQuoteRequest,
+    LoanRead,
+    LoanScheduleRead,
+    LoanTermsCreate,
+)
+from ..services.ledger import (
+    BANK_CASH,
+    LedgerError,
+    check_integrity,
+    get_balance,
+    player_account,
+    statement,
+    to_units,
+    transfer,
+)
+from ..services.loans import (
+    LoanTerms,
+    amortization_schedule,
+    loan_account,
+    loan_terms,
+    originate_loan,
+)
+from ..services.session_state import current_session
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, set_next_cursor
+
+router = APIRouter(prefix="/banking", tags=["banking"])
+
+
+def _require_player(db: Session, player_id: int) -> Player:
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return player
+
+
+def _account_read(db: Session, player_id: int) -> BankAccountRead:
+    account = player_account(player_id)
+    units, entries = get_balance(db, account)
+    return BankAccountRead(
+        player_id=player_id, account=account, balance_oz_gold=units / UNITS_PER_OZ, entries=entries
+    )
+
+
+def _move(
+    db: Session, player_id: int, kind: str, payload: BankTransactionCreate, deposit: bool
+) -> BankAccountRead:
+    _require_player(db, player_id)
+    units = to_units(payload.amount_oz_gold)
+    if units <= 0:
+        raise HTTPException(status_code=400, detail="Amount is below the smallest ledger unit")
+    account = player_account(player_id)
+    source, destination = (BANK_CASH, account) if deposit else (account, BANK_CASH)
+    try:
+        transfer(
+            db,
+            kind,
+            source,
+            destination,
+            units,
+            payload.memo,
+            current_session(db),
+            allow_overdraft=deposit,
+        )
+    except LedgerError as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
+    db.commit()
+    return _account_read(db, player_id)
+
+
+@router.get("/players/{player_id}/account", response_model=BankAccountRead)
+def get_account(player_id: int, db: Session = Depends(get_db)):
+    """Current balance, read from the maintained balance row."""
+    _require_player(db, player_id)
+    return _account_read(db, player_id)
+
+
+@router.post("/players/{player_id}/deposit", response_model=BankAccountRead)
+def deposit(player_id: int, payload: BankTransactionCreate, db: Session = Depends(get_db)):
+    return _move(db, player_id, "deposit", payload, deposit=True)
+
+
+@router.post("/players/{player_id}/withdraw", response_model=BankAccountRead)
+def withdraw(player_id: int, payload: BankTransactionCreate, db: Session = Depends(get_db)):
+    return _move(db, player_id, "withdrawal", payload, deposit=False)
+
+
+@router.get("/players/{player_id}/statement", response_model=list[LedgerEntryRead])
+def get_statement(
+    player_id: int,
+    response: Response,
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """Ledger entries for the player's account, newest first."""
+    _require_player(db, player_id)
+    page = statement(db, player_account(player_id), cursor, limit)
+    set_next_cursor(response, page.next_cursor)
+    return page.items
+
+
+@router.get("/integrity", response_model=LedgerIntegrityRead)
+def get_integrity(db: Session = Depends(get_db)):
+    """Run the ledger integrity check now (it also runs periodically in the background)."""
+    return check_integrity(db)
+
+
+def _terms(payload: LoanTermsCreate) -> LoanTerms:
+    return LoanTerms(
+        to_units(payload.principal_oz_gold),
+        payload.rate_percent,
+        payload.term_sessions,
+        payload.payment_type,
+        payload.interest_method,
+    )
+
+
+def _require_loan(db: Session, loan_id: int) -> Loan:
+    loan = db.query(Loan).filter(Loan.id == loan_id).first()
+    if not loan:
+        raise HTTPException(status_code=404, detail="Loan not found")
+    return loan
+
+
+@router.post("/loans/quote", response_model=LoanQuoteRead)
+def quote_loans(payload: LoanQuoteRequest):
+    """Full amortization schedules for one or more candidate offers, for side-by-side comparison."""
+    return {"offers": [amortization_schedule(_terms(offer)) for offer in payload.offers]}
+
+
+@router.post("/loans", response_model=LoanRead)
+def create_loan(payload: LoanCreate, db: Session = Depends(get_db)):
+    """Grant a loan and pay the principal into the player's account."""
+    _require_player(db, payload.player_id)
+    if (
+        payload.inbox_message_id is not None
+        and db.get(InboxMessage, payload.inbox_message_id) is None
+    ):
+        raise HTTPException(status_code=404, detail="Message not found")
+    loan = originate_loan(
+        db, payload.player_id, _terms(payload), current_session(db), payload.inbox_message_id
+    )
+    db.commit()
+    db.refresh(loan)
+    return loan
+
+
+@router.get("/loans", response_model=list[LoanRead])
+def list_loans(
+    player_id: int | None = Query(None, description="Only loans to this player"),
+    status: str | None = Query(None, description="Filter by loan status (active, paid_off)"),
+    db: Session = Depends(get_db),
+):
+    query = db.query(Loan)
+    if player_id is not None:
+        query = query.filter(Loan.player_id == player_id)
+    if status is not None:
+        query = query.filter(Loan.status == status)
+    return query.order_by(Loan.id).all()
+
+
+@router.get("/loans/{loan_id}", response_model=LoanRead)
+def get_loan(loan_id: int, db: Session = Depends(get_db)):
+    return _require_loan(db, loan_id)
+
+
+@router.get("/loans/{loan_id}/schedule", response_model=LoanScheduleRead)
+def get_loan_schedule(loan_id: int, db: Session = Depends(get_db)):
+    """The sessions still to come on this loan, from its current balance."""
+    loan = _require_loan(db, loan_id)
+    if loan.status != "active":
+        return amortization_schedule(loan_terms(loan), 0, loan.term_sessions)
+    return amortization_schedule(loan_terms(loan), loan.balance_units, loan.periods_paid)
+
+
+@router.get("/loans/{loan_id}/statement", response_model=list[LedgerEntryRead])
+def get_loan_statement(
+    loan_id: int,
+    response: Response,
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """Disbursal, interest and repayments posted against the loan, newest first."""
+    _require_loan(db, loan_id)
+    page = statement(db, loan_account(loan_id), cursor, limit)
+    set_next_cursor(response, page.next_cursor)
+    return page.items
@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
+from sqlalchemy.orm import Session
+
 from ..core.database import get_db
 from ..models.business import Business, BusinessInvestor
-from ..models.player import Player
 from ..models.gm import InboxMessage
+from ..models.player import Player
 from ..schemas.common import (
     BusinessCreate,
+    BusinessInvestorRead,
+    BusinessInvestorUpsert,
+    BusinessPetitionCreate,
     BusinessRead,
     BusinessUpdate,
-    BusinessInvestorUpsert,
-    BusinessInvestorRead,
     BusinessWithInvestorsRead,
-    BusinessPetitionCreate,
 )
+from ..services.inbox_events import publish_inbox_change
+from ..services.payouts import preview_payouts
+from ..services.portfolio import apply_deltas, snapshot_change
+from ..utils.pagination import MAX_PAGE_SIZE, paginate, set_next_cursor
 
 router = APIRouter(prefix="/businesses", tags=["businesses"]) 
 
+
+def _equity_values(b: Business) -> dict[int, float]:
+    """Each investor's share of the business net worth, for portfolio total deltas."""
+    return {i.player_id: i.equity_percent / 100.0 * b.net_worth_oz_gold for i in b.investors}
+
 @router.post("/", response_model=BusinessRead)
 def create_business(payload: BusinessCreate, db: Session = Depends(get_db)):
     # Simple duplicate name prevention
@@ -37,9 +47,27 @@ def create_business(payload: BusinessCreate, db: Session = Depends(get_db)):
     return b
 
 @router.get("/", response_model=list[BusinessRead])
-def list_businesses(db: Session = Depends(get_db)):
-    businesses = db.query(Business).all()
-    return businesses
+def list_businesses(
+    response: Response,
+    player_id: int | None = Query(None, description="Only businesses this player has invested in"),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to return every row"
+    ),
+    db: Session = Depends(get_db),
+):
+    query = db.query(Business)
+    if player_id is not None:
+        query = query.filter(
+            select(BusinessInvestor.id)
+            .where(
+                BusinessInvestor.business_id == Business.id, BusinessInvestor.player_id == player_id
+            )
+            .exists()
+        )
+    page = paginate(query, Business, cursor, limit)
+    set_next_cursor(response, page.next_cursor)
+    return page.items
 
 @router.get("/{business_id}", response_model=BusinessWithInvestorsRead)
 def get_business(business_id: int, db: Session = Depends(get_db)):
@@ -75,10 +103,13 @@ def patch_business(business_id: int, payload: BusinessUpdate, db: Session = Depe
     b = db.query(Business).filter(Business.id == business_id).first()
     if not b:
         raise HTTPException(status_code=404, detail="Business not found")
+    before = _equity_values(b) if "net_worth_oz_gold" in payload.model_fields_set else None
     data = payload.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(b, field, value)
     db.add(b)
+    if before is not None:
+        apply_deltas(db, snapshot_change("businesses", before, _equity_values(b)))
     db.commit()
     db.refresh(b)
     return b
@@ -88,6 +119,7 @@ def upsert_investors(business_id: int, investors: list[BusinessInvestorUpsert],
     b = db.query(Business).filter(Business.id == business_id).first()
     if not b:
         raise HTTPException(status_code=404, detail="Business not found")
+    before = _equity_values(b)
     # Index existing by player_id
     existing = {inv.player_id: inv for inv in b.investors}
     for inv_payload in investors:
@@ -115,6 +147,7 @@ def upsert_investors(business_id: int, investors: list[BusinessInvestorUpsert],
     total_equity = sum(inv.equity_percent for inv in b.investors)
     if total_equity > 100.0001:  # tiny tolerance
         raise HTTPException(status_code=400, detail=f"Total equity percent exceeds 100 (got {total_equity})")
+    apply_deltas(db, snapshot_change("businesses", before, _equity_values(b)))
     db.commit()
     return [
         BusinessInvestorRead(
@@ -146,6 +179,7 @@ def remove_investor(
             break
     if not target:
         raise HTTPException(status_code=404, detail="Investor not found for business")
+    before = _equity_values(b)
     removed_equity = target.equity_percent
     b.investors.remove(target)
     db.flush()
@@ -163,6 +197,7 @@ def remove_investor(
     total_equity = sum(i.equity_percent for i in b.investors)
     if total_equity > 100.0001:
         raise HTTPException(status_code=400, detail=f"Total equity percent exceeds 100 after removal (got {total_equity})")
+    apply_deltas(db, snapshot_change("businesses", before, _equity_values(b)))
     db.commit()
     return [
         BusinessInvestorRead(
@@ -197,4 +232,13 @@ def create_business_petition(payload: BusinessPetitionCreate, db: Session = Depe
     )
     db.add(msg)
     db.commit()
+    db.refresh(msg)
+    publish_inbox_change("created", msg)
     return {"status": "accepted", "message_id": msg.id}
+
+
+@router.get("/payouts/preview")
+def preview_business_payouts(db: Session = Depends(get_db)):
+    """Dry run of next session's investor payouts; nothing is written."""
+    return preview_payouts(db)
+
@@ -30,6 +30,16 @@ class ConversionResponse(BaseModel):
     oz_gold_equivalent: float
 
 
+class ExchangeResponse(BaseModel):
+    amount: float
+    from_currency: str
+    to_currency: str
+    rate: float
+    fee_percent: float
+    fee_amount: float
+    converted_amount: float
+
+
 class ValueDisplayRequest(BaseModel):
     oz_gold_value: float
     target_currencies: Optional[List[str]] = None
@@ -299,6 +309,22 @@ async def convert_currency(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/exchange", response_model=ExchangeResponse)
+async def exchange_currency(
+    request: ConversionRequest,
+    db: Session = Depends(get_db)
+):
+    """Quote a bank exchange between two currencies, net of the GM's exchange fee."""
+    conversion_service = get_conversion_service(db)
+    
+    try:
+        return conversion_service.exchange(
+            request.amount, request.from_currency, request.to_currency
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/convert/from-gold")
 async def convert_from_gold(
     oz_gold: float,
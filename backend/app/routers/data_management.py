@@ -1,255 +1,197 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+import os
+import tempfile
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
 from ..core.database import get_db
-from ..models.player import Player
-from ..models.currency import Currency, CurrencyDenomination, PegType
-from ..models.gemstone import Gemstone
-from ..models.metal import MetalPriceHistory
-from ..models.material import MaterialPriceHistory
-from ..models.session import GlobalState
-import logging
+from ..services.backup import BackupError, create_backup_file, restore_from_file
+from ..services.bulk_import import ImportValidationError, import_document, parse_import_body
+from ..services.export import EXPORT_FORMATS, resolve_tables, stream_csv, stream_ndjson
+from ..services.portfolio import rebuild_portfolio_totals
+from ..services.seed import restore_defaults
+from ..services.ticker import price_ticker
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/data-management", tags=["data-management"])
 
+
+def _reset(db: Session, label: str, sections: list[str] | None = None) -> dict:
+    """Restore `sections` from the seed snapshot; nothing is changed if any step fails."""
+    try:
+        inserted = restore_defaults(db, sections)
+    except Exception as e:
+        logger.error(f"Error resetting {label.lower()}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error resetting {label.lower()}: {str(e)}")
+    logger.info(f"{label} reset to default successfully")
+    _refresh_ticker(db)
+    return {"message": f"{label} reset to default successfully", "rows_inserted": inserted}
+
+
+def _refresh_ticker(db: Session) -> None:
+    # The data changed under the live price board; a ticker failure must not fail the request
+    try:
+        price_ticker.reload(db)
+    except Exception as e:
+        logger.error(f"Error refreshing the price ticker: {e}")
+
+
 @router.post("/reset/users")
 async def reset_users_to_default(db: Session = Depends(get_db)):
     """Reset all users to default GM and Player accounts"""
-    try:
-        # Delete all existing users
-        db.execute(text("DELETE FROM players"))
-        
-
-        
-        # Add default users (simple player accounts)
-        default_users = [
-            {
-                "name": "gm",
-                "password_hash": "gm123",  # In production this should be hashed
-                "is_approved": True
-            },
-            {
-                "name": "player1", 
-                "password_hash": "player123",  # In production this should be hashed
-                "is_approved": True
-            }
-        ]
-        
-        for user_data in default_users:
-            new_user = Player(**user_data)
-            db.add(new_user)
-        
-        db.commit()
-        logger.info("Users reset to default successfully")
-        return {"message": "Users reset to default successfully"}
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error resetting users: {e}")
-        raise HTTPException(status_code=500, detail=f"Error resetting users: {str(e)}")
+    return _reset(db, "Users", ["users"])
 
 @router.post("/reset/currencies")
 async def reset_currencies_to_default(db: Session = Depends(get_db)):
     """Reset all currencies to default values"""
-    try:
-        # Delete all existing currencies
-        db.execute(text("DELETE FROM currencies"))
-        
-
-        
-        # Add default currency (only USD)
-        default_currencies = [
-            {"name": "USD", "rate": 1.0},
-        ]
-        
-        for currency_data in default_currencies:
-            # Create currency with proper peg structure
-            new_currency = Currency(
-                name=currency_data["name"],
-                peg_type=PegType.CURRENCY,
-                peg_target="USD",
-                base_unit_value=currency_data["rate"]
-            )
-            db.add(new_currency)
-        
-        db.commit()
-        logger.info("Currencies reset to default successfully")
-        return {"message": "Currencies reset to default successfully"}
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error resetting currencies: {e}")
-        raise HTTPException(status_code=500, detail=f"Error resetting currencies: {str(e)}")
+    return _reset(db, "Currencies", ["currencies"])
 
 @router.post("/reset/metals")
 async def reset_metals_to_default(db: Session = Depends(get_db)):
     """Reset all metal price history to default values"""
-    try:
-        # Delete all existing metal price history
-        db.execute(text("DELETE FROM metal_price_history"))
-        
-
-        
-        # Add 20 default metal prices for session 1
-        default_metals = [
-            {"metal_name": "Gold", "unit": "oz", "price_per_unit_usd": 2000.0, "price_per_oz_gold": 1.0, "session_number": 1},
-            {"metal_name": "Silver", "unit": "oz", "price_per_unit_usd": 25.0, "price_per_oz_gold": 0.0125, "session_number": 1},
-            {"metal_name": "Platinum", "unit": "oz", "price_per_unit_usd": 1000.0, "price_per_oz_gold": 0.5, "session_number": 1},
-            {"metal_name": "Steel", "unit": "lb", "price_per_unit_usd": 0.75, "price_per_oz_gold": 0.000375, "session_number": 1},
-            {"metal_name": "Lithium", "unit": "kg", "price_per_unit_usd": 185.0, "price_per_oz_gold": 0.0925, "session_number": 1},
-            {"metal_name": "Iron", "unit": "lb", "price_per_unit_usd": 0.8, "price_per_oz_gold": 0.0004, "session_number": 1},
-            {"metal_name": "Lead", "unit": "lb", "price_per_unit_usd": 1.20, "price_per_oz_gold": 0.0006, "session_number": 1},
-            {"metal_name": "Copper", "unit": "lb", "price_per_unit_usd": 4.0, "price_per_oz_gold": 0.002, "session_number": 1},
-            {"metal_name": "Aluminum", "unit": "lb", "price_per_unit_usd": 0.95, "price_per_oz_gold": 0.000475, "session_number": 1},
-            {"metal_name": "Tin", "unit": "lb", "price_per_unit_usd": 12.5, "price_per_oz_gold": 0.00625, "session_number": 1},
-            {"metal_name": "Zinc", "unit": "lb", "price_per_unit_usd": 1.35, "price_per_oz_gold": 0.000675, "session_number": 1},
-            {"metal_name": "Nickel", "unit": "lb", "price_per_unit_usd": 8.75, "price_per_oz_gold": 0.004375, "session_number": 1},
-            {"metal_name": "Cobalt", "unit": "lb", "price_per_unit_usd": 35.0, "price_per_oz_gold": 0.0175, "session_number": 1},
-            {"metal_name": "Titanium", "unit": "lb", "price_per_unit_usd": 15.0, "price_per_oz_gold": 0.0075, "session_number": 1},
-            {"metal_name": "Palladium", "unit": "oz", "price_per_unit_usd": 2300.0, "price_per_oz_gold": 1.15, "session_number": 1},
-            {"metal_name": "Rhodium", "unit": "oz", "price_per_unit_usd": 4500.0, "price_per_oz_gold": 2.25, "session_number": 1},
-            {"metal_name": "Brass", "unit": "lb", "price_per_unit_usd": 2.85, "price_per_oz_gold": 0.001425, "session_number": 1},
-            {"metal_name": "Bronze", "unit": "lb", "price_per_unit_usd": 3.20, "price_per_oz_gold": 0.0016, "session_number": 1},
-            {"metal_name": "Chromium", "unit": "lb", "price_per_unit_usd": 6.50, "price_per_oz_gold": 0.00325, "session_number": 1},
-            {"metal_name": "Magnesium", "unit": "lb", "price_per_unit_usd": 2.10, "price_per_oz_gold": 0.00105, "session_number": 1},
-        ]
-        
-        for metal_data in default_metals:
-            new_metal = MetalPriceHistory(**metal_data)
-            db.add(new_metal)
-        
-        db.commit()
-        logger.info("Metal prices reset to default successfully")
-        return {"message": "Metal prices reset to default successfully"}
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error resetting metals: {e}")
-        raise HTTPException(status_code=500, detail=f"Error resetting metals: {str(e)}")
+    return _reset(db, "Metal prices", ["metals"])
 
 @router.post("/reset/materials")
 async def reset_materials_to_default(db: Session = Depends(get_db)):
     """Reset all material price history to default values"""
-    try:
-        # Delete all existing material price history
-        db.execute(text("DELETE FROM material_price_history"))
-        
-
-        
-        # Add 20 default material prices for session 1
-        default_materials = [
-            {"material_name": "Wood", "unit": "board ft", "price_per_unit_usd": 2.50, "price_per_oz_gold": 0.00125, "session_number": 1},
-            {"material_name": "Carbon", "unit": "lb", "price_per_unit_usd": 15.0, "price_per_oz_gold": 0.0075, "session_number": 1},
-            {"material_name": "Cotton", "unit": "lb", "price_per_unit_usd": 0.75, "price_per_oz_gold": 0.000375, "session_number": 1},
-            {"material_name": "Flax", "unit": "lb", "price_per_unit_usd": 1.80, "price_per_oz_gold": 0.0009, "session_number": 1},
-            {"material_name": "Sulfur", "unit": "lb", "price_per_unit_usd": 0.25, "price_per_oz_gold": 0.000125, "session_number": 1},
-            {"material_name": "Stone", "unit": "ton", "price_per_unit_usd": 18.0, "price_per_oz_gold": 0.009, "session_number": 1},
-            {"material_name": "Silicon", "unit": "lb", "price_per_unit_usd": 1.20, "price_per_oz_gold": 0.0006, "session_number": 1},
-            {"material_name": "Gallium", "unit": "oz", "price_per_unit_usd": 450.0, "price_per_oz_gold": 0.225, "session_number": 1},
-            {"material_name": "Leather", "unit": "sq ft", "price_per_unit_usd": 6.25, "price_per_oz_gold": 0.003125, "session_number": 1},
-            {"material_name": "Wool", "unit": "lb", "price_per_unit_usd": 3.20, "price_per_oz_gold": 0.0016, "session_number": 1},
-            {"material_name": "Clay", "unit": "ton", "price_per_unit_usd": 25.0, "price_per_oz_gold": 0.0125, "session_number": 1},
-            {"material_name": "Sand", "unit": "ton", "price_per_unit_usd": 15.0, "price_per_oz_gold": 0.0075, "session_number": 1},
-            {"material_name": "Hemp", "unit": "lb", "price_per_unit_usd": 2.10, "price_per_oz_gold": 0.00105, "session_number": 1},
-            {"material_name": "Bamboo", "unit": "board ft", "price_per_unit_usd": 1.90, "price_per_oz_gold": 0.00095, "session_number": 1},
-            {"material_name": "Cork", "unit": "lb", "price_per_unit_usd": 4.50, "price_per_oz_gold": 0.00225, "session_number": 1},
-            {"material_name": "Rubber", "unit": "lb", "price_per_unit_usd": 1.45, "price_per_oz_gold": 0.000725, "session_number": 1},
-            {"material_name": "Glass", "unit": "lb", "price_per_unit_usd": 0.95, "price_per_oz_gold": 0.000475, "session_number": 1},
-            {"material_name": "Coal", "unit": "ton", "price_per_unit_usd": 65.0, "price_per_oz_gold": 0.0325, "session_number": 1},
-            {"material_name": "Oil", "unit": "barrel", "price_per_unit_usd": 75.0, "price_per_oz_gold": 0.0375, "session_number": 1},
-            {"material_name": "Phosphorus", "unit": "lb", "price_per_unit_usd": 2.80, "price_per_oz_gold": 0.0014, "session_number": 1},
-        ]
-        
-        for material_data in default_materials:
-            new_material = MaterialPriceHistory(**material_data)
-            db.add(new_material)
-        
-        db.commit()
-        logger.info("Material prices reset to default successfully")
-        return {"message": "Material prices reset to default successfully"}
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error resetting materials: {e}")
-        raise HTTPException(status_code=500, detail=f"Error resetting materials: {str(e)}")
+    return _reset(db, "Material prices", ["materials"])
 
 @router.post("/reset/gemstones")
 async def reset_gemstones_to_default(db: Session = Depends(get_db)):
     """Reset all gemstones to default values"""
-    try:
-        # Delete all existing gemstones
-        db.execute(text("DELETE FROM gemstones"))
-        
-
-        
-        # Add 20 default gemstones with realistic prices (in oz gold per carat)
-        default_gemstones = [
-            {"name": "Diamond", "value_per_carat_oz_gold": 2.62},
-            {"name": "Ruby", "value_per_carat_oz_gold": 1.58},
-            {"name": "Emerald", "value_per_carat_oz_gold": 1.42},
-            {"name": "Sapphire", "value_per_carat_oz_gold": 0.96},
-            {"name": "Amethyst", "value_per_carat_oz_gold": 0.19},
-            {"name": "Topaz", "value_per_carat_oz_gold": 0.27},
-            {"name": "Garnet", "value_per_carat_oz_gold": 0.15},
-            {"name": "Peridot", "value_per_carat_oz_gold": 0.12},
-            {"name": "Aquamarine", "value_per_carat_oz_gold": 0.44},
-            {"name": "Citrine", "value_per_carat_oz_gold": 0.08},
-            {"name": "Tourmaline", "value_per_carat_oz_gold": 0.22},
-            {"name": "Opal", "value_per_carat_oz_gold": 0.33},
-            {"name": "Turquoise", "value_per_carat_oz_gold": 0.06},
-            {"name": "Jade", "value_per_carat_oz_gold": 0.39},
-            {"name": "Onyx", "value_per_carat_oz_gold": 0.04},
-            {"name": "Moonstone", "value_per_carat_oz_gold": 0.10},
-            {"name": "Labradorite", "value_per_carat_oz_gold": 0.04},
-            {"name": "Tanzanite", "value_per_carat_oz_gold": 0.62},
-            {"name": "Alexandrite", "value_per_carat_oz_gold": 2.28},
-            {"name": "Spinel", "value_per_carat_oz_gold": 0.49}
-        ]
-        
-        for gemstone_data in default_gemstones:
-            new_gemstone = Gemstone(**gemstone_data)
-            db.add(new_gemstone)
-        
-        db.commit()
-        logger.info("Gemstones reset to default successfully")
-        return {"message": "Gemstones reset to default successfully"}
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error resetting gemstones: {e}")
-        raise HTTPException(status_code=500, detail=f"Error resetting gemstones: {str(e)}")
+    return _reset(db, "Gemstones", ["gemstones"])
 
 @router.post("/reset/sessions")
 async def reset_sessions_to_default(db: Session = Depends(get_db)):
     """Reset all sessions to default values"""
-    try:
-        # Delete all existing session state
-        db.execute(text("DELETE FROM global_state"))
-        
-
-        
-        # Add default session state
-        default_session = GlobalState(current_session=1)
-        db.add(default_session)
-        
-        db.commit()
-        logger.info("Sessions reset to default successfully")
-        return {"message": "Sessions reset to default successfully"}
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error resetting sessions: {e}")
-        raise HTTPException(status_code=500, detail=f"Error resetting sessions: {str(e)}")
+    return _reset(db, "Sessions", ["sessions"])
 
 @router.post("/reset/all")
 async def reset_all_data_to_default(db: Session = Depends(get_db)):
-    """Reset ALL data to default values"""
+    """Reset ALL data to default values in a single transaction"""
+    return _reset(db, "All data")
+
+
+@router.get("/backup")
+def download_backup(db: Session = Depends(get_db)):
+    """Stream a consistent snapshot of the campaign database (SQLite's online backup API)."""
+    try:
+        path = create_backup_file(db)
+    except BackupError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error creating backup: {e}")
+        raise HTTPException(status_code=500, detail=f"Error creating backup: {str(e)}")
+    filename = f"hord_manager-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.db"
+    return FileResponse(
+        path,
+        media_type="application/vnd.sqlite3",
+        filename=filename,
+        background=BackgroundTask(os.unlink, path),
+    )
+
+@router.post("/restore")
+async def restore_backup(request: Request, db: Session = Depends(get_db)):
+    """Replace the campaign database with an uploaded backup (the raw SQLite file as the body)."""
+    # Read the body on the event loop; disk writes and the SQLite restore go to the threadpool
+    fd, path = tempfile.mkstemp(prefix="hord_restore_", suffix=".db")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            async for chunk in request.stream():
+                await run_in_threadpool(fh.write, chunk)
+        pages = await run_in_threadpool(restore_from_file, db, path)
+    except BackupError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error restoring backup: {e}")
+        raise HTTPException(status_code=500, detail=f"Error restoring backup: {str(e)}")
+    finally:
+        os.unlink(path)
+    logger.info("Database restored from uploaded backup")
+    await run_in_threadpool(_refresh_ticker, db)
+    return {"message": "Database restored from backup successfully", "pages": pages}
+
+
+@router.get("/export")
+def export_data(
+    tables: list[str] | None = Query(
+        None, description="Tables to export (repeat the parameter); default is every table"
+    ),
+    export_format: str = Query(
+        "ndjson", alias="format", description="ndjson or csv (csv exports exactly one table)"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Stream campaign data as NDJSON or CSV straight from a server-side cursor."""
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format '{export_format}'")
+    try:
+        selected = resolve_tables(tables)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The generator opens its own session on the same bind: the request session closes before
+    # streaming ends
+    bind = db.get_bind()
+    if export_format == "csv":
+        if len(selected) != 1:
+            raise HTTPException(status_code=400, detail="CSV export requires exactly one table")
+        body = stream_csv(bind, selected[0])
+        filename = f"{selected[0]}.csv"
+    else:
+        body = stream_ndjson(bind, selected)
+        filename = "hord_manager_export.ndjson"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/import")
+async def import_data(
+    request: Request,
+    upsert: bool = Query(
+        False,
+        description="Update gemstones/currencies that already exist instead of rejecting them",
+    ),
+    db: Session = Depends(get_db),
+):
+    """Bulk-load gemstones, currencies and gemstone holdings in one transaction.
+
+    Send a JSON document ({"gemstones": [...], "currencies": [...], "holdings": [...]}) or, with
+    Content-Type application/x-ndjson, one {"section": ..., "data": {...}} object per line.
+    Nothing is written unless the whole document validates.
+    """
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    body = await request.body()
     try:
-        # Call all reset functions
-        await reset_sessions_to_default(db)
-        await reset_gemstones_to_default(db)
-        await reset_materials_to_default(db)
-        await reset_metals_to_default(db)
-        await reset_currencies_to_default(db)
-        await reset_users_to_default(db)
-        
-        logger.info("All data reset to default successfully")
-        return {"message": "All data reset to default successfully"}
+        # Parsing and the bulk insert are blocking; keep them off the event loop
+        doc = await run_in_threadpool(parse_import_body, body, ndjson=ndjson)
+        result = await run_in_threadpool(import_document, db, doc, upsert=upsert)
+    except ImportValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
     except Exception as e:
-        logger.error(f"Error resetting all data: {e}")
-        raise HTTPException(status_code=500, detail=f"Error resetting all data: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error importing data: {e}")
+        raise HTTPException(status_code=500, detail=f"Error importing data: {str(e)}")
+    logger.info(f"Bulk import complete: {result}")
+    return result
+
+
+@router.post("/portfolio/rebuild")
+def rebuild_portfolio(db: Session = Depends(get_db)):
+    """Recompute every player's portfolio totals from the holding tables (repair job)."""
+    try:
+        rows = rebuild_portfolio_totals(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error rebuilding portfolio totals: {e}")
+        raise HTTPException(status_code=500, detail=f"Error rebuilding portfolio totals: {str(e)}")
+    logger.info(f"Portfolio totals rebuilt ({rows} rows)")
+    return {"message": "Portfolio totals rebuilt", "rows": rows}
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from ..core.database import get_db
@@ -8,7 +9,11 @@ from ..schemas.common import (
     GemstoneRead,
     PlayerGemstoneCreate,
     PlayerGemstoneRead,
+    PlayerGemstoneUpdate,
 )
+from ..services.portfolio import apply_deltas, holding_change
+from ..services.revaluation import revalue_gemstone_holdings
+from ..utils.pagination import MAX_PAGE_SIZE, paginate, set_next_cursor
 
 router = APIRouter(prefix="/gemstones", tags=["gemstones"])
 
@@ -21,14 +26,18 @@ def create_gemstone(
 ):
     """Create a gemstone.
 
-    If `upsert=true` and the name exists, its value_per_carat_oz_gold is updated and the updated row returned.
+    If `upsert=true` and the name exists, its value_per_carat_oz_gold is updated (re-pricing
+    holdings that are not manually appraised) and the updated row returned.
     """
     existing = db.query(Gemstone).filter(Gemstone.name == payload.name).first()
     if existing:
         if not upsert:
             raise HTTPException(status_code=400, detail="Gemstone name already exists")
+        repriced = existing.value_per_carat_oz_gold != payload.value_per_carat_oz_gold
         existing.value_per_carat_oz_gold = payload.value_per_carat_oz_gold
         db.add(existing)
+        if repriced:
+            revalue_gemstone_holdings(db, [existing.id])
         db.commit()
         db.refresh(existing)
         return existing
@@ -46,14 +55,17 @@ def list_gemstones(db: Session = Depends(get_db)):
 
 @router.put("/{gemstone_id}", response_model=GemstoneRead)
 def update_gemstone(gemstone_id: int, payload: GemstoneCreate, db: Session = Depends(get_db)):
-    """Update an existing gemstone."""
+    """Update an existing gemstone; a price change re-prices holdings not manually appraised."""
     gemstone = db.query(Gemstone).filter(Gemstone.id == gemstone_id).first()
     if not gemstone:
         raise HTTPException(status_code=404, detail="Gemstone not found")
     
+    repriced = gemstone.value_per_carat_oz_gold != payload.value_per_carat_oz_gold
     gemstone.name = payload.name
     gemstone.value_per_carat_oz_gold = payload.value_per_carat_oz_gold
     db.add(gemstone)
+    if repriced:
+        revalue_gemstone_holdings(db, [gemstone.id])
     db.commit()
     db.refresh(gemstone)
     return gemstone
@@ -66,6 +78,20 @@ def delete_gemstone(gemstone_id: int, db: Session = Depends(get_db)):
     if not gemstone:
         raise HTTPException(status_code=404, detail="Gemstone not found")
     
+    # Holdings cascade with the gemstone; take them out of the players' totals first
+    removed = db.execute(
+        select(
+            PlayerGemstone.player_id,
+            func.sum(PlayerGemstone.appraised_value_oz_gold),
+            func.count(),
+        )
+        .where(PlayerGemstone.gemstone_id == gemstone_id)
+        .group_by(PlayerGemstone.player_id)
+    ).all()
+    apply_deltas(
+        db,
+        [(player_id, "gemstones", -(value or 0.0), -count) for player_id, value, count in removed],
+    )
     db.delete(gemstone)
     db.commit()
     return {"message": f"Gemstone '{gemstone.name}' deleted successfully"}
@@ -77,23 +103,75 @@ def add_player_gemstone(player_id: int, payload: PlayerGemstoneCreate, db: Sessi
     gemstone = db.query(Gemstone).filter(Gemstone.id == payload.gemstone_id).first()
     if not gemstone:
         raise HTTPException(status_code=404, detail="Gemstone not found")
+    manual = payload.appraised_value_oz_gold is not None
     holding = PlayerGemstone(
         player_id=player_id,
         gemstone_id=payload.gemstone_id,
         carats=payload.carats,
-        appraised_value_oz_gold=payload.carats * gemstone.value_per_carat_oz_gold,
+        appraised_value_oz_gold=(
+            payload.appraised_value_oz_gold
+            if manual
+            else payload.carats * gemstone.value_per_carat_oz_gold
+        ),
+        manual_appraisal=manual,
     )
     db.add(holding)
+    apply_deltas(db, [(player_id, "gemstones", holding.appraised_value_oz_gold, 1)])
     db.commit()
     db.refresh(holding)
     return holding
 
 
-@router.get("/players/{player_id}", response_model=list[PlayerGemstoneRead])
-def list_player_gemstones(player_id: int, db: Session = Depends(get_db)):
-    return (
-        db.query(PlayerGemstone)
-        .filter(PlayerGemstone.player_id == player_id)
-        .order_by(PlayerGemstone.created_at.asc())
-        .all()
+@router.patch("/holdings/{holding_id}", response_model=PlayerGemstoneRead)
+def update_player_gemstone(
+    holding_id: int, payload: PlayerGemstoneUpdate, db: Session = Depends(get_db)
+):
+    """Edit a holding. Setting appraised_value_oz_gold marks it as manually appraised;
+    setting manual_appraisal=false returns it to catalog pricing.
+    """
+    holding = db.query(PlayerGemstone).filter(PlayerGemstone.id == holding_id).first()
+    if not holding:
+        raise HTTPException(status_code=404, detail="Holding not found")
+    old_value = holding.appraised_value_oz_gold
+    if payload.carats is not None:
+        holding.carats = payload.carats
+    if payload.manual_appraisal is not None:
+        holding.manual_appraisal = payload.manual_appraisal
+    if payload.appraised_value_oz_gold is not None:
+        holding.appraised_value_oz_gold = payload.appraised_value_oz_gold
+        holding.manual_appraisal = True
+    elif not holding.manual_appraisal:
+        holding.appraised_value_oz_gold = holding.carats * holding.gemstone.value_per_carat_oz_gold
+    db.add(holding)
+    apply_deltas(
+        db,
+        holding_change(
+            "gemstones",
+            holding.player_id,
+            old_value,
+            holding.player_id,
+            holding.appraised_value_oz_gold,
+        ),
     )
+    db.commit()
+    db.refresh(holding)
+    return holding
+
+
+@router.get("/players/{player_id}", response_model=list[PlayerGemstoneRead])
+def list_player_gemstones(
+    player_id: int,
+    response: Response,
+    gemstone_id: int | None = Query(None, description="Only holdings of this gemstone"),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to return every row"
+    ),
+    db: Session = Depends(get_db),
+):
+    query = db.query(PlayerGemstone).filter(PlayerGemstone.player_id == player_id)
+    if gemstone_id is not None:
+        query = query.filter(PlayerGemstone.gemstone_id == gemstone_id)
+    page = paginate(query, PlayerGemstone, cursor, limit)
+    set_next_cursor(response, page.next_cursor)
+    return page.items
@@ -1,12 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from datetime import datetime
+import hashlib
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, cast, func
+from sqlalchemy.orm import Session, defer, selectinload
 
+from ..core.config import get_settings as get_app_settings
 from ..core.database import get_db
-from ..models.gm import GMSettings, InboxMessage
+from ..models.gm import ArchivedInboxMessage, InboxMessage, InboxMessageStatus, InboxMessageType
 from ..models.player import Player
-from ..schemas.common import GMSettingsRead, GMSettingsUpdate, InboxMessageRead, GMPasswordChangeRequest
-import hashlib
+from ..schemas.common import (
+    ArchivedInboxMessageRead,
+    CampaignWealthRead,
+    GMPasswordChangeRequest,
+    GMSettingsRead,
+    GMSettingsUpdate,
+    InboxBulkItemResult,
+    InboxBulkRequest,
+    InboxBulkResult,
+    InboxMessageRead,
+)
+from ..services.conversion import ConversionService
+from ..services.gm_settings import gm_settings, update_gm_settings
+from ..services.inbox_archive import archive_inbox
+from ..services.inbox_events import inbox_stream, message_row, publish_inbox_change
+from ..services.ledger import to_units
+from ..services.loans import MAX_LOAN_TERM, LoanTerms, originate_loan
+from ..services.net_worth import get_campaign_wealth
+from ..services.session_state import current_session
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate, set_next_cursor
 
 router = APIRouter(prefix="/gm", tags=["gm"])
 
@@ -21,54 +44,157 @@ def verify_password(password: str, hashed: str) -> bool:
     return hash_password(password) == hashed
 
 
-def _get_or_create_settings(db: Session) -> GMSettings:
-    settings = db.query(GMSettings).first()
-    if not settings:
-        settings = GMSettings()
-        db.add(settings)
-        db.commit()
-        db.refresh(settings)
-    return settings
-
-
 @router.get("/settings", response_model=GMSettingsRead)
 def get_settings(db: Session = Depends(get_db)):
-    settings = _get_or_create_settings(db)
-    return settings
+    """Served from the cached settings snapshot."""
+    return gm_settings(db)
 
 
 @router.patch("/settings", response_model=GMSettingsRead)
 def update_settings(payload: GMSettingsUpdate, db: Session = Depends(get_db)):
-    settings = _get_or_create_settings(db)
     data = payload.model_dump(exclude_unset=True)
     if not data:
-        return settings
-    for k, v in data.items():
-        setattr(settings, k, v)
-    db.add(settings)
+        return gm_settings(db)
+    update_gm_settings(db, data)
     db.commit()
-    db.refresh(settings)
-    return settings
+    return gm_settings(db)
+
+
+@router.get("/wealth", response_model=CampaignWealthRead)
+def get_wealth(db: Session = Depends(get_db)):
+    """All players' net worth, breakdown, shares and rank as chart-ready columns (one query)."""
+    return get_campaign_wealth(db)
+
+
+class InboxFilters:
+    """Query filters shared by the live inbox and the archive.
+
+    Payload keys are matched on the generated columns, so they use their indexes.
+    """
+
+    def __init__(
+        self,
+        player_id: int | None = Query(None, description="Only messages from this player"),
+        status: str | None = Query(None, description="Filter by message status"),
+        type: str | None = Query(None, description="Filter by message type"),
+        payload_player_id: int | None = Query(
+            None, description="Only messages whose payload names this player"
+        ),
+        item_type: str | None = Query(None, description="Filter by the payload's item_type"),
+        min_amount: float | None = Query(None, description="Requested amount at least this"),
+        max_amount: float | None = Query(None, description="Requested amount at most this"),
+    ):
+        self.player_id = player_id
+        self.status = status
+        self.type = type
+        self.payload_player_id = payload_player_id
+        self.item_type = item_type
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+
+    def apply(self, query, model):
+        if self.player_id is not None:
+            query = query.filter(model.player_id == self.player_id)
+        if self.status is not None:
+            query = query.filter(model.status == self.status)
+        if self.type is not None:
+            query = query.filter(model.type == self.type)
+        if self.payload_player_id is not None:
+            query = query.filter(model.payload_player_id == self.payload_player_id)
+        if self.item_type is not None:
+            query = query.filter(model.payload_item_type == self.item_type)
+        if self.min_amount is not None:
+            query = query.filter(model.payload_amount >= self.min_amount)
+        if self.max_amount is not None:
+            query = query.filter(model.payload_amount <= self.max_amount)
+        return query
 
 
 @router.get("/inbox", response_model=list[InboxMessageRead])
-def list_inbox(db: Session = Depends(get_db)):
-    messages = db.query(InboxMessage).order_by(InboxMessage.created_at.desc()).all()
-    # Convert to dict and add player_username
-    result = []
-    for message in messages:
-        message_dict = {
-            "id": message.id,
-            "type": message.type,
-            "status": message.status,
-            "payload": message.payload,
-            "created_at": message.created_at,
-            "updated_at": message.updated_at,
-            "player_id": message.player_id,
-            "player_username": message.player.name if message.player else None
-        }
-        result.append(message_dict)
-    return result
+def list_inbox(
+    response: Response,
+    filters: InboxFilters = Depends(),
+    include_payload: bool = Query(
+        True, description="False leaves the payload JSON unread (summary columns only)"
+    ),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to return every row"
+    ),
+    db: Session = Depends(get_db),
+):
+    query = filters.apply(
+        db.query(InboxMessage).options(selectinload(InboxMessage.player)), InboxMessage
+    )
+    if not include_payload:
+        query = query.options(defer(InboxMessage.payload, raiseload=True))
+    page = paginate(query, InboxMessage, cursor, limit, descending=True)
+    set_next_cursor(response, page.next_cursor)
+    return [message_row(message, include_payload) for message in page.items]
+
+
+@router.get("/inbox/count")
+def count_inbox(filters: InboxFilters = Depends(), db: Session = Depends(get_db)):
+    """Number of live messages matching the filters, counted without reading any payload."""
+    count = filters.apply(db.query(func.count(InboxMessage.id)), InboxMessage).scalar()
+    return {"count": count}
+
+
+@router.get("/inbox/stream")
+async def stream_inbox(request: Request, last_event_id: int | None = Header(None)):
+    """Server-Sent Events: `inbox` deltas ({op, message}) as they are committed, or `reset` when the
+    client must reload the list. Browsers resume with the Last-Event-ID header on reconnect."""
+    return StreamingResponse(
+        inbox_stream(last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/inbox/archive", response_model=list[ArchivedInboxMessageRead])
+def list_archived_inbox(
+    response: Response,
+    filters: InboxFilters = Depends(),
+    q: str | None = Query(
+        None, min_length=1, description="Case-insensitive text to find anywhere in the payload"
+    ),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """Search messages the archiver has moved out of the live inbox, newest first."""
+    query = filters.apply(
+        db.query(ArchivedInboxMessage).options(selectinload(ArchivedInboxMessage.player)),
+        ArchivedInboxMessage,
+    )
+    if q is not None:
+        query = query.filter(cast(ArchivedInboxMessage.payload, String).ilike(f"%{q}%"))
+    page = paginate(query, ArchivedInboxMessage, cursor, limit, descending=True)
+    set_next_cursor(response, page.next_cursor)
+    return [{**message_row(message), "archived_at": message.archived_at} for message in page.items]
+
+
+@router.get("/inbox/archive/{message_id}", response_model=ArchivedInboxMessageRead)
+def get_archived_inbox_message(message_id: int, db: Session = Depends(get_db)):
+    message = db.get(ArchivedInboxMessage, message_id)
+    if not message:
+        raise HTTPException(status_code=404, detail="Archived message not found")
+    return {**message_row(message), "archived_at": message.archived_at}
+
+
+@router.post("/inbox/archive")
+def archive_settled_messages(
+    older_than_days: float | None = Query(
+        None, ge=0, description="Defaults to the inbox_archive_after_days setting"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Run the archiver now instead of waiting for the background job."""
+    days = (
+        get_app_settings().inbox_archive_after_days if older_than_days is None else older_than_days
+    )
+    archived = archive_inbox(db, timedelta(days=days))
+    return {"success": True, "archived": len(archived)}
 
 
 @router.get("/inbox/{message_id}", response_model=InboxMessageRead)
@@ -76,18 +202,186 @@ def get_inbox_message(message_id: int, db: Session = Depends(get_db)):
     message = db.query(InboxMessage).filter(InboxMessage.id == message_id).first()
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
-    
-    # Convert to dict and add player_username
-    return {
-        "id": message.id,
-        "type": message.type,
-        "status": message.status,
-        "payload": message.payload,
-        "created_at": message.created_at,
-        "updated_at": message.updated_at,
-        "player_id": message.player_id,
-        "player_username": message.player.name if message.player else None
+    return message_row(message)
+
+
+def _grant_requested_loan(db: Session, message: InboxMessage, response_data: dict):
+    """Originate the loan a GM approved from the inbox, on the terms the approval dialog sends."""
+    try:
+        amount = float(response_data["value"])
+        currency = response_data.get("currency") or "oz gold"
+        if currency != "oz gold":
+            amount = ConversionService(db).currency_to_oz_gold(amount, currency)
+        terms = LoanTerms(
+            to_units(amount),
+            float(response_data.get("interest_rate") or 0.0),
+            int(response_data.get("term_sessions") or 1),
+            "per_session"
+            if response_data.get("payment_type", "per_session") == "per_session"
+            else "lump_sum",
+        )
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid loan terms: {e}")
+    if (
+        terms.principal_units <= 0
+        or terms.rate_percent < 0
+        or not 1 <= terms.term_sessions <= MAX_LOAN_TERM
+    ):
+        raise HTTPException(status_code=400, detail="Invalid loan terms")
+    if message.player_id is None:
+        raise HTTPException(status_code=400, detail="Loan request has no requesting player")
+    return originate_loan(db, message.player_id, terms, current_session(db), message.id)
+
+
+def _apply_status(
+    db: Session, message: InboxMessage, status: str, response_data: dict | None
+) -> str:
+    # Approving a loan request with terms grants the loan (once)
+    if (
+        message.type == InboxMessageType.LOAN.value
+        and status == InboxMessageStatus.APPROVED.value
+        and response_data
+        and response_data.get("value")
+        and message.player_id is not None
+        and "loan_id" not in (message.payload or {}).get("response", {})
+    ):
+        loan = _grant_requested_loan(db, message, response_data)
+        response_data = {**response_data, "loan_id": loan.id}
+
+    message.status = status
+    # Add response data to payload if provided
+    if response_data:
+        message.payload = {**message.payload, "response": response_data}
+    return f"Message status updated to {status}"
+
+
+def _load_players(db: Session, messages) -> dict[int, Player]:
+    """Every player the messages refer to (sender or registration payload), in one IN query."""
+    ids = {m.player_id for m in messages} | {m.payload_player_id for m in messages}
+    ids.discard(None)
+    if not ids:
+        return {}
+    return {p.id: p for p in db.query(Player).filter(Player.id.in_(ids))}
+
+
+def _registering_player(message: InboxMessage, players: dict[int, Player]) -> Player:
+    if message.type != "account_registration":
+        raise HTTPException(status_code=400, detail="Message is not an account registration")
+
+    # Get the player named in the message payload
+    player_id = message.payload_player_id
+    if not player_id:
+        raise HTTPException(status_code=400, detail="No player ID found in message")
+
+    player = players.get(player_id)
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return player
+
+
+def _approve_account(message: InboxMessage, player: Player) -> str:
+    # Approve the player
+    approved_at = datetime.utcnow()
+    player.is_approved = True
+    player.approved_at = approved_at
+
+    # Update message status and add response
+    message.status = "approved"
+    message.payload = {
+        **message.payload,
+        "response": {
+            "approved_by": "GM",
+            "approved_at": approved_at.isoformat(),
+            "message": "Account approved and activated"
+        }
+    }
+    return f"Player '{player.name}' account has been approved"
+
+
+def _reject_account(db: Session, message: InboxMessage, player: Player) -> str:
+    # Update message status and add response
+    message.status = "rejected"
+    message.payload = {
+        **message.payload,
+        "response": {
+            "rejected_by": "GM",
+            "rejected_at": datetime.utcnow().isoformat(),
+            "message": "Account registration rejected"
+        }
+    }
+
+    # Delete the player account
+    db.delete(player)
+    return f"Player '{player.name}' registration has been rejected"
+
+
+def _get_message(db: Session, message_id: int) -> InboxMessage:
+    message = db.query(InboxMessage).filter(InboxMessage.id == message_id).first()
+    if not message:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return message
+
+
+@router.post("/inbox/bulk", response_model=InboxBulkResult)
+def bulk_update_inbox(payload: InboxBulkRequest, db: Session = Depends(get_db)):
+    """Apply many inbox actions in one transaction, in the order given.
+
+    Messages and players are loaded with one IN query each and everything is committed once.
+    An action that cannot be applied (unknown message, wrong type, missing player) is reported
+    in its result and skipped; the others still go through."""
+    messages = {
+        m.id: m
+        for m in db.query(InboxMessage).filter(
+            InboxMessage.id.in_({a.message_id for a in payload.actions})
+        )
     }
+    players = _load_players(db, messages.values())
+
+    results = []
+    changed = set()
+    for item in payload.actions:
+        try:
+            message = messages.get(item.message_id)
+            if message is None:
+                raise HTTPException(status_code=404, detail="Message not found")
+            if item.action == "set_status":
+                assert item.status is not None  # the schema requires it for set_status
+                detail = _apply_status(db, message, item.status, item.response_data)
+            elif item.action == "approve_account":
+                detail = _approve_account(message, _registering_player(message, players))
+            else:
+                player = _registering_player(message, players)
+                detail = _reject_account(db, message, player)
+                del players[player.id]
+        except HTTPException as e:
+            results.append(
+                InboxBulkItemResult(
+                    message_id=item.message_id, action=item.action, success=False, detail=e.detail
+                )
+            )
+            continue
+        changed.add(message.id)
+        results.append(
+            InboxBulkItemResult(
+                message_id=item.message_id, action=item.action, success=True, detail=detail
+            )
+        )
+
+    db.commit()
+    if changed:
+        # One query reloads the server-set timestamps of everything that changed
+        updated = (
+            db.query(InboxMessage)
+            .options(selectinload(InboxMessage.player))
+            .filter(InboxMessage.id.in_(changed))
+            .order_by(InboxMessage.id)
+            .populate_existing()
+        )
+        for message in updated:
+            publish_inbox_change("updated", message)
+
+    succeeded = sum(r.success for r in results)
+    return InboxBulkResult(results=results, succeeded=succeeded, failed=len(results) - succeeded)
 
 
 @router.patch("/inbox/{message_id}/status")
@@ -97,20 +391,12 @@ def update_message_status(
     response_data: dict | None = None,
     db: Session = Depends(get_db)
 ):
-    message = db.query(InboxMessage).filter(InboxMessage.id == message_id).first()
-    if not message:
-        raise HTTPException(status_code=404, detail="Message not found")
-    
-    # Update status
-    message.status = status
-    
-    # Add response data to payload if provided
-    if response_data:
-        message.payload = {**message.payload, "response": response_data}
-    
+    message = _get_message(db, message_id)
+    detail = _apply_status(db, message, status, response_data)
     db.commit()
     db.refresh(message)
-    return {"success": True, "message": f"Message status updated to {status}"}
+    publish_inbox_change("updated", message)
+    return {"success": True, "message": detail}
 
 
 @router.post("/inbox")
@@ -129,83 +415,32 @@ def create_inbox_message(
     db.add(message)
     db.commit()
     db.refresh(message)
+    publish_inbox_change("created", message)
     return {"success": True, "message_id": message.id}
 
 
 @router.post("/approve-account/{message_id}")
 def approve_account_registration(message_id: int, db: Session = Depends(get_db)):
     """GM approves a player account registration"""
-    message = db.query(InboxMessage).filter(InboxMessage.id == message_id).first()
-    if not message:
-        raise HTTPException(status_code=404, detail="Message not found")
-    
-    if message.type != "account_registration":
-        raise HTTPException(status_code=400, detail="Message is not an account registration")
-    
-    # Get the player from the message payload
-    player_id = message.payload.get("player_id")
-    if not player_id:
-        raise HTTPException(status_code=400, detail="No player ID found in message")
-    
-    player = db.query(Player).filter(Player.id == player_id).first()
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
-    
-    # Approve the player
-    player.is_approved = True
-    player.approved_at = datetime.utcnow().isoformat()
-    
-    # Update message status and add response
-    message.status = "approved"
-    message.payload = {
-        **message.payload,
-        "response": {
-            "approved_by": "GM",
-            "approved_at": datetime.utcnow().isoformat(),
-            "message": "Account approved and activated"
-        }
-    }
-    
+    message = _get_message(db, message_id)
+    detail = _approve_account(message, _registering_player(message, _load_players(db, [message])))
     db.commit()
-    
-    return {"success": True, "message": f"Player '{player.name}' account has been approved"}
+    db.refresh(message)
+    publish_inbox_change("updated", message)
+    return {"success": True, "message": detail}
 
 
 @router.post("/reject-account/{message_id}")
 def reject_account_registration(message_id: int, db: Session = Depends(get_db)):
     """GM rejects a player account registration"""
-    message = db.query(InboxMessage).filter(InboxMessage.id == message_id).first()
-    if not message:
-        raise HTTPException(status_code=404, detail="Message not found")
-    
-    if message.type != "account_registration":
-        raise HTTPException(status_code=400, detail="Message is not an account registration")
-    
-    # Get the player from the message payload
-    player_id = message.payload.get("player_id")
-    if not player_id:
-        raise HTTPException(status_code=400, detail="No player ID found in message")
-    
-    player = db.query(Player).filter(Player.id == player_id).first()
-    if not player:
-        raise HTTPException(status_code=404, detail="Player not found")
-    
-    # Update message status and add response
-    message.status = "rejected"
-    message.payload = {
-        **message.payload,
-        "response": {
-            "rejected_by": "GM",
-            "rejected_at": datetime.utcnow().isoformat(),
-            "message": "Account registration rejected"
-        }
-    }
-    
-    # Delete the player account
-    db.delete(player)
+    message = _get_message(db, message_id)
+    detail = _reject_account(
+        db, message, _registering_player(message, _load_players(db, [message]))
+    )
     db.commit()
-    
-    return {"success": True, "message": f"Player '{player.name}' registration has been rejected"}
+    db.refresh(message)
+    publish_inbox_change("updated", message)
+    return {"success": True, "message": detail}
 
 
 @router.post("/inbox/test-data")
@@ -280,6 +515,9 @@ def create_test_inbox_data(db: Session = Depends(get_db)):
         created_messages.append(message)
     
     db.commit()
+    for message in created_messages:
+        db.refresh(message)
+        publish_inbox_change("created", message)
     
     return {"success": True, "messages_created": len(created_messages)}
 
@@ -1,70 +1,33 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
-import random
-from datetime import datetime
+
 from ..core.database import get_db
-from ..models.material import MaterialPriceHistory
-from ..services.scraper import fetch_latest_material_prices, store_material_prices_in_db
+from ..models.material import MaterialPriceHistory, PlayerMaterialHolding
+from ..models.player import Player
+from ..schemas.common import (
+    CommodityHoldingUpdate,
+    PlayerMaterialHoldingCreate,
+    PlayerMaterialHoldingRead,
+)
+from ..services.commodity_holdings import (
+    holding_value,
+    is_convertible,
+    latest_price,
+    value_player_holdings,
+)
+from ..services.portfolio import apply_deltas, holding_change
+from ..services.scraper import (
+    MATERIALS_DATA,
+    fetch_latest_material_prices,
+    generate_material_prices,
+    store_material_prices_in_db,
+)
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
 
 router = APIRouter(prefix="/materials", tags=["materials"])
 
-# Define 20 common materials with their base prices and units
-MATERIALS_DATA = [
-    # Existing metals-like materials
-    {"name": "Wood", "unit": "board ft", "base_price": 2.50},
-    {"name": "Cotton", "unit": "lb", "base_price": 0.75},
-    {"name": "Carbon", "unit": "lb", "base_price": 15.00},
-    {"name": "Sulfur", "unit": "lb", "base_price": 0.25},
-    {"name": "Silicon", "unit": "lb", "base_price": 1.20},
-    {"name": "Phosphorus", "unit": "lb", "base_price": 2.80},
-    
-    # Additional common materials to reach 20 total
-    {"name": "Iron Ore", "unit": "ton", "base_price": 120.00},
-    {"name": "Salt", "unit": "lb", "base_price": 0.05},
-    {"name": "Sand", "unit": "ton", "base_price": 15.00},
-    {"name": "Clay", "unit": "ton", "base_price": 25.00},
-    {"name": "Limestone", "unit": "ton", "base_price": 12.00},
-    {"name": "Rubber", "unit": "lb", "base_price": 1.45},
-    {"name": "Wool", "unit": "lb", "base_price": 3.20},
-    {"name": "Hemp", "unit": "lb", "base_price": 2.10},
-    {"name": "Flax", "unit": "lb", "base_price": 1.80},
-    {"name": "Bamboo", "unit": "board ft", "base_price": 1.90},
-    {"name": "Cork", "unit": "lb", "base_price": 4.50},
-    
-    # New materials replacing removed ones
-    {"name": "Leather", "unit": "sq ft", "base_price": 6.25},
-    {"name": "Glass", "unit": "lb", "base_price": 0.95},
-    {"name": "Wax", "unit": "lb", "base_price": 3.80}
-]
-
-def generate_material_prices(session_number: int = 1, use_mock_data: bool = True):
-    """Generate material prices with some variability based on session number."""
-    prices = []
-    
-    # Use session number as seed for consistent but varying prices
-    random.seed(session_number * 42)
-    
-    for material in MATERIALS_DATA:
-        # Add some variability (±20%) to base prices
-        variance = random.uniform(0.8, 1.2)
-        session_modifier = 1 + (session_number - 1) * 0.02  # 2% increase per session
-        
-        current_price = material["base_price"] * variance * session_modifier
-        
-        # Calculate price per oz gold (assuming gold is ~$2000/oz)
-        gold_price_per_oz = 2000.0
-        price_per_oz_gold = current_price / gold_price_per_oz
-        
-        prices.append({
-            "material_name": material["name"],
-            "unit": material["unit"],
-            "price_per_unit_usd": round(current_price, 4),
-            "price_per_oz_gold": round(price_per_oz_gold, 6),
-        })
-    
-    return prices
-
 @router.post("/scrape")
 def trigger_material_price_update(
     session_number: int = Query(1, description="Session number for price calculation"),
@@ -150,8 +113,16 @@ def get_current_material_prices(
 def get_material_price_history(
     material_name: Optional[str] = Query(None, description="Filter by material name"),
     session_number: Optional[int] = Query(None, description="Filter by session number"),
-    limit: int = Query(100, description="Maximum number of records to return"),
-    db: Session = Depends(get_db)
+    unit: Optional[str] = Query(None, description="Filter by unit"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous response's `next`"
+    ),
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE,
+        ge=1,
+        description=f"Maximum number of records to return (at most {MAX_PAGE_SIZE} per page)",
+    ),
+    db: Session = Depends(get_db),
 ):
     """Get historical material price data from database."""
     try:
@@ -162,12 +133,16 @@ def get_material_price_history(
         
         if session_number:
             query = query.filter(MaterialPriceHistory.session_number == session_number)
+
+        if unit:
+            query = query.filter(MaterialPriceHistory.unit == unit)
         
-        # Order by most recent first
-        query = query.order_by(MaterialPriceHistory.created_at.desc())
-        
-        # Apply limit
-        records = query.limit(limit).all()
+        # Most recent first, one keyset page at a time
+        # Larger limits are capped rather than rejected; `next` pages through the rest
+        page = paginate(
+            query, MaterialPriceHistory, cursor, min(limit, MAX_PAGE_SIZE), descending=True
+        )
+        records = page.items
         
         return {
             "records": [
@@ -182,8 +157,11 @@ def get_material_price_history(
                 }
                 for record in records
             ],
-            "count": len(records)
+            "count": len(records),
+            "next": page.next_cursor,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get material price history: {str(e)}")
 
@@ -303,4 +281,81 @@ def create_new_material(
         raise
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=f"Error creating material: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error creating material: {str(e)}")
+
+
+def _check_material_holding(db: Session, material_name: str, quantity: float, unit: str) -> None:
+    if quantity <= 0:
+        raise HTTPException(status_code=400, detail="Quantity must be positive")
+    price = latest_price(db, "material", material_name)
+    if not price:
+        raise HTTPException(
+            status_code=404, detail=f"No price data found for material '{material_name}'"
+        )
+    if not is_convertible(unit, price.unit):
+        raise HTTPException(
+            status_code=400, detail=f"Cannot convert {unit} to {price.unit} for {material_name}"
+        )
+
+
+@router.get("/holdings/players/{player_id}")
+def get_player_material_holdings(player_id: int, db: Session = Depends(get_db)):
+    """A player's material holdings valued against the latest prices in one query."""
+    return value_player_holdings(db, "material", player_id)
+
+
+@router.post("/holdings/players/{player_id}", response_model=PlayerMaterialHoldingRead)
+def add_player_material_holding(
+    player_id: int, payload: PlayerMaterialHoldingCreate, db: Session = Depends(get_db)
+):
+    if not db.query(Player).filter(Player.id == player_id).first():
+        raise HTTPException(status_code=404, detail="Player not found")
+    _check_material_holding(db, payload.material_name, payload.quantity, payload.unit)
+    holding = PlayerMaterialHolding(player_id=player_id, **payload.model_dump())
+    db.add(holding)
+    db.flush()
+    value = holding_value(db, "material", holding.id)
+    apply_deltas(db, holding_change("materials", None, 0.0, player_id, value))
+    db.commit()
+    db.refresh(holding)
+    return holding
+
+
+@router.patch("/holdings/{holding_id}", response_model=PlayerMaterialHoldingRead)
+def update_player_material_holding(
+    holding_id: int, payload: CommodityHoldingUpdate, db: Session = Depends(get_db)
+):
+    holding = db.query(PlayerMaterialHolding).filter(PlayerMaterialHolding.id == holding_id).first()
+    if not holding:
+        raise HTTPException(status_code=404, detail="Holding not found")
+    data = payload.model_dump(exclude_unset=True)
+    _check_material_holding(
+        db,
+        holding.material_name,
+        data.get("quantity", holding.quantity),
+        data.get("unit", holding.unit),
+    )
+    old_value = holding_value(db, "material", holding.id)
+    for field, value in data.items():
+        setattr(holding, field, value)
+    db.add(holding)
+    db.flush()
+    new_value = holding_value(db, "material", holding.id)
+    apply_deltas(
+        db, holding_change("materials", holding.player_id, old_value, holding.player_id, new_value)
+    )
+    db.commit()
+    db.refresh(holding)
+    return holding
+
+
+@router.delete("/holdings/{holding_id}")
+def delete_player_material_holding(holding_id: int, db: Session = Depends(get_db)):
+    holding = db.query(PlayerMaterialHolding).filter(PlayerMaterialHolding.id == holding_id).first()
+    if not holding:
+        raise HTTPException(status_code=404, detail="Holding not found")
+    value = holding_value(db, "material", holding.id)
+    apply_deltas(db, holding_change("materials", holding.player_id, value, None, 0.0))
+    db.delete(holding)
+    db.commit()
+    return {"message": "Holding deleted successfully"}
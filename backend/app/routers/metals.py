@@ -1,14 +1,30 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+
 from ..core.database import get_db
-from ..models.metal import MetalPriceHistory
+from ..models.metal import MetalPriceHistory, PlayerMetalHolding
+from ..models.player import Player
+from ..schemas.common import (
+    CommodityHoldingUpdate,
+    PlayerMetalHoldingCreate,
+    PlayerMetalHoldingRead,
+)
+from ..services.commodity_holdings import (
+    holding_value,
+    is_convertible,
+    latest_price,
+    value_player_holdings,
+)
+from ..services.portfolio import apply_deltas, holding_change
 from ..services.scraper import (
+    fetch_latest_metal_prices,
     scrape_and_store_metal_prices,
-    scrape_metal_prices,
     scrape_gemstone_prices,
-    fetch_latest_metal_prices,
+    scrape_metal_prices,
 )
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
 
 router = APIRouter(prefix="/metals", tags=["metals"])
 
@@ -98,8 +114,16 @@ def get_current_metal_prices(
 def get_metal_price_history(
     metal_name: Optional[str] = Query(None, description="Filter by metal name"),
     session_number: Optional[int] = Query(None, description="Filter by session number"),
-    limit: int = Query(100, description="Maximum number of records to return"),
-    db: Session = Depends(get_db)
+    unit: Optional[str] = Query(None, description="Filter by unit"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque token from a previous response's `next`"
+    ),
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE,
+        ge=1,
+        description=f"Maximum number of records to return (at most {MAX_PAGE_SIZE} per page)",
+    ),
+    db: Session = Depends(get_db),
 ):
     """Get historical metal price data from database."""
     try:
@@ -110,12 +134,16 @@ def get_metal_price_history(
         
         if session_number:
             query = query.filter(MetalPriceHistory.session_number == session_number)
+
+        if unit:
+            query = query.filter(MetalPriceHistory.unit == unit)
         
-        # Order by most recent first
-        query = query.order_by(MetalPriceHistory.created_at.desc())
-        
-        # Apply limit
-        records = query.limit(limit).all()
+        # Most recent first, one keyset page at a time
+        # Larger limits are capped rather than rejected; `next` pages through the rest
+        page = paginate(
+            query, MetalPriceHistory, cursor, min(limit, MAX_PAGE_SIZE), descending=True
+        )
+        records = page.items
         
         return {
             "records": [
@@ -130,9 +158,12 @@ def get_metal_price_history(
                 }
                 for record in records
             ],
-            "count": len(records)
+            "count": len(records),
+            "next": page.next_cursor,
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get price history: {str(e)}")
 
@@ -285,4 +316,79 @@ def create_new_metal(
         raise
     except Exception as e:
         db.rollback()
-        raise HTTPException(status_code=500, detail=f"Error creating metal: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error creating metal: {str(e)}")
+
+
+def _check_metal_holding(db: Session, metal_name: str, quantity: float, unit: str) -> None:
+    if quantity <= 0:
+        raise HTTPException(status_code=400, detail="Quantity must be positive")
+    price = latest_price(db, "metal", metal_name)
+    if not price:
+        raise HTTPException(status_code=404, detail=f"No price data found for metal '{metal_name}'")
+    if not is_convertible(unit, price.unit):
+        raise HTTPException(
+            status_code=400, detail=f"Cannot convert {unit} to {price.unit} for {metal_name}"
+        )
+
+
+@router.get("/holdings/players/{player_id}")
+def get_player_metal_holdings(player_id: int, db: Session = Depends(get_db)):
+    """A player's metal holdings valued against the latest prices in one query."""
+    return value_player_holdings(db, "metal", player_id)
+
+
+@router.post("/holdings/players/{player_id}", response_model=PlayerMetalHoldingRead)
+def add_player_metal_holding(
+    player_id: int, payload: PlayerMetalHoldingCreate, db: Session = Depends(get_db)
+):
+    if not db.query(Player).filter(Player.id == player_id).first():
+        raise HTTPException(status_code=404, detail="Player not found")
+    _check_metal_holding(db, payload.metal_name, payload.quantity, payload.unit)
+    holding = PlayerMetalHolding(player_id=player_id, **payload.model_dump())
+    db.add(holding)
+    db.flush()
+    value = holding_value(db, "metal", holding.id)
+    apply_deltas(db, holding_change("metals", None, 0.0, player_id, value))
+    db.commit()
+    db.refresh(holding)
+    return holding
+
+
+@router.patch("/holdings/{holding_id}", response_model=PlayerMetalHoldingRead)
+def update_player_metal_holding(
+    holding_id: int, payload: CommodityHoldingUpdate, db: Session = Depends(get_db)
+):
+    holding = db.query(PlayerMetalHolding).filter(PlayerMetalHolding.id == holding_id).first()
+    if not holding:
+        raise HTTPException(status_code=404, detail="Holding not found")
+    data = payload.model_dump(exclude_unset=True)
+    _check_metal_holding(
+        db,
+        holding.metal_name,
+        data.get("quantity", holding.quantity),
+        data.get("unit", holding.unit),
+    )
+    old_value = holding_value(db, "metal", holding.id)
+    for field, value in data.items():
+        setattr(holding, field, value)
+    db.add(holding)
+    db.flush()
+    new_value = holding_value(db, "metal", holding.id)
+    apply_deltas(
+        db, holding_change("metals", holding.player_id, old_value, holding.player_id, new_value)
+    )
+    db.commit()
+    db.refresh(holding)
+    return holding
+
+
+@router.delete("/holdings/{holding_id}")
+def delete_player_metal_holding(holding_id: int, db: Session = Depends(get_db)):
+    holding = db.query(PlayerMetalHolding).filter(PlayerMetalHolding.id == holding_id).first()
+    if not holding:
+        raise HTTPException(status_code=404, detail="Holding not found")
+    value = holding_value(db, "metal", holding.id)
+    apply_deltas(db, holding_change("metals", holding.player_id, value, None, 0.0))
+    db.delete(holding)
+    db.commit()
+    return {"message": "Holding deleted successfully"}
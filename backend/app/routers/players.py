@@ -0,0 +1,44 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db
+from ..models.player import Player
+from ..schemas.common import NetWorthRead, NetWorthSeriesRead
+from ..services.net_worth import get_player_net_worth
+from ..services.portfolio import net_worth_series
+
+router = APIRouter(prefix="/players", tags=["players"])
+
+
+def _require_player(db: Session, player_id: int) -> Player:
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return player
+
+
+@router.get("/{player_id}/net-worth", response_model=NetWorthRead)
+def get_net_worth(
+    player_id: int,
+    currencies: Optional[List[str]] = Query(
+        None, description="Display currencies (default: USD and all configured)"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Per-category net worth for a player, aggregated in one SQL statement."""
+    _require_player(db, player_id)
+    return get_player_net_worth(db, player_id, currencies)
+
+
+@router.get("/{player_id}/net-worth/series", response_model=NetWorthSeriesRead)
+def get_net_worth_series(
+    player_id: int,
+    from_session: Optional[int] = Query(None, ge=0),
+    to_session: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Net worth per session as parallel arrays, from the snapshots taken at each advance."""
+    _require_player(db, player_id)
+    return net_worth_series(db, player_id, from_session, to_session)
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+
 from ..core.database import get_db
 from ..models.art import RealEstateProperty
 from ..schemas.common import RealEstateCreate, RealEstateRead, RealEstateUpdate
+from ..services.portfolio import apply_deltas, holding_change
+from ..utils.pagination import MAX_PAGE_SIZE, paginate, set_next_cursor
 
 router = APIRouter(prefix="/real-estate", tags=["real-estate"]) 
 
@@ -15,24 +18,47 @@ def create_property(payload: RealEstateCreate, db: Session = Depends(get_db)):
         player_id=payload.player_id,
     )
     db.add(prop)
+    apply_deltas(db, holding_change("real_estate", None, 0.0, payload.player_id, 0.0))
     db.commit()
     db.refresh(prop)
     return prop
 
 @router.get("/", response_model=list[RealEstateRead])
-def list_properties(db: Session = Depends(get_db)):
-    props = db.query(RealEstateProperty).all()
-    return props
+def list_properties(
+    response: Response,
+    player_id: int | None = Query(None, description="Only properties owned by this player"),
+    pending_appraisal: bool | None = Query(None, description="Filter by appraisal status"),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to return every row"
+    ),
+    db: Session = Depends(get_db),
+):
+    query = db.query(RealEstateProperty)
+    if player_id is not None:
+        query = query.filter(RealEstateProperty.player_id == player_id)
+    if pending_appraisal is not None:
+        query = query.filter(RealEstateProperty.pending_appraisal == int(pending_appraisal))
+    page = paginate(query, RealEstateProperty, cursor, limit)
+    set_next_cursor(response, page.next_cursor)
+    return page.items
 
 @router.patch("/{property_id}", response_model=RealEstateRead)
 def patch_property(property_id: int, payload: RealEstateUpdate, db: Session = Depends(get_db)):
     prop = db.query(RealEstateProperty).filter(RealEstateProperty.id == property_id).first()
     if not prop:
         raise HTTPException(status_code=404, detail="Property not found")
+    old_player_id, old_value = prop.player_id, prop.appraised_value_oz_gold
     data = payload.model_dump(exclude_unset=True)
     for field, value in data.items():
         setattr(prop, field, value)
     db.add(prop)
+    apply_deltas(
+        db,
+        holding_change(
+            "real_estate", old_player_id, old_value, prop.player_id, prop.appraised_value_oz_gold
+        ),
+    )
     db.commit()
     db.refresh(prop)
     return prop
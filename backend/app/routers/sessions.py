@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket
 from sqlalchemy.orm import Session
+
 from ..core.database import get_db
-from ..models.session import GlobalState
-from ..schemas.common import SessionStateRead
-from ..services.scraper import scrape_and_store_metal_prices
-import logging
+from ..schemas.common import SessionAdvanceRead, SessionStateRead
+from ..services.session_advance import MAX_FAST_FORWARD, advance_session
+from ..services.session_state import current_session
+from ..services.ticker import price_ticker
 
 logger = logging.getLogger(__name__)
 
@@ -12,34 +15,52 @@ router = APIRouter(prefix="/sessions", tags=["sessions"])
 
 @router.get("/state", response_model=SessionStateRead)
 def get_state(db: Session = Depends(get_db)):
-    state = db.query(GlobalState).first()
-    if not state:
-        state = GlobalState(current_session=0)
-        db.add(state)
-        db.commit()
-        db.refresh(state)
-    return SessionStateRead(current_session=state.current_session)
-
-@router.post("/increment", response_model=SessionStateRead)
+    return SessionStateRead(current_session=current_session(db))
+
+@router.post("/increment", response_model=SessionAdvanceRead)
 def increment_session(db: Session = Depends(get_db)):
-    state = db.query(GlobalState).first()
-    if not state:
-        state = GlobalState(current_session=0)
-        db.add(state)
-    state.current_session += 1
-    db.commit()
-    db.refresh(state)
-    
-    # Automatically scrape metal prices when session increments
+    """Advance one session: prices, income, interest and snapshots in a single transaction."""
     try:
-        logger.info(f"Session incremented to {state.current_session}, triggering metal price scraping")
-        scrape_result = scrape_and_store_metal_prices(db, use_mock_data=False)
-        if scrape_result["success"]:
-            logger.info(f"Successfully scraped {scrape_result['prices_stored']} metal prices for session {state.current_session}")
-        else:
-            logger.warning(f"Metal price scraping failed: {scrape_result['message']}")
+        result = advance_session(db)
     except Exception as e:
-        logger.error(f"Error during automatic metal price scraping: {e}")
-        # Don't fail the session increment if scraping fails
-    
-    return SessionStateRead(current_session=state.current_session)
+        logger.error(f"Error advancing session: {e}")
+        raise HTTPException(status_code=500, detail=f"Error advancing session: {str(e)}")
+    _broadcast(db, result["current_session"])
+    return result
+
+
+@router.post("/advance", response_model=SessionAdvanceRead)
+def advance_sessions(
+    count: int = Query(
+        1, ge=1, le=MAX_FAST_FORWARD, description="Number of sessions to fast-forward"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Fast-forward `count` sessions in one pass.
+
+    Every session's prices, income and snapshots are persisted.
+    """
+    try:
+        result = advance_session(db, count)
+    except Exception as e:
+        logger.error(f"Error advancing {count} sessions: {e}")
+        raise HTTPException(status_code=500, detail=f"Error advancing sessions: {str(e)}")
+    _broadcast(db, result["current_session"])
+    return result
+
+
+def _broadcast(db: Session, session_number: int) -> None:
+    # The advance has committed; a ticker failure must not turn it into an error response
+    try:
+        price_ticker.publish_session(db, session_number)
+    except Exception as e:
+        logger.error(f"Error broadcasting session {session_number}: {e}")
+
+
+@router.websocket("/ticker")
+async def session_ticker(websocket: WebSocket, db: Session = Depends(get_db)):
+    """Push the session number and changed prices to this client after every advance."""
+    subscription, snapshot = price_ticker.join(db)
+    db.close()  # the socket may stay open for hours; don't hold a connection
+    await price_ticker.serve(websocket, subscription, snapshot)
+
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, ConfigDict, model_validator
-from typing import Optional, List
 from datetime import datetime
+from typing import List, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
 
 class CurrencyDenominationBase(BaseModel):
     name: str
@@ -58,10 +60,23 @@ class SessionStateRead(BaseModel):
     updated_at: datetime | None = None
 
 
+class SessionStageRead(BaseModel):
+    stage: str
+    rows: int
+    duration_ms: float
+
+
+class SessionAdvanceRead(SessionStateRead):
+    sessions_advanced: int = 1
+    stages: list[SessionStageRead] = []
+    duration_ms: float = 0.0
+
+
 class GMSettingsRead(BaseModel):
     id: int
     exchange_fee_percent: float
     interest_rate_percent: float
+    interest_compounding: str
     growth_factor_percent: float
     hide_dollar_from_players: bool
     created_at: datetime
@@ -72,6 +87,7 @@ class GMSettingsRead(BaseModel):
 class GMSettingsUpdate(BaseModel):
     exchange_fee_percent: float | None = None
     interest_rate_percent: float | None = None
+    interest_compounding: Literal["session", "simple"] | None = None
     growth_factor_percent: float | None = None
     hide_dollar_from_players: bool | None = None
 
@@ -80,7 +96,10 @@ class InboxMessageRead(BaseModel):
     id: int
     type: str
     status: str
-    payload: dict
+    payload: dict | None  # None when the list was asked for without payloads
+    payload_player_id: int | None = None
+    item_type: str | None = None
+    amount: float | None = None
     created_at: datetime
     updated_at: datetime
     player_id: int | None
@@ -88,6 +107,40 @@ class InboxMessageRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ArchivedInboxMessageRead(InboxMessageRead):
+    archived_at: datetime
+
+
+class InboxBulkAction(BaseModel):
+    message_id: int
+    action: Literal["set_status", "approve_account", "reject_account"]
+    status: Literal["pending", "approved", "rejected", "resolved"] | None = None  # for set_status
+    response_data: dict | None = None  # for set_status
+
+    @model_validator(mode="after")
+    def _status_for_set_status(self):
+        if self.action == "set_status" and self.status is None:
+            raise ValueError("status is required for set_status")
+        return self
+
+
+class InboxBulkRequest(BaseModel):
+    actions: List[InboxBulkAction] = Field(min_length=1, max_length=200)
+
+
+class InboxBulkItemResult(BaseModel):
+    message_id: int
+    action: str
+    success: bool
+    detail: str
+
+
+class InboxBulkResult(BaseModel):
+    results: List[InboxBulkItemResult]
+    succeeded: int
+    failed: int
+
+
 class GemstoneCreate(BaseModel):
     name: str
     value_per_carat_oz_gold: float = 0.0
@@ -105,6 +158,14 @@ class GemstoneRead(BaseModel):
 class PlayerGemstoneCreate(BaseModel):
     gemstone_id: int
     carats: float
+    # Set to appraise manually; defaults to carats x catalog value
+    appraised_value_oz_gold: float | None = None
+
+
+class PlayerGemstoneUpdate(BaseModel):
+    carats: float | None = None
+    appraised_value_oz_gold: float | None = None
+    manual_appraisal: bool | None = None
 
 
 class PlayerGemstoneRead(BaseModel):
@@ -113,11 +174,51 @@ class PlayerGemstoneRead(BaseModel):
     gemstone_id: int
     carats: float
     appraised_value_oz_gold: float
+    manual_appraisal: bool = False
     created_at: datetime
     updated_at: datetime
     model_config = ConfigDict(from_attributes=True)
 
 
+class PlayerMetalHoldingCreate(BaseModel):
+    metal_name: str
+    quantity: float
+    unit: str = "oz"
+
+
+class PlayerMetalHoldingRead(BaseModel):
+    id: int
+    player_id: int
+    metal_name: str
+    quantity: float
+    unit: str
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PlayerMaterialHoldingCreate(BaseModel):
+    material_name: str
+    quantity: float
+    unit: str = "lb"
+
+
+class PlayerMaterialHoldingRead(BaseModel):
+    id: int
+    player_id: int
+    material_name: str
+    quantity: float
+    unit: str
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CommodityHoldingUpdate(BaseModel):
+    quantity: float | None = None
+    unit: str | None = None
+
+
 class ArtItemCreate(BaseModel):
     name: str
     description: str = ""
@@ -263,3 +364,139 @@ class GMPasswordChangeRequest(BaseModel):
     current_password: str
     new_password: str
     confirm_password: str
+
+
+class ImportHolding(BaseModel):
+    """A gemstone holding in a bulk import; player and gemstone may be given by id or name."""
+    player_id: int | None = None
+    player_name: str | None = None
+    gemstone_id: int | None = None
+    gemstone_name: str | None = None
+    carats: float
+    # Defaults to carats x catalog value; if given, marks a manual appraisal
+    appraised_value_oz_gold: float | None = None
+
+
+class ImportDocument(BaseModel):
+    gemstones: list[GemstoneCreate] = []
+    currencies: list[CurrencyCreate] = []
+    holdings: list[ImportHolding] = []
+
+
+class NetWorthCategoryRead(BaseModel):
+    category: str
+    value_oz_gold: float
+    items: int
+    share: float
+    converted: dict[str, float] = {}
+
+
+class NetWorthRead(BaseModel):
+    player_id: int
+    total_oz_gold: float
+    categories: list[NetWorthCategoryRead]
+    conversions: dict = {}
+
+
+class CampaignWealthRead(BaseModel):
+    epoch: int
+    player_id: list[int]
+    name: list[str]
+    rank: list[int]
+    total_oz_gold: list[float]
+    share: list[float]
+    categories: dict[str, list[float]]
+    category_shares: dict[str, list[float]]
+    campaign_total_oz_gold: float
+    category_totals: dict[str, float]
+
+
+class NetWorthSeriesRead(BaseModel):
+    player_id: int
+    sessions: list[int]
+    total_oz_gold: list[float]
+    categories: dict[str, list[float]]
+
+
+class BankTransactionCreate(BaseModel):
+    amount_oz_gold: float = Field(gt=0)
+    memo: str | None = None
+
+
+class BankAccountRead(BaseModel):
+    player_id: int
+    account: str
+    balance_oz_gold: float
+    entries: int
+
+
+class LedgerEntryRead(BaseModel):
+    id: int
+    transaction_id: str
+    account: str
+    kind: str
+    amount_oz_gold: float
+    memo: str | None = None
+    session_number: int | None = None
+    created_at: datetime | None = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LedgerMismatchRead(BaseModel):
+    account: str
+    balance_oz_gold: float
+    ledger_oz_gold: float
+
+
+class LedgerIntegrityRead(BaseModel):
+    ok: bool
+    accounts_checked: int
+    mismatched_accounts: list[LedgerMismatchRead]
+    unbalanced_transactions: list[str]
+
+
+class LoanTermsCreate(BaseModel):
+    principal_oz_gold: float = Field(gt=0)
+    rate_percent: float = Field(0.0, ge=0)  # per session
+    term_sessions: int = Field(ge=1, le=520)
+    payment_type: Literal["per_session", "lump_sum"] = "per_session"
+    interest_method: Literal["flat", "declining"] = "flat"
+
+
+class LoanCreate(LoanTermsCreate):
+    player_id: int
+    inbox_message_id: int | None = None
+
+
+class LoanQuoteRequest(BaseModel):
+    offers: list[LoanTermsCreate] = Field(min_length=1, max_length=20)
+
+
+class LoanScheduleRead(BaseModel):
+    payment_per_session_oz_gold: float
+    total_paid_oz_gold: float
+    total_interest_oz_gold: float
+    schedule: dict[str, list[int | float]]
+
+
+class LoanQuoteRead(BaseModel):
+    offers: list[LoanScheduleRead]
+
+
+class LoanRead(BaseModel):
+    id: int
+    player_id: int
+    inbox_message_id: int | None = None
+    principal_oz_gold: float
+    rate_percent: float
+    term_sessions: int
+    payment_type: str
+    interest_method: str
+    payment_oz_gold: float
+    balance_oz_gold: float
+    periods_paid: int
+    interest_paid_oz_gold: float
+    status: str
+    start_session: int
+    created_at: datetime | None = None
+    model_config = ConfigDict(from_attributes=True)
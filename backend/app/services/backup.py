@@ -0,0 +1,107 @@
+"""Online campaign backup/restore built on SQLite's backup API.
+
+Backups copy the live database a few pages at a time, so the shared lock on the
+source is released between steps and players keep writing while it runs.
+Restores validate the uploaded file first and then copy it over the live
+database in a single backup step, which SQLite applies as one transaction.
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+
+from sqlalchemy.orm import Session
+
+from ..core.database import Base
+from ..utils.cache import bump_cache_epoch
+from ..utils.migrations import head_revision
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PAGES_PER_STEP = 256
+SQLITE_HEADER = b"SQLite format 3\x00"
+# Tables a file must contain before we will restore it over the live campaign
+REQUIRED_TABLES = ("players", "global_state", "currencies")
+
+
+class BackupError(ValueError):
+    """Raised when a backup cannot be taken or a restore file is rejected."""
+
+
+def _sqlite_connection(db: Session) -> sqlite3.Connection:
+    conn = db.connection().connection.driver_connection
+    if not isinstance(conn, sqlite3.Connection):
+        raise BackupError("Online backup is only supported for SQLite databases")
+    return conn
+
+
+def backup_to_file(db: Session, path: str) -> int:
+    """Write a consistent snapshot of the live database to `path`; returns its page count."""
+    source = _sqlite_connection(db)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target, pages=BACKUP_PAGES_PER_STEP)
+        return target.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        target.close()
+
+
+def create_backup_file(db: Session) -> str:
+    """Snapshot the database into a new temp file and return its path (caller deletes it)."""
+    fd, path = tempfile.mkstemp(prefix="hord_backup_", suffix=".db")
+    os.close(fd)
+    try:
+        pages = backup_to_file(db, path)
+    except Exception:
+        os.unlink(path)
+        raise
+    logger.info(f"Backup written to {path} ({pages} pages)")
+    return path
+
+
+def validate_backup_file(path: str) -> None:
+    with open(path, "rb") as fh:
+        if fh.read(len(SQLITE_HEADER)) != SQLITE_HEADER:
+            raise BackupError("Uploaded file is not a SQLite database")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        if conn.execute("PRAGMA integrity_check").fetchone()[0] != "ok":
+            raise BackupError("Backup file failed SQLite integrity check")
+        tables = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        revision = None
+        if "alembic_version" in tables:
+            row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+            revision = row[0] if row else None
+    finally:
+        conn.close()
+    missing = [t for t in REQUIRED_TABLES if t not in tables]
+    if missing:
+        raise BackupError(f"Backup file is missing tables: {', '.join(missing)}")
+    # An older schema would come back without the tables added since; migrate it before restoring
+    head = head_revision()
+    if head is not None and revision != head:
+        raise BackupError(f"Backup schema is at revision {revision or 'none'}, expected {head}")
+    unknown = tables - set(Base.metadata.tables) - {"alembic_version", "sqlite_sequence"}
+    if unknown:
+        logger.warning(f"Restoring backup with tables unknown to this version: {sorted(unknown)}")
+
+
+def restore_from_file(db: Session, path: str) -> int:
+    """Atomically replace the live database contents with the backup at `path`."""
+    validate_backup_file(path)
+    # End the session's transaction so the destination can take its write lock
+    db.rollback()
+    target = _sqlite_connection(db)
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        source.backup(target, pages=-1)  # one step: all-or-nothing on the live database
+        pages = source.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        source.close()
+    db.expire_all()
+    bump_cache_epoch()
+    logger.info(f"Database restored from backup ({pages} pages)")
+    return pages
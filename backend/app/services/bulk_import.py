@@ -0,0 +1,244 @@
+"""Transactional bulk import of gemstones, currencies and gemstone holdings.
+
+The whole document is validated before anything is written: names are resolved
+to ids with one ``IN`` query per table, and every problem is collected so the
+caller sees all of them at once. Writes then go out as multi-row INSERTs (and
+keyed bulk UPDATEs for upserts) inside a single transaction.
+"""
+
+import json
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..models.currency import Currency, CurrencyDenomination, PegType
+from ..models.gemstone import Gemstone, PlayerGemstone
+from ..models.player import Player
+from ..schemas.common import ImportDocument
+from .portfolio import apply_deltas
+from .revaluation import revalue_gemstone_holdings
+
+NDJSON_SECTIONS = ("gemstones", "currencies", "holdings")
+
+
+class ImportValidationError(ValueError):
+    def __init__(self, errors: list[str]):
+        super().__init__(f"{len(errors)} import error(s)")
+        self.errors = errors
+
+
+def parse_import_body(body: bytes, ndjson: bool) -> ImportDocument:
+    """Parse a JSON document or NDJSON lines of the form {"section": ..., "data": {...}}."""
+    try:
+        if not ndjson:
+            return ImportDocument.model_validate_json(body)
+        sections: dict[str, list] = {name: [] for name in NDJSON_SECTIONS}
+        for lineno, line in enumerate(body.decode("utf-8").splitlines(), start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            section = record.get("section")
+            if section not in sections:
+                raise ImportValidationError([f"line {lineno}: unknown section {section!r}"])
+            sections[section].append(record.get("data"))
+        return ImportDocument.model_validate(sections)
+    except ImportValidationError:
+        raise
+    except ValueError as exc:  # json and pydantic validation errors
+        raise ImportValidationError([str(exc)]) from exc
+
+
+def _peg_type(raw: str) -> PegType:
+    value = raw.strip()
+    try:
+        return PegType[value.upper()]
+    except KeyError:
+        return PegType(value.lower())
+
+
+def import_document(db: Session, doc: ImportDocument, upsert: bool = False) -> dict:
+    errors: list[str] = []
+
+    # --- Resolve everything the document refers to (one query per table) ---
+    gem_names = {g.name for g in doc.gemstones} | {
+        h.gemstone_name for h in doc.holdings if h.gemstone_name
+    }
+    gem_ids = {h.gemstone_id for h in doc.holdings if h.gemstone_id is not None}
+    existing_gems = {}
+    if gem_names or gem_ids:
+        gem_rows = db.execute(
+            select(Gemstone.id, Gemstone.name, Gemstone.value_per_carat_oz_gold).where(
+                or_(Gemstone.name.in_(gem_names), Gemstone.id.in_(gem_ids))
+            )
+        ).all()
+        existing_gems = {r.name: r for r in gem_rows}
+    gems_by_id = {r.id: r for r in existing_gems.values()}
+
+    player_names = {h.player_name for h in doc.holdings if h.player_name}
+    player_ids = {h.player_id for h in doc.holdings if h.player_id is not None}
+    players_by_name, known_player_ids = {}, set()
+    if player_names or player_ids:
+        player_rows = db.execute(
+            select(Player.id, Player.name).where(
+                or_(Player.name.in_(player_names), Player.id.in_(player_ids))
+            )
+        ).all()
+        players_by_name = {r.name: r.id for r in player_rows}
+        known_player_ids = {r.id for r in player_rows}
+
+    currency_names = [c.name for c in doc.currencies]
+    existing_currencies = {}
+    if currency_names:
+        found_currencies = db.execute(
+            select(Currency.id, Currency.name).where(Currency.name.in_(currency_names))
+        ).all()
+        existing_currencies = {r.name: r.id for r in found_currencies}
+
+    # --- Validate ---
+    seen: set[str] = set()
+    for i, gem in enumerate(doc.gemstones):
+        if gem.name in seen:
+            errors.append(f"gemstones[{i}]: duplicate name '{gem.name}' in document")
+        seen.add(gem.name)
+        if gem.name in existing_gems and not upsert:
+            errors.append(f"gemstones[{i}]: gemstone '{gem.name}' already exists")
+
+    seen = set()
+    peg_types: list[PegType | None] = []
+    for i, cur in enumerate(doc.currencies):
+        if cur.name in seen:
+            errors.append(f"currencies[{i}]: duplicate name '{cur.name}' in document")
+        seen.add(cur.name)
+        if cur.name in existing_currencies and not upsert:
+            errors.append(f"currencies[{i}]: currency '{cur.name}' already exists")
+        if cur.name == "USD":
+            errors.append(f"currencies[{i}]: USD is managed automatically")
+        try:
+            peg_types.append(_peg_type(cur.peg_type))
+        except ValueError:
+            peg_types.append(None)
+            errors.append(f"currencies[{i}]: invalid peg_type '{cur.peg_type}'")
+
+    doc_gem_values = {g.name: g.value_per_carat_oz_gold for g in doc.gemstones}
+    holding_refs: list[tuple[int | None, str | None, float]] = []
+    for i, h in enumerate(doc.holdings):
+        player_id = (
+            h.player_id if h.player_id is not None else players_by_name.get(h.player_name or "")
+        )
+        if player_id is None or player_id not in known_player_ids:
+            who = h.player_id if h.player_id is not None else repr(h.player_name)
+            errors.append(f"holdings[{i}]: player {who} not found")
+        gem_name = h.gemstone_name
+        if gem_name is None and h.gemstone_id is not None:
+            gem_row = gems_by_id.get(h.gemstone_id)
+            gem_name = gem_row.name if gem_row else None
+        if gem_name is None or (gem_name not in existing_gems and gem_name not in doc_gem_values):
+            which = h.gemstone_id if h.gemstone_id is not None else repr(h.gemstone_name)
+            errors.append(f"holdings[{i}]: gemstone {which} not found")
+            gem_name = None
+        if h.carats <= 0:
+            errors.append(f"holdings[{i}]: carats must be positive")
+        holding_refs.append((player_id, gem_name, h.carats))
+
+    if errors:
+        raise ImportValidationError(errors)
+
+    # --- Write everything in one transaction ---
+    inserted = {"gemstones": 0, "currencies": 0, "denominations": 0, "holdings": 0}
+    updated = {"gemstones": 0, "currencies": 0, "holdings": 0}
+    try:
+        gem_id_by_name = {name: row.id for name, row in existing_gems.items()}
+        gem_value_by_name = {
+            name: row.value_per_carat_oz_gold for name, row in existing_gems.items()
+        }
+
+        new_gems = [g.model_dump() for g in doc.gemstones if g.name not in existing_gems]
+        if new_gems:
+            for row in db.execute(insert(Gemstone).returning(Gemstone.id, Gemstone.name), new_gems):
+                gem_id_by_name[row.name] = row.id
+            inserted["gemstones"] = len(new_gems)
+        gem_updates = [
+            {"id": existing_gems[g.name].id, "value_per_carat_oz_gold": g.value_per_carat_oz_gold}
+            for g in doc.gemstones
+            if g.name in existing_gems
+        ]
+        if gem_updates:
+            db.execute(update(Gemstone), gem_updates)
+            updated["gemstones"] = len(gem_updates)
+            # Before the new holdings go in, so only pre-existing ones are re-priced
+            updated["holdings"] = revalue_gemstone_holdings(db, [u["id"] for u in gem_updates])
+        gem_value_by_name.update(doc_gem_values)
+
+        currency_rows = [
+            {
+                "name": c.name,
+                "peg_type": peg,
+                "peg_target": c.peg_target,
+                "base_unit_value": c.base_unit_value,
+            }
+            for c, peg in zip(doc.currencies, peg_types)
+        ]
+        new_currencies = [r for r in currency_rows if r["name"] not in existing_currencies]
+        currency_id_by_name = dict(existing_currencies)
+        if new_currencies:
+            for row in db.execute(
+                insert(Currency).returning(Currency.id, Currency.name), new_currencies
+            ):
+                currency_id_by_name[row.name] = row.id
+            inserted["currencies"] = len(new_currencies)
+        currency_updates = [
+            {"id": existing_currencies[r["name"]], **{k: v for k, v in r.items() if k != "name"}}
+            for r in currency_rows
+            if r["name"] in existing_currencies
+        ]
+        if currency_updates:
+            db.execute(update(Currency), currency_updates)
+            # Upsert replaces denominations, matching POST /currencies/?upsert=true
+            db.execute(
+                delete(CurrencyDenomination).where(
+                    CurrencyDenomination.currency_id.in_([u["id"] for u in currency_updates])
+                )
+            )
+            updated["currencies"] = len(currency_updates)
+        denominations = [
+            {
+                "currency_id": currency_id_by_name[c.name],
+                "name": d.name,
+                "value_in_base_units": d.value_in_base_units,
+            }
+            for c in doc.currencies
+            for d in c.denominations
+        ]
+        if denominations:
+            db.execute(
+                insert(CurrencyDenomination).returning(CurrencyDenomination.id), denominations
+            )
+            inserted["denominations"] = len(denominations)
+
+        holdings = [
+            {
+                "player_id": player_id,
+                "gemstone_id": gem_id_by_name[gem_name],
+                "carats": carats,
+                "appraised_value_oz_gold": (
+                    h.appraised_value_oz_gold
+                    if h.appraised_value_oz_gold is not None
+                    else carats * gem_value_by_name[gem_name]
+                ),
+                "manual_appraisal": h.appraised_value_oz_gold is not None,
+            }
+            for h, (player_id, gem_name, carats) in zip(doc.holdings, holding_refs)
+        ]
+        if holdings:
+            # RETURNING makes SQLAlchemy batch these into multi-row INSERT ... VALUES statements
+            db.execute(insert(PlayerGemstone).returning(PlayerGemstone.id), holdings)
+            apply_deltas(
+                db,
+                [(h["player_id"], "gemstones", h["appraised_value_oz_gold"], 1) for h in holdings],
+            )
+            inserted["holdings"] = len(holdings)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"inserted": inserted, "updated": updated}
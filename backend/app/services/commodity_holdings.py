@@ -0,0 +1,135 @@
+"""Valuation of player metal and material holdings in the database.
+
+Each holding is joined to the latest price row for its commodity (a correlated
+lookup on the name index) and converted to ounces of gold in the same SELECT.
+Mass units are normalised through ounces with a SQL ``CASE``, so a hoard of any
+size is valued in one query. Holdings whose unit cannot be converted to the
+price unit (e.g. "board ft" against "ton") come back with a NULL value.
+
+Holdings count towards net worth under the ``metals`` and ``materials``
+categories at their latest-price value; new prices revalue them through
+``services/revaluation.py``.
+"""
+
+from typing import Optional, cast
+
+from sqlalchemy import case, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from ..models.material import MaterialPriceHistory, PlayerMaterialHolding
+from ..models.metal import MetalPriceHistory, PlayerMetalHolding
+
+# Avoirdupois ounces per unit; "ton" is the US short ton used by the price tables
+OUNCES_PER_UNIT: dict[str, float] = {
+    "oz": 1.0,
+    "lb": 16.0,
+    "kg": 35.27396195,
+    "ton": 32000.0,
+}
+
+HoldingModel = type[PlayerMetalHolding] | type[PlayerMaterialHolding]
+PriceModel = type[MetalPriceHistory] | type[MaterialPriceHistory]
+
+# kind -> (holding model, price model, commodity name attribute)
+COMMODITIES: dict[str, tuple[HoldingModel, PriceModel, str]] = {
+    "metal": (PlayerMetalHolding, MetalPriceHistory, "metal_name"),
+    "material": (PlayerMaterialHolding, MaterialPriceHistory, "material_name"),
+}
+
+# kind -> net worth category
+COMMODITY_CATEGORIES = {"metal": "metals", "material": "materials"}
+
+
+def _ounces_per(unit_col):
+    return case(
+        *((unit_col == unit, literal(factor)) for unit, factor in OUNCES_PER_UNIT.items()),
+        else_=None,
+    )
+
+
+def unit_factor(holding_unit, price_unit):
+    """SQL expression: price units per holding unit (NULL when not convertible)."""
+    return case(
+        (holding_unit == price_unit, literal(1.0)),
+        else_=_ounces_per(holding_unit) / _ounces_per(price_unit),
+    )
+
+
+def is_convertible(holding_unit: str, price_unit: str) -> bool:
+    return holding_unit == price_unit or (
+        holding_unit in OUNCES_PER_UNIT and price_unit in OUNCES_PER_UNIT
+    )
+
+
+def latest_price(db: Session, kind: str, name: str):
+    _holding, price_model, name_attr = COMMODITIES[kind]
+    return db.execute(
+        select(price_model)
+        .where(getattr(price_model, name_attr) == name)
+        .order_by(price_model.created_at.desc(), price_model.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def valuation_stmt(kind: str, player_id: Optional[int] = None):
+    """One SELECT valuing holdings against the latest price row of each commodity."""
+    holding, price_model, name_attr = COMMODITIES[kind]
+    inner = cast(PriceModel, aliased(price_model))  # mypy joins the union to Base otherwise
+    latest_id = (
+        select(inner.id)
+        .where(getattr(inner, name_attr) == getattr(holding, name_attr))
+        .order_by(inner.created_at.desc(), inner.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    value = (
+        holding.quantity
+        * unit_factor(holding.unit, price_model.unit)
+        * price_model.price_per_oz_gold
+    )
+    stmt = (
+        select(
+            holding.id,
+            holding.player_id,
+            getattr(holding, name_attr).label("name"),
+            holding.quantity,
+            holding.unit,
+            price_model.unit.label("price_unit"),
+            price_model.price_per_oz_gold,
+            price_model.session_number,
+            value.label("value_oz_gold"),
+        )
+        .outerjoin(price_model, price_model.id == latest_id)
+        .order_by(holding.created_at, holding.id)
+    )
+    if player_id is not None:
+        stmt = stmt.where(holding.player_id == player_id)
+    return stmt
+
+
+def holding_value(db: Session, kind: str, holding_id: int) -> float:
+    """One holding's value in oz gold at the latest price (0.0 if it cannot be valued)."""
+    holding = COMMODITIES[kind][0]
+    row = db.execute(valuation_stmt(kind).where(holding.id == holding_id)).first()
+    return (row.value_oz_gold or 0.0) if row else 0.0
+
+
+def value_player_holdings(db: Session, kind: str, player_id: int) -> dict:
+    name_attr = COMMODITIES[kind][2]
+    holdings = []
+    total = 0.0
+    for row in db.execute(valuation_stmt(kind, player_id)):
+        holdings.append(
+            {
+                "id": row.id,
+                name_attr: row.name,
+                "quantity": row.quantity,
+                "unit": row.unit,
+                "price_unit": row.price_unit,
+                "price_per_oz_gold": row.price_per_oz_gold,
+                "session_number": row.session_number,
+                "value_oz_gold": row.value_oz_gold,
+            }
+        )
+        total += row.value_oz_gold or 0.0
+    return {"player_id": player_id, "holdings": holdings, "total_oz_gold": total}
@@ -5,14 +5,15 @@ This service handles all conversions between different currencies and units,
 using USD as the base unit for all value calculations with flexible pegging.
 """
 
-from typing import Dict, List, Tuple, Optional
+from decimal import Decimal
+from typing import Dict, List, Optional
+
 from sqlalchemy.orm import Session
-from decimal import Decimal, ROUND_HALF_UP
 
-from ..models.currency import Currency, CurrencyDenomination, PegType
-from ..models.metal import MetalPriceHistory
+from ..models.currency import Currency, PegType
 from ..models.gemstone import Gemstone
-from ..core.database import get_db
+from ..models.metal import MetalPriceHistory
+from .gm_settings import gm_settings
 
 
 class ConversionService:
@@ -136,6 +137,36 @@ class ConversionService:
         # Convert to USD first, then to target currency
         usd_amount = self.currency_to_usd(amount, from_currency, session_number)
         return self.usd_to_currency(usd_amount, to_currency, session_number)
+
+    def exchange(
+        self,
+        amount: float,
+        from_currency: str,
+        to_currency: str,
+        session_number: Optional[int] = None,
+    ) -> Dict:
+        """Exchange at the bank: convert `amount`, less the GM's fee (kept in `to_currency`).
+
+        The rate is worked out once and the fee folded into it, so the fee costs
+        one multiplication.
+        """
+        fee_percent = (
+            gm_settings(self.db).exchange_fee_percent if from_currency != to_currency else 0.0
+        )
+        market_rate = self.convert_between_currencies(
+            1.0, from_currency, to_currency, session_number
+        )
+        rate = market_rate * (1 - fee_percent / 100.0)
+        converted = amount * rate
+        return {
+            "amount": amount,
+            "from_currency": from_currency,
+            "to_currency": to_currency,
+            "rate": rate,
+            "fee_percent": fee_percent,
+            "fee_amount": amount * market_rate - converted,
+            "converted_amount": converted,
+        }
     
     def metal_value_to_oz_gold(self, metal_name: str, amount: float, unit: str, 
                               session_number: Optional[int] = None) -> float:
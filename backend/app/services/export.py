@@ -0,0 +1,96 @@
+"""Streaming NDJSON/CSV export of campaign tables.
+
+Rows are pulled from the database in fixed-size partitions (``yield_per``) and
+encoded one partition at a time, so memory stays flat no matter how many
+sessions of price history or inbox traffic a campaign has accumulated.
+"""
+
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..core.database import Base
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Never leave the server, whatever the caller asks for
+EXCLUDED_COLUMNS: dict[str, set[str]] = {"players": {"password_hash"}}
+
+
+def available_tables() -> list[str]:
+    return sorted(Base.metadata.tables)
+
+
+def resolve_tables(requested: Iterable[str] | None) -> list[str]:
+    """Validate a table selection; an empty selection means every table."""
+    known = available_tables()
+    selected = [t for t in (requested or []) if t]
+    if not selected:
+        return known
+    unknown = [t for t in selected if t not in known]
+    if unknown:
+        raise ValueError(f"Unknown table(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(selected))
+
+
+def _export_columns(table_name: str):
+    table = Base.metadata.tables[table_name]
+    excluded = EXCLUDED_COLUMNS.get(table_name, set())
+    # Generated columns are derived from the others; nothing to carry
+    return table, [c for c in table.columns if c.name not in excluded and c.computed is None]
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def iter_table_partitions(
+    bind: Engine | Connection, table_name: str
+) -> Iterator[tuple[list[str], list[tuple]]]:
+    """Yield (column names, rows) batches for one table, streamed with yield_per."""
+    table, columns = _export_columns(table_name)
+    names = [c.name for c in columns]
+    stmt = select(*columns)
+    if "id" in table.c:
+        stmt = stmt.order_by(table.c.id)
+    with Session(bind=bind) as session:
+        result = session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield names, [tuple(_plain(v) for v in row) for row in partition]
+
+
+def stream_ndjson(bind: Engine | Connection, tables: list[str]) -> Iterator[str]:
+    """One JSON object per line: {"table": ..., "data": {...}}."""
+    for table_name in tables:
+        for names, rows in iter_table_partitions(bind, table_name):
+            yield "".join(
+                json.dumps({"table": table_name, "data": dict(zip(names, row))}, default=str) + "\n"
+                for row in rows
+            )
+
+
+def stream_csv(bind: Engine | Connection, table_name: str) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    _table, columns = _export_columns(table_name)
+    writer.writerow([c.name for c in columns])
+    for _names, rows in iter_table_partitions(bind, table_name):
+        writer.writerows(
+            [json.dumps(v) if isinstance(v, (dict, list)) else v for v in row] for row in rows
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,103 @@
+"""Cached snapshot of the GM's economic settings.
+
+``gm_settings`` holds a single row, created on first read with an
+``INSERT ... SELECT ... WHERE NOT EXISTS`` so concurrent first reads cannot add a
+second one. Reads are served from an epoch cache as an immutable
+:class:`SettingsSnapshot`; any write to the row (the PATCH endpoint or an ORM
+flush) invalidates it when its transaction commits.
+"""
+
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, exists, false, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..models.gm import GMSettings
+from ..utils.cache import EpochCache, mark_cache_dirty
+
+_settings_cache = EpochCache()
+
+
+class SettingsSnapshot(NamedTuple):
+    id: int
+    exchange_fee_percent: float
+    interest_rate_percent: float
+    interest_compounding: str
+    growth_factor_percent: float
+    hide_dollar_from_players: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
+_COLUMNS = (
+    GMSettings.id,
+    GMSettings.exchange_fee_percent,
+    GMSettings.interest_rate_percent,
+    GMSettings.interest_compounding,
+    GMSettings.growth_factor_percent,
+    GMSettings.hide_dollar_from_players,
+    GMSettings.created_at,
+    GMSettings.updated_at,
+)
+
+
+def _settings_row_id():
+    # The oldest row is authoritative should a database carry extras
+    return select(func.min(GMSettings.id)).scalar_subquery()
+
+
+def ensure_settings(db: Session) -> bool:
+    """Create the settings row with defaults if it is missing.
+
+    Returns True if it was created. Does not commit.
+    """
+    result = db.execute(
+        insert(GMSettings).from_select(
+            [
+                "exchange_fee_percent",
+                "interest_rate_percent",
+                "interest_compounding",
+                "growth_factor_percent",
+                "hide_dollar_from_players",
+            ],
+            select(literal(0.0), literal(0.0), literal("session"), literal(0.0), false()).where(
+                ~exists(select(GMSettings.id))
+            ),
+        )
+    )
+    return bool(result.rowcount)
+
+
+def _read_settings(db: Session) -> SettingsSnapshot:
+    stmt = select(*_COLUMNS).where(GMSettings.id == _settings_row_id())
+    row = db.execute(stmt).first()
+    if row is None:
+        ensure_settings(db)
+        db.flush()  # the caller owns the transaction; a rollback only drops the default row
+        row = db.execute(stmt).one()
+    return SettingsSnapshot(*row)
+
+
+def gm_settings(db: Session) -> SettingsSnapshot:
+    """The current settings, from cache unless they have changed since they were read."""
+    return _settings_cache.get(db.get_bind(), lambda: _read_settings(db))
+
+
+def update_gm_settings(db: Session, changes: dict) -> None:
+    """Apply `changes` to the settings row. Does not commit."""
+    ensure_settings(db)
+    if changes:
+        db.execute(
+            update(GMSettings)
+            .where(GMSettings.id == _settings_row_id())
+            .values(**changes)
+            .execution_options(synchronize_session=False)
+        )
+    mark_cache_dirty(db)
+
+
+@event.listens_for(Session, "after_flush")
+def _settings_changed(session: Session, flush_context) -> None:
+    if any(isinstance(obj, GMSettings) for obj in (*session.new, *session.dirty, *session.deleted)):
+        mark_cache_dirty(session)
@@ -0,0 +1,100 @@
+"""Moving settled inbox messages out of the live table.
+
+``inbox_messages`` is read on every GM inbox load, so it should hold only what
+the GM still acts on. :func:`archive_inbox` moves messages that are no longer
+pending and have not changed for a while into ``inbox_archive`` (same ids, same
+payload), a batch at a time: one INSERT ... SELECT copies the batch, one DELETE
+removes it, and each batch commits on its own so the table is never locked for
+long. The archive stays searchable through ``/gm/inbox/archive``.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.gm import ArchivedInboxMessage, InboxMessage, InboxMessageStatus
+from .inbox_events import publish_inbox_archived
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 500
+_COPIED_COLUMNS = ("id", "type", "status", "payload", "created_at", "updated_at", "player_id")
+
+
+def archive_inbox(
+    db: Session,
+    older_than: timedelta,
+    now: Optional[datetime] = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> list[int]:
+    """Archive non-pending messages last updated more than `older_than` ago.
+
+    Commits each batch; returns the ids moved.
+    """
+    cutoff = (now or datetime.utcnow()) - older_than
+    archived: list[int] = []
+    while True:
+        ids = list(
+            db.execute(
+                select(InboxMessage.id)
+                .where(
+                    InboxMessage.status != InboxMessageStatus.PENDING.value,
+                    InboxMessage.updated_at < cutoff,
+                )
+                .order_by(InboxMessage.id)
+                .limit(batch_size)
+            ).scalars()
+        )
+        if not ids:
+            return archived
+        db.execute(
+            insert(ArchivedInboxMessage).from_select(
+                _COPIED_COLUMNS,
+                select(*(getattr(InboxMessage, c) for c in _COPIED_COLUMNS)).where(
+                    InboxMessage.id.in_(ids)
+                ),
+            )
+        )
+        db.execute(
+            delete(InboxMessage)
+            .where(InboxMessage.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        publish_inbox_archived(ids)
+        archived.extend(ids)
+
+
+def run_inbox_archiver(session_factory: Callable[[], Session], older_than: timedelta) -> int:
+    db = session_factory()
+    try:
+        archived = archive_inbox(db, older_than)
+    finally:
+        db.close()
+    if archived:
+        logger.info(f"Archived {len(archived)} inbox messages")
+    return len(archived)
+
+
+def start_inbox_archiver(
+    session_factory: Callable[[], Session], interval_seconds: float, older_than_days: float
+) -> Optional[threading.Event]:
+    """Archive every `interval_seconds` on a daemon thread; set the returned event to stop it."""
+    if interval_seconds <= 0:
+        return None
+    stop = threading.Event()
+    older_than = timedelta(days=older_than_days)
+
+    def _loop() -> None:
+        while not stop.wait(interval_seconds):
+            try:
+                run_inbox_archiver(session_factory, older_than)
+            except Exception as exc:  # try again on the next tick
+                logger.error(f"Inbox archival errored: {exc}")
+
+    threading.Thread(target=_loop, name="inbox-archiver", daemon=True).start()
+    return stop
@@ -0,0 +1,88 @@
+"""Live GM inbox: deltas pushed over Server-Sent Events.
+
+Write paths that create an inbox message or change its status call
+:func:`publish_inbox_change` after committing. The GM's browser holds one
+``/gm/inbox/stream`` connection and applies each delta to the list it loaded
+once, instead of re-fetching the whole inbox. On reconnect the browser sends
+``Last-Event-ID`` and receives only what it missed; if those events have aged
+out of the broker's history (or the server restarted) it gets a ``reset``
+event and reloads the list. When the archiver moves settled messages out of the
+live inbox it publishes one ``archived`` delta carrying their ids.
+"""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from ..models.gm import ArchivedInboxMessage, InboxMessage
+from ..utils.pubsub import Broker
+
+INBOX_TOPIC = "inbox"
+KEEPALIVE_SECONDS = 15.0
+RESET_FRAME = "event: reset\ndata: {}\n\n"
+
+inbox_broker = Broker()
+
+
+def message_row(
+    message: InboxMessage | ArchivedInboxMessage, include_payload: bool = True
+) -> dict:
+    """The list-view shape of a message (matches InboxMessageRead).
+
+    The summary keys come from the generated columns.
+    """
+    return {
+        "id": message.id,
+        "type": message.type,
+        "status": message.status,
+        "payload": message.payload if include_payload else None,
+        "payload_player_id": message.payload_player_id,
+        "item_type": message.payload_item_type,
+        "amount": message.payload_amount,
+        "created_at": message.created_at,
+        "updated_at": message.updated_at,
+        "player_id": message.player_id,
+        "player_username": message.player.name if message.player else None,
+    }
+
+
+def publish_inbox_change(op: str, message: InboxMessage) -> None:
+    """Push a committed change ("created" or "updated") to every connected GM inbox."""
+    inbox_broker.publish(INBOX_TOPIC, {"op": op, "message": message_row(message)})
+
+
+def publish_inbox_archived(message_ids: list[int]) -> None:
+    """Tell connected GM inboxes these messages have left the live inbox."""
+    inbox_broker.publish(INBOX_TOPIC, {"op": "archived", "ids": message_ids})
+
+
+async def inbox_stream(
+    last_event_id: Optional[int],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keepalive: float = KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """text/event-stream frames: missed events since `last_event_id`, then live ones."""
+    # Subscribe before replaying, so nothing falls in the gap
+    subscription, joined_at = inbox_broker.subscribe()
+    sent = joined_at if last_event_id is None else last_event_id
+    try:
+        if last_event_id is not None:
+            missed = inbox_broker.since(last_event_id)
+            if missed is None:
+                yield RESET_FRAME
+            else:
+                for past in missed:
+                    yield past.sse
+                    sent = past.id
+        while not await is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                yield RESET_FRAME
+            elif event.id > sent:
+                yield event.sse
+                sent = event.id
+    finally:
+        inbox_broker.unsubscribe(subscription)
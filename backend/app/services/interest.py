@@ -0,0 +1,129 @@
+"""Interest on bank balances, accrued for every account at once.
+
+At each session advance every player account with a positive balance earns
+``GMSettings.interest_rate_percent`` of it. One INSERT ... SELECT works out the
+interest for every account and every session of the run, a second adds the
+bank's balancing leg per session, and a grouped upsert moves the balances, so
+the cost does not grow with a Python loop over accounts. With ``session``
+compounding, interest is earned on interest already paid; with ``simple`` it is
+earned on the balance less all interest received so far.
+
+Each session's interest is one ledger transaction with the id
+``interest-<session>`` (``interest-<epoch>-<session>`` once the session counter
+has been reset, since the numbers then come round again). Sessions that already
+have one are skipped, so retrying an advance never pays twice. Overdrawn
+accounts neither earn nor pay interest; loans carry their own.
+"""
+
+from sqlalchemy import Integer, SQLColumnExpression, String, cast, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from ..models.ledger import AccountBalance, LedgerEntry
+from .ledger import PLAYER_ACCOUNTS, apply_posted_transactions
+from .session_state import reset_epoch
+
+COMPOUNDING = ("session", "simple")
+BANK_INTEREST_EXPENSE = "bank:interest_expense"
+
+
+def _transaction_prefix(epoch: int) -> str:
+    return "interest-" if epoch == 0 else f"interest-{epoch}-"
+
+
+def interest_transaction_id(session_number: int, epoch: int = 0) -> str:
+    return f"{_transaction_prefix(epoch)}{session_number}"
+
+
+def _steps(first: int, last: int, rate: float, compounding: str):
+    """Recursive CTE of (session_number, factor).
+
+    The factor is the share of the opening base paid as interest in that session.
+    """
+    growth = 1 + rate if compounding == "session" else 1.0
+    start = select(literal(first).label("session_number"), literal(rate).label("factor")).cte(
+        "interest_steps", recursive=True
+    )
+    return start.union_all(
+        select(start.c.session_number + 1, start.c.factor * growth).where(
+            start.c.session_number < last
+        )
+    )
+
+
+def accrue_interest(
+    db: Session, sessions: list[int], rate_percent: float, compounding: str = "session"
+) -> int:
+    """Pay interest on every positive player balance for each of `sessions`.
+
+    Returns the number of entries written. Does not commit.
+    """
+    if not rate_percent or not sessions:
+        return 0
+    if compounding not in COMPOUNDING:
+        raise ValueError(f"Unknown interest compounding '{compounding}'")
+    epoch = reset_epoch(db)
+    already_paid = set(
+        db.execute(
+            select(LedgerEntry.transaction_id)
+            .where(
+                LedgerEntry.transaction_id.in_(
+                    [interest_transaction_id(s, epoch) for s in sessions]
+                )
+            )
+            .distinct()
+        ).scalars()
+    )
+    due = [s for s in sessions if interest_transaction_id(s, epoch) not in already_paid]
+    if not due:
+        return 0
+
+    steps = _steps(min(due), max(due), rate_percent / 100.0, compounding)
+    base: SQLColumnExpression[int] = AccountBalance.units
+    if compounding == "simple":
+        earned = (
+            select(func.coalesce(func.sum(LedgerEntry.units), 0))
+            .where(LedgerEntry.account == AccountBalance.account, LedgerEntry.kind == "interest")
+            .scalar_subquery()
+        )
+        base = base - earned
+    interest = cast(func.round(base * steps.c.factor), Integer)
+    transaction_id = literal(_transaction_prefix(epoch), String) + cast(
+        steps.c.session_number, String
+    )
+    memo = f"Interest at {rate_percent}% per session"
+    columns = ["transaction_id", "account", "kind", "units", "memo", "session_number"]
+
+    result = db.execute(
+        insert(LedgerEntry).from_select(
+            columns,
+            select(
+                transaction_id,
+                AccountBalance.account,
+                literal("interest"),
+                interest,
+                literal(memo),
+                steps.c.session_number,
+            )
+            .select_from(steps)
+            .join(AccountBalance, AccountBalance.account.like(PLAYER_ACCOUNTS))
+            .where(steps.c.session_number.in_(due), base > 0, interest != 0),
+        )
+    )
+    due_ids = [interest_transaction_id(s, epoch) for s in due]
+    db.execute(
+        insert(LedgerEntry).from_select(
+            columns,
+            select(
+                LedgerEntry.transaction_id,
+                literal(BANK_INTEREST_EXPENSE),
+                literal("interest"),
+                -func.sum(LedgerEntry.units),
+                literal(memo),
+                LedgerEntry.session_number,
+            )
+            .where(LedgerEntry.transaction_id.in_(due_ids))
+            .group_by(LedgerEntry.transaction_id, LedgerEntry.session_number),
+        )
+    )
+    apply_posted_transactions(db, due_ids)
+    return result.rowcount or 0
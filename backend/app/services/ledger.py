@@ -0,0 +1,320 @@
+"""Double-entry banking ledger.
+
+Every movement of money is a transaction of two or more legs in
+``ledger_entries`` whose amounts sum to zero; entries are only ever inserted.
+``account_balances`` holds the running total per account and is moved by the
+same statements, in the same database transaction, so reading a balance is a
+primary-key lookup. :func:`check_integrity` recomputes every balance from the
+entries and reports any account or transaction that does not add up; the
+application runs it periodically on a background thread.
+"""
+
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable, Iterable, NamedTuple, Optional, cast
+
+from sqlalchemy import (
+    Table,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.ledger import UNITS_PER_OZ, AccountBalance, LedgerEntry
+from ..utils.pagination import DEFAULT_PAGE_SIZE, Page, paginate
+
+logger = logging.getLogger(__name__)
+
+BANK_CASH = "bank:cash"  # coin and goods handed over the counter; goes negative as deposits come in
+
+Leg = tuple[str, int]  # (account, signed units)
+
+
+class LedgerError(ValueError):
+    """A transaction that cannot be posted (unbalanced, or it would overdraw an account)."""
+
+
+PLAYER_ACCOUNTS = "player:%"  # LIKE pattern matching every player account
+
+
+def player_account(player_id: int) -> str:
+    return f"player:{player_id}"
+
+
+def to_units(amount_oz_gold: float) -> int:
+    return round(amount_oz_gold * UNITS_PER_OZ)
+
+
+def _apply_to_balances(db: Session, rows: list[dict]) -> None:
+    # Fold the legs per account, then one upsert whatever the number of legs
+    merged: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    for row in rows:
+        merged[row["account"]][0] += row["units"]
+        merged[row["account"]][1] += 1
+    stmt = sqlite_insert(AccountBalance)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AccountBalance.account],
+        set_={
+            "units": AccountBalance.units + stmt.excluded.units,
+            "entries": AccountBalance.entries + stmt.excluded.entries,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {"account": account, "units": units, "entries": entries}
+            for account, (units, entries) in merged.items()
+        ],
+    )
+
+
+def apply_posted_transactions(db: Session, transaction_ids: list[str]) -> None:
+    """Move balances for transactions inserted with INSERT ... SELECT, in one grouped upsert.
+
+    Does not commit.
+    """
+    sums = (
+        select(LedgerEntry.account, func.sum(LedgerEntry.units), func.count())
+        .where(LedgerEntry.transaction_id.in_(transaction_ids))
+        .group_by(LedgerEntry.account)
+    )
+    stmt = sqlite_insert(AccountBalance).from_select(["account", "units", "entries"], sums)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AccountBalance.account],
+        set_={
+            "units": AccountBalance.units + stmt.excluded.units,
+            "entries": AccountBalance.entries + stmt.excluded.entries,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+class Posting(NamedTuple):
+    kind: str
+    legs: list[Leg]
+    memo: Optional[str] = None
+    session_number: Optional[int] = None
+
+
+def post_transactions(db: Session, postings: Iterable[Posting]) -> list[str]:
+    """Append balanced transactions with one bulk insert and one balance upsert.
+
+    Returns their ids. Does not commit.
+    """
+    transaction_ids: list[str] = []
+    rows: list[dict] = []
+    for posting in postings:
+        legs = [(account, units) for account, units in posting.legs if units]
+        if not legs:
+            continue
+        if len(legs) < 2 or sum(units for _, units in legs) != 0:
+            raise LedgerError("Ledger legs must be at least two non-zero amounts that sum to zero")
+        transaction_id = uuid.uuid4().hex
+        transaction_ids.append(transaction_id)
+        rows.extend(
+            {
+                "transaction_id": transaction_id,
+                "account": account,
+                "kind": posting.kind,
+                "units": units,
+                "memo": posting.memo,
+                "session_number": posting.session_number,
+            }
+            for account, units in legs
+        )
+    if rows:
+        db.execute(insert(LedgerEntry), rows)
+        _apply_to_balances(db, rows)
+    return transaction_ids
+
+
+def post_transaction(
+    db: Session,
+    kind: str,
+    legs: Iterable[Leg],
+    memo: Optional[str] = None,
+    session_number: Optional[int] = None,
+) -> str:
+    """Append one balanced transaction and move the balances it touches.
+
+    Returns its id. Does not commit.
+    """
+    transaction_ids = post_transactions(db, [Posting(kind, list(legs), memo, session_number)])
+    if not transaction_ids:
+        raise LedgerError("Ledger legs must be at least two non-zero amounts that sum to zero")
+    return transaction_ids[0]
+
+
+def get_balance(db: Session, account: str) -> tuple[int, int]:
+    """(units, entry count) for an account; (0, 0) if it has never been posted to."""
+    row = db.execute(
+        select(AccountBalance.units, AccountBalance.entries).where(
+            AccountBalance.account == account
+        )
+    ).first()
+    return (row.units, row.entries) if row else (0, 0)
+
+
+def transfer(
+    db: Session,
+    kind: str,
+    source: str,
+    destination: str,
+    units: int,
+    memo: Optional[str] = None,
+    session_number: Optional[int] = None,
+    allow_overdraft: bool = False,
+) -> str:
+    """Move `units` from `source` to `destination`. Does not commit; roll back on LedgerError."""
+    transaction_id = post_transaction(
+        db, kind, [(source, -units), (destination, units)], memo, session_number
+    )
+    # Checked after the write, in the same transaction, so concurrent withdrawals cannot both pass
+    if not allow_overdraft and get_balance(db, source)[0] < 0:
+        raise LedgerError("Insufficient funds")
+    return transaction_id
+
+
+def statement(
+    db: Session, account: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page:
+    """Newest-first page of an account's entries."""
+    query = db.query(LedgerEntry).filter(LedgerEntry.account == account)
+    return paginate(query, LedgerEntry, cursor, limit, descending=True)
+
+
+def purge_accounts(db: Session, patterns: Iterable[str]) -> int:
+    """Delete every transaction with a leg in an account matching a LIKE pattern, all legs included.
+
+    Only for data resets; the ledger is otherwise append-only. The other accounts those
+    transactions touched (the bank's, an income source's) are moved back, so the books still
+    balance. Returns the number of entries deleted. Does not commit.
+    """
+    matches = or_(*(LedgerEntry.account.like(pattern) for pattern in patterns))
+    purged = select(LedgerEntry.transaction_id).where(matches).distinct().scalar_subquery()
+    reversals = [
+        {"target": account, "units": units, "entries": entries}
+        for account, units, entries in db.execute(
+            select(LedgerEntry.account, func.sum(LedgerEntry.units), func.count())
+            .where(LedgerEntry.transaction_id.in_(purged), ~matches)
+            .group_by(LedgerEntry.account)
+        )
+    ]
+    if reversals:
+        balances = cast(Table, AccountBalance.__table__)  # Core UPDATE: executemany on `target`
+        db.execute(
+            update(balances)
+            .where(balances.c.account == bindparam("target"))
+            .values(
+                units=balances.c.units - bindparam("units"),
+                entries=balances.c.entries - bindparam("entries"),
+            ),
+            reversals,
+        )
+    result = db.execute(delete(LedgerEntry).where(LedgerEntry.transaction_id.in_(purged)))
+    db.execute(
+        delete(AccountBalance).where(or_(*(AccountBalance.account.like(p) for p in patterns)))
+    )
+    return result.rowcount or 0
+
+
+def check_integrity(db: Session) -> dict:
+    """Recompute every balance from the entries.
+
+    Reports mismatched accounts and unbalanced transactions.
+    """
+    sums = (
+        select(
+            LedgerEntry.account.label("account"),
+            func.sum(LedgerEntry.units).label("units"),
+            func.count().label("entries"),
+        )
+        .group_by(LedgerEntry.account)
+        .subquery("sums")
+    )
+    # SQLite has no FULL OUTER JOIN: entries without a balance row, then balances without entries
+    drifted = select(
+        sums.c.account,
+        func.coalesce(AccountBalance.units, 0).label("balance_units"),
+        sums.c.units.label("ledger_units"),
+    ).outerjoin(AccountBalance, AccountBalance.account == sums.c.account).where(
+        (AccountBalance.account.is_(None))
+        | (AccountBalance.units != sums.c.units)
+        | (AccountBalance.entries != sums.c.entries)
+    )
+    orphaned = select(
+        AccountBalance.account,
+        AccountBalance.units,
+        literal(0),
+    ).where(
+        ~select(LedgerEntry.id).where(LedgerEntry.account == AccountBalance.account).exists(),
+        AccountBalance.units != 0,
+    )
+    mismatched = [
+        {
+            "account": row.account,
+            "balance_oz_gold": row.balance_units / UNITS_PER_OZ,
+            "ledger_oz_gold": row.ledger_units / UNITS_PER_OZ,
+        }
+        for row in db.execute(union_all(drifted, orphaned).order_by("account"))
+    ]
+    unbalanced = list(
+        db.execute(
+            select(LedgerEntry.transaction_id)
+            .group_by(LedgerEntry.transaction_id)
+            .having(func.sum(LedgerEntry.units) != 0)
+            .order_by(LedgerEntry.transaction_id)
+        ).scalars()
+    )
+    accounts = db.execute(select(func.count()).select_from(AccountBalance)).scalar_one()
+    return {
+        "ok": not mismatched and not unbalanced,
+        "accounts_checked": accounts,
+        "mismatched_accounts": mismatched,
+        "unbalanced_transactions": unbalanced,
+    }
+
+
+def run_integrity_check(session_factory: Callable[[], Session]) -> dict:
+    db = session_factory()
+    try:
+        report = check_integrity(db)
+    finally:
+        db.close()
+    if not report["ok"]:
+        logger.error(f"Ledger integrity check failed: {report}")
+    return report
+
+
+def start_integrity_checker(
+    session_factory: Callable[[], Session], interval_seconds: float
+) -> Optional[threading.Event]:
+    """Run the integrity check every `interval_seconds` on a daemon thread.
+
+    Set the returned event to stop it.
+    """
+    if interval_seconds <= 0:
+        return None
+    stop = threading.Event()
+
+    def _loop() -> None:
+        while not stop.wait(interval_seconds):
+            try:
+                run_integrity_check(session_factory)
+            except Exception as exc:  # keep checking on the next tick
+                logger.error(f"Ledger integrity check errored: {exc}")
+
+    threading.Thread(target=_loop, name="ledger-integrity", daemon=True).start()
+    return stop
@@ -0,0 +1,221 @@
+"""Bank loans: amortization schedules and the per-session repayment batch.
+
+A loan is described by :class:`LoanTerms`. Interest is charged every session
+at ``rate_percent``, either on the original principal (``flat``, the formula the
+GM inbox shows when approving a loan) or on the outstanding balance
+(``declining``). ``per_session`` loans pay a fixed instalment and the final
+session settles whatever is left; ``lump_sum`` loans accrue interest and pay
+everything at the end of the term.
+
+Schedules are worked out in whole micro-ounces, so the payments of a schedule
+always add up to the principal plus its interest, and are returned as parallel
+arrays. NumPy is not a dependency of this project; a schedule is one tight loop
+over integers, which is far below a millisecond even for long terms.
+
+At session advance :func:`apply_loan_sessions` steps every active loan through
+the new sessions with the same arithmetic and posts all repayments to the ledger
+in one bulk insert. The ledger holds one ``loan:<id>`` account per loan whose
+balance is minus the amount still owed.
+"""
+
+from typing import Iterator, NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models.ledger import UNITS_PER_OZ
+from ..models.loan import Loan
+from .ledger import Posting, player_account, post_transaction, post_transactions
+
+PAYMENT_TYPES = ("per_session", "lump_sum")
+INTEREST_METHODS = ("flat", "declining")
+MAX_LOAN_TERM = 520  # ten years of weekly sessions
+
+BANK_INTEREST = "bank:interest_income"
+
+
+class LoanTerms(NamedTuple):
+    principal_units: int
+    rate_percent: float
+    term_sessions: int
+    payment_type: str = "per_session"
+    interest_method: str = "flat"
+
+
+def loan_account(loan_id: int) -> str:
+    return f"loan:{loan_id}"
+
+
+def fixed_payment(terms: LoanTerms) -> int:
+    """The per-session instalment in units (0 for lump sums)."""
+    if terms.payment_type == "lump_sum":
+        return 0
+    principal, rate, term = terms.principal_units, terms.rate_percent / 100.0, terms.term_sessions
+    if terms.interest_method == "flat":
+        return round(principal * (1 + rate * term) / term)
+    if rate == 0:
+        return round(principal / term)
+    return round(principal * rate / (1 - (1 + rate) ** -term))
+
+
+def _steps(
+    terms: LoanTerms, payment: int, balance: int, periods_paid: int, count: int
+) -> Iterator[tuple[int, int, int, int]]:
+    """(period, interest, paid, balance after) for up to `count` sessions after `periods_paid`."""
+    rate = terms.rate_percent / 100.0
+    last = min(periods_paid + count, terms.term_sessions)
+    for period in range(periods_paid + 1, last + 1):
+        interest = round(
+            (terms.principal_units if terms.interest_method == "flat" else balance) * rate
+        )
+        owed = balance + interest
+        paid = owed if period == terms.term_sessions else min(payment, owed)
+        balance = owed - paid
+        yield period, interest, paid, balance
+        if balance == 0:
+            return
+
+
+def amortization_schedule(
+    terms: LoanTerms, balance: Optional[int] = None, periods_paid: int = 0
+) -> dict:
+    """The remaining schedule as parallel arrays, plus its totals."""
+    payment = fixed_payment(terms)
+    columns: dict[str, list] = {
+        "period": [],
+        "payment_oz_gold": [],
+        "interest_oz_gold": [],
+        "principal_oz_gold": [],
+        "balance_oz_gold": [],
+    }
+    total_paid = total_interest = 0
+    start = terms.principal_units if balance is None else balance
+    for period, interest, paid, after in _steps(
+        terms, payment, start, periods_paid, terms.term_sessions
+    ):
+        columns["period"].append(period)
+        columns["payment_oz_gold"].append(paid / UNITS_PER_OZ)
+        columns["interest_oz_gold"].append(interest / UNITS_PER_OZ)
+        columns["principal_oz_gold"].append((paid - interest) / UNITS_PER_OZ)
+        columns["balance_oz_gold"].append(after / UNITS_PER_OZ)
+        total_paid += paid
+        total_interest += interest
+    return {
+        "payment_per_session_oz_gold": payment / UNITS_PER_OZ,
+        "total_paid_oz_gold": total_paid / UNITS_PER_OZ,
+        "total_interest_oz_gold": total_interest / UNITS_PER_OZ,
+        "schedule": columns,
+    }
+
+
+def loan_terms(loan: Loan) -> LoanTerms:
+    return LoanTerms(
+        loan.principal_units,
+        loan.rate_percent,
+        loan.term_sessions,
+        loan.payment_type,
+        loan.interest_method,
+    )
+
+
+def originate_loan(
+    db: Session,
+    player_id: int,
+    terms: LoanTerms,
+    start_session: int,
+    inbox_message_id: Optional[int] = None,
+) -> Loan:
+    """Create the loan and pay the principal into the player's account. Does not commit."""
+    loan = Loan(
+        player_id=player_id,
+        inbox_message_id=inbox_message_id,
+        principal_units=terms.principal_units,
+        rate_percent=terms.rate_percent,
+        term_sessions=terms.term_sessions,
+        payment_type=terms.payment_type,
+        interest_method=terms.interest_method,
+        payment_units=fixed_payment(terms),
+        balance_units=terms.principal_units,
+        start_session=start_session,
+    )
+    db.add(loan)
+    db.flush()
+    post_transaction(
+        db,
+        "loan_disbursal",
+        [
+            (loan_account(loan.id), -terms.principal_units),
+            (player_account(player_id), terms.principal_units),
+        ],
+        f"Loan {loan.id}",
+        start_session,
+    )
+    return loan
+
+
+def apply_loan_sessions(db: Session, sessions: list[int]) -> int:
+    """Charge interest and take the repayments due in `sessions` for every active loan.
+
+    Repayments come out of the player's account even if that overdraws it; a
+    negative balance is the arrears. Returns the number of repayments posted.
+    Does not commit.
+    """
+    loans = db.execute(
+        select(
+            Loan.id,
+            Loan.player_id,
+            Loan.principal_units,
+            Loan.rate_percent,
+            Loan.term_sessions,
+            Loan.payment_type,
+            Loan.interest_method,
+            Loan.payment_units,
+            Loan.balance_units,
+            Loan.periods_paid,
+            Loan.interest_paid_units,
+        ).where(Loan.status == "active")
+    ).all()
+    postings: list[Posting] = []
+    changes: list[dict] = []
+    for loan in loans:
+        terms = LoanTerms(
+            loan.principal_units,
+            loan.rate_percent,
+            loan.term_sessions,
+            loan.payment_type,
+            loan.interest_method,
+        )
+        balance, periods_paid, interest_paid = (
+            loan.balance_units,
+            loan.periods_paid,
+            loan.interest_paid_units,
+        )
+        steps = _steps(terms, loan.payment_units, balance, periods_paid, len(sessions))
+        for session_number, (period, interest, paid, balance) in zip(sessions, steps):
+            periods_paid = period
+            interest_paid += interest
+            postings.append(
+                Posting(
+                    "loan_payment",
+                    [
+                        (loan_account(loan.id), paid - interest),
+                        (BANK_INTEREST, interest),
+                        (player_account(loan.player_id), -paid),
+                    ],
+                    f"Loan {loan.id} session {period}/{terms.term_sessions}",
+                    session_number,
+                )
+            )
+        changes.append(
+            {
+                "id": loan.id,
+                "balance_units": balance,
+                "periods_paid": periods_paid,
+                "interest_paid_units": interest_paid,
+                "status": "paid_off" if balance == 0 else "active",
+            }
+        )
+    post_transactions(db, postings)
+    if changes:
+        db.execute(update(Loan), changes)  # executemany UPDATE by primary key
+    return len(postings)
@@ -0,0 +1,243 @@
+"""Player net worth computed in the database.
+
+Every holding table contributes one branch to a UNION ALL of
+``(player_id, category, value_oz_gold)`` rows, and a single GROUP BY folds them
+into per-player, per-category totals. Nothing is loaded into Python row by row.
+That aggregate seeds the ``player_portfolio_totals`` read model (see
+``services/portfolio.py``), which is what page views read.
+"""
+
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from ..models.art import ArtItem, RealEstateProperty
+from ..models.business import Business, BusinessInvestor
+from ..models.gemstone import PlayerGemstone
+from ..models.player import Player
+from ..models.portfolio import PlayerPortfolioTotal
+from ..utils.cache import EpochCache, cache_epoch
+from .commodity_holdings import COMMODITY_CATEGORIES, valuation_stmt
+from .conversion import ConversionService
+
+CATEGORIES = ("gemstones", "art", "real_estate", "businesses", "metals", "materials")
+
+_wealth_cache = EpochCache()
+
+
+def holdings_union(player_ids: Optional[Iterable[int]] = None):
+    """UNION ALL of every holding as (player_id, category, value_oz_gold).
+
+    Filtering inside each branch keeps the per-player indexes usable.
+    """
+    ids = list(player_ids) if player_ids is not None else None
+
+    def _branch(stmt, player_col):
+        return (
+            stmt.where(player_col.in_(ids))
+            if ids is not None
+            else stmt.where(player_col.is_not(None))
+        )
+
+    branches = [
+        _branch(
+            select(
+                PlayerGemstone.player_id.label("player_id"),
+                literal("gemstones").label("category"),
+                PlayerGemstone.appraised_value_oz_gold.label("value_oz_gold"),
+            ),
+            PlayerGemstone.player_id,
+        ),
+        _branch(
+            select(
+                ArtItem.player_id.label("player_id"),
+                literal("art").label("category"),
+                ArtItem.appraised_value_oz_gold.label("value_oz_gold"),
+            ),
+            ArtItem.player_id,
+        ),
+        _branch(
+            select(
+                RealEstateProperty.player_id.label("player_id"),
+                literal("real_estate").label("category"),
+                RealEstateProperty.appraised_value_oz_gold.label("value_oz_gold"),
+            ),
+            RealEstateProperty.player_id,
+        ),
+        _branch(
+            select(
+                BusinessInvestor.player_id.label("player_id"),
+                literal("businesses").label("category"),
+                (BusinessInvestor.equity_percent / 100.0 * Business.net_worth_oz_gold).label(
+                    "value_oz_gold"
+                ),
+            ).join(Business, Business.id == BusinessInvestor.business_id),
+            BusinessInvestor.player_id,
+        ),
+    ]
+    for kind, category in COMMODITY_CATEGORIES.items():
+        valued = valuation_stmt(kind).order_by(None).subquery(f"{kind}_values")
+        branches.append(
+            _branch(
+                select(
+                    valued.c.player_id.label("player_id"),
+                    literal(category).label("category"),
+                    valued.c.value_oz_gold.label("value_oz_gold"),
+                ),
+                valued.c.player_id,
+            )
+        )
+    return union_all(*branches).subquery("holdings")
+
+
+def category_totals_stmt(player_ids: Optional[Iterable[int]] = None):
+    holdings = holdings_union(player_ids)
+    return select(
+        holdings.c.player_id,
+        holdings.c.category,
+        func.coalesce(func.sum(holdings.c.value_oz_gold), 0.0).label("value_oz_gold"),
+        func.count().label("items"),
+    ).group_by(holdings.c.player_id, holdings.c.category)
+
+
+def compute_category_totals(
+    db: Session, player_ids: Optional[Iterable[int]] = None
+) -> dict[int, dict[str, dict]]:
+    """Return {player_id: {category: {"value_oz_gold", "items"}}} with every category present."""
+    totals: dict[int, dict[str, dict]] = {}
+    for row in db.execute(category_totals_stmt(player_ids)):
+        per_player = totals.setdefault(
+            row.player_id, {c: {"value_oz_gold": 0.0, "items": 0} for c in CATEGORIES}
+        )
+        per_player[row.category] = {
+            "value_oz_gold": float(row.value_oz_gold),
+            "items": int(row.items),
+        }
+    return totals
+
+
+def build_net_worth(
+    db: Session,
+    player_id: int,
+    categories: dict[str, dict],
+    target_currencies: Optional[list[str]] = None,
+) -> dict:
+    """Shape category totals into the net-worth response, converted into display currencies."""
+    total = sum(c["value_oz_gold"] for c in categories.values())
+    service = ConversionService(db)
+    display = service.convert_gold_value_display(total, target_currencies)
+    # Conversions are linear, so one rate per currency converts every category
+    rates: dict[str, float] = {}
+    for name in display["conversions"]:
+        try:
+            rates[name] = service.oz_gold_to_currency(1.0, name)
+        except ValueError:
+            continue
+    return {
+        "player_id": player_id,
+        "total_oz_gold": total,
+        "categories": [
+            {
+                "category": name,
+                "value_oz_gold": data["value_oz_gold"],
+                "items": data["items"],
+                "share": (data["value_oz_gold"] / total) if total else 0.0,
+                "converted": {
+                    currency: data["value_oz_gold"] * rate for currency, rate in rates.items()
+                },
+            }
+            for name, data in categories.items()
+        ],
+        "conversions": display["conversions"],
+    }
+
+
+def read_category_totals(db: Session, player_id: int) -> dict[str, dict]:
+    """Primary-key lookup of one player's maintained totals, with every category present."""
+    categories = {c: {"value_oz_gold": 0.0, "items": 0} for c in CATEGORIES}
+    rows = db.execute(
+        select(
+            PlayerPortfolioTotal.category,
+            PlayerPortfolioTotal.value_oz_gold,
+            PlayerPortfolioTotal.items,
+        ).where(PlayerPortfolioTotal.player_id == player_id)
+    )
+    for row in rows:
+        categories[row.category] = {
+            "value_oz_gold": float(row.value_oz_gold or 0.0),
+            "items": int(row.items or 0),
+        }
+    return categories
+
+
+def get_player_net_worth(
+    db: Session, player_id: int, target_currencies: Optional[list[str]] = None
+) -> dict:
+    categories = read_category_totals(db, player_id)
+    return build_net_worth(db, player_id, categories, target_currencies)
+
+
+def _compute_campaign_wealth(db: Session) -> dict:
+    per_player = (
+        select(
+            PlayerPortfolioTotal.player_id,
+            *(
+                func.sum(
+                    case(
+                        (PlayerPortfolioTotal.category == c, PlayerPortfolioTotal.value_oz_gold),
+                        else_=0.0,
+                    )
+                ).label(c)
+                for c in CATEGORIES
+            ),
+            func.sum(PlayerPortfolioTotal.value_oz_gold).label("total"),
+        )
+        .group_by(PlayerPortfolioTotal.player_id)
+        .subquery()
+    )
+    total = func.coalesce(per_player.c.total, 0.0)
+    stmt = (
+        select(
+            Player.id,
+            Player.name,
+            *(func.coalesce(per_player.c[c], 0.0) for c in CATEGORIES),
+            total,
+            func.rank().over(order_by=total.desc()),
+        )
+        .outerjoin(per_player, per_player.c.player_id == Player.id)
+        .order_by(total.desc(), Player.id)
+    )
+    result: dict = {
+        "player_id": [],
+        "name": [],
+        "rank": [],
+        "total_oz_gold": [],
+        "share": [],
+        "categories": {c: [] for c in CATEGORIES},
+        "category_shares": {c: [] for c in CATEGORIES},
+    }
+    for player_id, name, *values, player_total, rank in db.execute(stmt):
+        result["player_id"].append(player_id)
+        result["name"].append(name)
+        result["rank"].append(rank)
+        result["total_oz_gold"].append(float(player_total))
+        for category, value in zip(CATEGORIES, values):
+            result["categories"][category].append(float(value))
+            result["category_shares"][category].append(
+                float(value) / player_total if player_total else 0.0
+            )
+    campaign_total = sum(result["total_oz_gold"])
+    result["share"] = [
+        t / campaign_total if campaign_total else 0.0 for t in result["total_oz_gold"]
+    ]
+    result["campaign_total_oz_gold"] = campaign_total
+    result["category_totals"] = {c: sum(result["categories"][c]) for c in CATEGORIES}
+    return result
+
+
+def get_campaign_wealth(db: Session) -> dict:
+    """Every player's totals, category breakdown and rank as parallel arrays, cached per epoch."""
+    epoch = cache_epoch()
+    data = _wealth_cache.get(db.get_bind(), lambda: _compute_campaign_wealth(db))
+    return {**data, "epoch": epoch}
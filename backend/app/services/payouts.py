@@ -0,0 +1,102 @@
+"""Business income payouts to investors, computed in one SQL pass.
+
+Each investor is owed ``income x equity / 100``. Amounts are worked out in whole
+ledger units (micro-ounces) so they can be reconciled exactly: every share is
+truncated, and the units lost to truncation are handed back one at a time to the
+investors with the largest truncated fractions (largest-remainder method, ties
+broken by player id).
+The investors of a business therefore always receive exactly
+``round(income x total equity / 100)`` units between them; any equity that is not
+held by an investor stays with the business.
+"""
+
+from typing import Optional
+
+from sqlalchemy import Integer, case, cast, func, literal, select
+from sqlalchemy.orm import Session
+
+from ..models.business import Business, BusinessInvestor
+from ..models.ledger import UNITS_PER_OZ
+
+
+def payout_stmt(session_number: Optional[int] = None):
+    """SELECT (business_id, player_id, units, amount_oz_gold) for every investor payout."""
+    income_units = cast(
+        func.round(Business.income_per_session_oz_gold * UNITS_PER_OZ), Integer
+    )
+    shares = (
+        select(
+            Business.id.label("business_id"),
+            BusinessInvestor.player_id.label("player_id"),
+            (income_units * BusinessInvestor.equity_percent / 100.0).label("exact"),
+        )
+        .join(Business, Business.id == BusinessInvestor.business_id)
+        .where(Business.income_per_session_oz_gold != 0, BusinessInvestor.equity_percent > 0)
+        .cte("shares")
+    )
+    truncated = cast(shares.c.exact, Integer)  # toward zero, so losses reconcile the same way
+    business = shares.c.business_id
+    ranked = select(
+        shares.c.business_id,
+        shares.c.player_id,
+        truncated.label("base"),
+        (
+            cast(func.round(func.sum(shares.c.exact).over(partition_by=business)), Integer)
+            - func.sum(truncated).over(partition_by=business)
+        ).label("leftover"),
+        func.row_number()
+        .over(
+            partition_by=business,
+            order_by=(func.abs(shares.c.exact - truncated).desc(), shares.c.player_id),
+        )
+        .label("position"),
+    ).cte("ranked")
+    units = ranked.c.base + case(
+        (
+            ranked.c.position <= func.abs(ranked.c.leftover),
+            case((ranked.c.leftover > 0, 1), else_=-1),
+        ),
+        else_=0,
+    )
+    columns = [
+        ranked.c.business_id,
+        ranked.c.player_id,
+        units.label("units"),
+        (units / float(UNITS_PER_OZ)).label("amount_oz_gold"),
+    ]
+    if session_number is not None:
+        columns.insert(0, literal(session_number).label("session_number"))
+    return select(*columns)
+
+
+def preview_payouts(db: Session) -> dict:
+    """Dry run of the next payout: arrays per investor plus a per-business reconciliation."""
+    payouts: dict = {"business_id": [], "player_id": [], "amount_oz_gold": []}
+    paid_units: dict[int, int] = {}
+    for row in db.execute(payout_stmt().order_by("business_id", "player_id")):
+        payouts["business_id"].append(row.business_id)
+        payouts["player_id"].append(row.player_id)
+        payouts["amount_oz_gold"].append(row.amount_oz_gold)
+        paid_units[row.business_id] = paid_units.get(row.business_id, 0) + row.units
+
+    businesses: dict = {
+        "business_id": [],
+        "name": [],
+        "income_oz_gold": [],
+        "paid_oz_gold": [],
+        "retained_oz_gold": [],
+    }
+    rows = db.execute(
+        select(Business.id, Business.name, Business.income_per_session_oz_gold)
+        .where(Business.income_per_session_oz_gold != 0)
+        .order_by(Business.id)
+    )
+    for business_id, name, income in rows:
+        income_units = round(income * UNITS_PER_OZ)
+        paid = paid_units.get(business_id, 0)
+        businesses["business_id"].append(business_id)
+        businesses["name"].append(name)
+        businesses["income_oz_gold"].append(income_units / UNITS_PER_OZ)
+        businesses["paid_oz_gold"].append(paid / UNITS_PER_OZ)
+        businesses["retained_oz_gold"].append((income_units - paid) / UNITS_PER_OZ)
+    return {"payouts": payouts, "businesses": businesses}
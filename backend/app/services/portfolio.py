@@ -0,0 +1,134 @@
+"""Maintenance of the ``player_portfolio_totals`` read model.
+
+Write paths describe what changed as ``(player_id, category, value_delta,
+items_delta)`` tuples and call :func:`apply_deltas` before committing, so the
+totals move in the same transaction as the holdings. :func:`rebuild_portfolio_totals`
+recomputes the table from scratch with one INSERT ... SELECT when it drifts.
+The session-advance pipeline copies the totals into ``net_worth_history`` each session.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.player import Player
+from ..models.portfolio import NetWorthHistory, PlayerPortfolioTotal
+from ..utils.cache import mark_cache_dirty
+from .net_worth import CATEGORIES, category_totals_stmt
+
+Delta = tuple[Optional[int], str, float, int]
+
+
+def holding_change(
+    category: str,
+    old_player_id: Optional[int],
+    old_value: float,
+    new_player_id: Optional[int],
+    new_value: float,
+) -> list[Delta]:
+    """Deltas for a single holding whose owner and/or value changed (None = unowned/absent)."""
+    if old_player_id == new_player_id:
+        return [(new_player_id, category, (new_value or 0.0) - (old_value or 0.0), 0)]
+    return [
+        (old_player_id, category, -(old_value or 0.0), -1),
+        (new_player_id, category, new_value or 0.0, 1),
+    ]
+
+
+def apply_deltas(db: Session, deltas: Iterable[Delta]) -> None:
+    """Fold deltas into the totals table with one upsert statement. Does not commit."""
+    merged: dict[tuple[int, str], list] = defaultdict(lambda: [0.0, 0])
+    for player_id, category, value, items in deltas:
+        if player_id is None:
+            continue
+        merged[(player_id, category)][0] += value
+        merged[(player_id, category)][1] += items
+    rows = [
+        {"player_id": player_id, "category": category, "value_oz_gold": value, "items": items}
+        for (player_id, category), (value, items) in merged.items()
+        if value or items
+    ]
+    if not rows:
+        return
+    mark_cache_dirty(db)
+    stmt = sqlite_insert(PlayerPortfolioTotal)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlayerPortfolioTotal.player_id, PlayerPortfolioTotal.category],
+        set_={
+            "value_oz_gold": PlayerPortfolioTotal.value_oz_gold + stmt.excluded.value_oz_gold,
+            "items": PlayerPortfolioTotal.items + stmt.excluded["items"],
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def rebuild_portfolio_totals(db: Session) -> int:
+    """Repair job: recompute every player's totals from the holding tables. Does not commit."""
+    mark_cache_dirty(db)
+    db.execute(delete(PlayerPortfolioTotal))
+    totals = category_totals_stmt().subquery()
+    result = db.execute(
+        insert(PlayerPortfolioTotal).from_select(
+            ["player_id", "category", "value_oz_gold", "items"],
+            select(
+                totals.c.player_id, totals.c.category, totals.c.value_oz_gold, totals.c["items"]
+            ),
+        )
+    )
+    return result.rowcount or 0
+
+
+def snapshot_change(
+    category: str, before: dict[int, float], after: dict[int, float]
+) -> list[Delta]:
+    """Deltas between two {player_id: value} snapshots of a holding with several owners."""
+    deltas: list[Delta] = []
+    for player_id in before.keys() | after.keys():
+        items = (player_id in after) - (player_id in before)
+        value = after.get(player_id, 0.0) - before.get(player_id, 0.0)
+        if value or items:
+            deltas.append((player_id, category, value, items))
+    return deltas
+
+
+def net_worth_series(
+    db: Session,
+    player_id: int,
+    from_session: Optional[int] = None,
+    to_session: Optional[int] = None,
+) -> dict:
+    """Columnar series for one player: parallel arrays indexed by session."""
+    stmt = select(
+        NetWorthHistory.session_number, NetWorthHistory.category, NetWorthHistory.value_oz_gold
+    ).where(NetWorthHistory.player_id == player_id)
+    if from_session is not None:
+        stmt = stmt.where(NetWorthHistory.session_number >= from_session)
+    if to_session is not None:
+        stmt = stmt.where(NetWorthHistory.session_number <= to_session)
+    stmt = stmt.order_by(NetWorthHistory.session_number)
+
+    sessions: list[int] = []
+    categories: dict[str, list[float]] = {c: [] for c in CATEGORIES}
+    for session_number, category, value in db.execute(stmt):
+        if not sessions or sessions[-1] != session_number:
+            sessions.append(session_number)
+            for column in categories.values():
+                column.append(0.0)
+        categories.setdefault(category, [0.0] * len(sessions))[-1] = float(value or 0.0)
+    totals = [sum(values) for values in zip(*categories.values())] if sessions else []
+    return {
+        "player_id": player_id,
+        "sessions": sessions,
+        "total_oz_gold": totals,
+        "categories": categories,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _players_changed(session: Session, flush_context) -> None:
+    # Wealth views list every player, including ones with no holdings yet
+    if any(isinstance(obj, Player) for obj in (*session.new, *session.dirty, *session.deleted)):
+        mark_cache_dirty(session)
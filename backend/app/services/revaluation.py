@@ -0,0 +1,89 @@
+"""Set-based revaluation of holdings after price changes.
+
+Gemstone holdings store ``carats x value_per_carat_oz_gold`` at the time they
+were added. When the catalog value of a stone changes, one ``UPDATE
+player_gemstones ... FROM gemstones`` rewrites every affected holding in the
+database, skipping those flagged ``manual_appraisal``. Metal and material
+holdings store no value; after new price rows land, their latest-price
+valuation is compared with the maintained totals in one grouped SELECT. Either
+way the per-player change is folded into the portfolio totals in the same
+transaction.
+"""
+
+from typing import Iterable
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+
+from ..models.gemstone import Gemstone, PlayerGemstone
+from ..models.portfolio import PlayerPortfolioTotal
+from .commodity_holdings import COMMODITIES, COMMODITY_CATEGORIES, valuation_stmt
+from .portfolio import apply_deltas
+
+
+def revalue_gemstone_holdings(db: Session, gemstone_ids: Iterable[int]) -> int:
+    """Re-price non-manual holdings of the given stones from the catalog. Does not commit.
+
+    Returns the number of holdings rewritten.
+    """
+    ids = list(set(gemstone_ids))
+    if not ids:
+        return 0
+    db.flush()  # catalog edits made through the ORM must be visible to the UPDATE
+    catalog_value = PlayerGemstone.carats * Gemstone.value_per_carat_oz_gold
+    affected = (
+        PlayerGemstone.gemstone_id == Gemstone.id,
+        Gemstone.id.in_(ids),
+        PlayerGemstone.manual_appraisal.is_(False),
+    )
+    deltas = db.execute(
+        select(
+            PlayerGemstone.player_id,
+            func.sum(catalog_value - func.coalesce(PlayerGemstone.appraised_value_oz_gold, 0.0)),
+        )
+        .where(*affected)
+        .group_by(PlayerGemstone.player_id)
+    ).all()
+    apply_deltas(db, [(player_id, "gemstones", delta or 0.0, 0) for player_id, delta in deltas])
+    result = db.execute(
+        update(PlayerGemstone)
+        .where(*affected)
+        .values(appraised_value_oz_gold=catalog_value)
+        .execution_options(synchronize_session=False)
+    )
+    db.expire_all()
+    return result.rowcount or 0
+
+
+def revalue_commodity_holdings(db: Session, kind: str) -> int:
+    """Bring the ``metals``/``materials`` totals up to the latest prices. Does not commit.
+
+    Returns the number of players whose total moved.
+    """
+    category = COMMODITY_CATEGORIES[kind]
+    db.flush()  # price rows added through the ORM must be visible to the valuation
+    holding = COMMODITIES[kind][0]
+    valued = valuation_stmt(kind).where(holding.player_id.is_not(None)).order_by(None).subquery()
+    current = (
+        select(
+            valued.c.player_id,
+            func.coalesce(func.sum(valued.c.value_oz_gold), 0.0).label("value_oz_gold"),
+        )
+        .group_by(valued.c.player_id)
+        .subquery()
+    )
+    deltas = db.execute(
+        select(
+            current.c.player_id,
+            current.c.value_oz_gold - func.coalesce(PlayerPortfolioTotal.value_oz_gold, 0.0),
+        ).outerjoin(
+            PlayerPortfolioTotal,
+            and_(
+                PlayerPortfolioTotal.player_id == current.c.player_id,
+                PlayerPortfolioTotal.category == category,
+            ),
+        )
+    ).all()
+    moved = [(player_id, category, delta, 0) for player_id, delta in deltas if delta]
+    apply_deltas(db, moved)
+    return len(moved)
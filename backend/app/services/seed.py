@@ -0,0 +1,118 @@
+"""Default-data snapshots for the data-management reset endpoints.
+
+Defaults live in ``seeds/defaults.json`` in a columnar form (one column list and
+one row array per table). A reset clears the affected tables and bulk-inserts
+the snapshot rows with a single executemany per table, all inside one
+transaction, so a failed reset leaves the database exactly as it was.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..core.database import Base
+from ..models.session import GlobalState
+from ..utils.cache import mark_cache_dirty
+from .ledger import PLAYER_ACCOUNTS, purge_accounts
+from .portfolio import rebuild_portfolio_totals
+
+SEED_PATH = Path(__file__).resolve().parents[1] / "seeds" / "defaults.json"
+
+# Reset section -> tables it clears, children before parents so deletes never orphan rows.
+# SQLite foreign keys are not enforced here, so the rows that ON DELETE CASCADE would remove
+# are listed explicitly alongside the table that owns them.
+RESET_SECTIONS: dict[str, tuple[str, ...]] = {
+    "sessions": ("income_accruals", "net_worth_history", "global_state"),
+    "gemstones": ("player_gemstones", "gemstones"),
+    "materials": ("material_price_history",),
+    "metals": ("metal_price_history",),
+    "currencies": ("currency_denominations", "currencies"),
+    "banking": ("loans", "account_balances", "ledger_entries"),
+    "users": (
+        "business_investors",
+        "income_accruals",
+        "net_worth_history",
+        "player_gemstones",
+        "player_material_holdings",
+        "player_metal_holdings",
+        "player_portfolio_totals",
+        "loans",
+        "players",
+    ),
+}
+
+# Reset section -> (table, column) references that ON DELETE SET NULL would clear
+RESET_DETACH: dict[str, tuple[tuple[str, str], ...]] = {
+    "users": (
+        ("art_items", "player_id"),
+        ("real_estate_properties", "player_id"),
+        ("inbox_messages", "player_id"),
+        ("inbox_archive", "player_id"),
+    ),
+}
+
+
+# Reset section -> ledger accounts (LIKE patterns) whose transactions go with it
+RESET_LEDGER_ACCOUNTS: dict[str, tuple[str, ...]] = {
+    "users": (PLAYER_ACCOUNTS, "loan:%"),
+}
+
+
+@lru_cache
+def load_seed() -> dict[str, list[dict]]:
+    """Parse the seed snapshot once into ready-to-insert row dicts per table."""
+    raw = json.loads(SEED_PATH.read_text(encoding="utf-8"))
+    return {
+        table: [dict(zip(spec["columns"], row)) for row in spec["rows"]]
+        for table, spec in raw.items()
+    }
+
+
+def restore_defaults(db: Session, sections: Iterable[str] | None = None) -> dict[str, int]:
+    """Replace the given sections (default: all) with the seed snapshot in one transaction.
+
+    Returns the number of rows inserted per table.
+    """
+    selected = list(sections) if sections is not None else list(RESET_SECTIONS)
+    unknown = [s for s in selected if s not in RESET_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown reset section(s): {', '.join(unknown)}")
+
+    seed = load_seed()
+    inserted: dict[str, int] = {}
+    try:
+        # The counter restarts, so anything keyed on session numbers must not match old records
+        epoch = (
+            db.execute(select(func.max(GlobalState.reset_epoch))).scalar()
+            if "sessions" in selected
+            else None
+        )
+        for section in selected:
+            tables = RESET_SECTIONS[section]
+            if section in RESET_LEDGER_ACCOUNTS:
+                purge_accounts(db, RESET_LEDGER_ACCOUNTS[section])
+            for table_name, column in RESET_DETACH.get(section, ()):
+                table = Base.metadata.tables[table_name]
+                db.execute(table.update().where(table.c[column].isnot(None)).values({column: None}))
+            for table_name in tables:
+                db.execute(Base.metadata.tables[table_name].delete())
+            # Parents first on the way back in
+            for table_name in reversed(tables):
+                rows = seed.get(table_name, [])
+                if rows:
+                    db.execute(Base.metadata.tables[table_name].insert(), rows)
+                inserted[table_name] = len(rows)
+        if epoch is not None:
+            db.execute(update(GlobalState).values(reset_epoch=(epoch or 0) + 1))
+        # Holdings (gemstones) or their owners (users) may be gone
+        rebuild_portfolio_totals(db)
+        mark_cache_dirty(db)  # e.g. the cached session counter
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return inserted
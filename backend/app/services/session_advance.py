@@ -0,0 +1,303 @@
+"""Session-advance pipeline.
+
+Advancing the campaign runs a fixed sequence of stages inside a single
+transaction: the counter bump, then ``prices``, ``income``, ``loans``,
+``interest`` and ``snapshots``. Every stage is a handful of set-based
+statements (bulk INSERTs, INSERT ... SELECT, UPDATE over whole tables), never a
+per-row loop, and reports how many rows it wrote and how long it took. If any
+stage fails the whole advance is rolled back, counter included.
+
+Fast-forwarding N sessions must end exactly where N single advances would.
+``prices`` and ``snapshots`` run once over the whole run of session numbers:
+price rows for every session go out in one bulk insert, and snapshots are
+cross-joined with a recursive CTE that enumerates the sessions. ``income``,
+``loans`` and ``interest`` step through the run one session at a time, because
+each session's interest is earned on the balance that session's income and
+repayments left behind. Each step is still a few set-based statements. Income
+is recorded in ``income_accruals`` and credited to the players' bank accounts
+with one bulk ledger posting per session.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Callable, NamedTuple
+
+from sqlalchemy import case, delete, func, insert, literal, select, true, union_all, update
+from sqlalchemy.orm import Session
+
+from ..models.art import RealEstateProperty
+from ..models.business import Business, BusinessInvestor
+from ..models.income import IncomeAccrual
+from ..models.material import MaterialPriceHistory
+from ..models.metal import MetalPriceHistory
+from ..models.portfolio import NetWorthHistory, PlayerPortfolioTotal
+from .commodity_holdings import COMMODITY_CATEGORIES
+from .gm_settings import gm_settings
+from .interest import accrue_interest
+from .ledger import Posting, player_account, post_transactions, to_units
+from .loans import apply_loan_sessions
+from .payouts import payout_stmt
+from .portfolio import apply_deltas
+from .revaluation import revalue_commodity_holdings
+from .scraper import material_price_rows, metal_price_rows
+from .session_state import increment_session_counter
+
+logger = logging.getLogger(__name__)
+
+MAX_FAST_FORWARD = 520  # ten years of weekly sessions
+
+
+class AdvancePlan(NamedTuple):
+    sessions: list[int]  # the session numbers being produced, ascending
+    growth_percent: float
+    interest_percent: float = 0.0
+    interest_compounding: str = "session"
+
+    def growth_factor(self, steps: int) -> float:
+        return (1 + self.growth_percent / 100.0) ** steps
+
+    def steps(self):
+        """Recursive CTE of (step, session_number, growth).
+
+        Growth is relative to the state after the last session.
+        """
+        first = select(
+            literal(1).label("step"),
+            literal(self.sessions[0]).label("session_number"),
+            literal(self.growth_factor(1 - len(self.sessions))).label("growth"),
+        ).cte("steps", recursive=True)
+        return first.union_all(
+            select(
+                first.c.step + 1, first.c.session_number + 1, first.c.growth * self.growth_factor(1)
+            ).where(first.c.step < len(self.sessions))
+        )
+
+
+def _bump_session(db: Session, count: int) -> list[int]:
+    last = increment_session_counter(db, count)
+    return list(range(last - count + 1, last + 1))
+
+
+def _prices_stage(db: Session, plan: AdvancePlan) -> int:
+    # Stagger timestamps so "latest price" lookups see the sessions in order
+    start = datetime.utcnow() - timedelta(milliseconds=len(plan.sessions) - 1)
+    metals, materials = [], []
+    for i, session_number in enumerate(plan.sessions):
+        created_at = start + timedelta(milliseconds=i)
+        metals.extend(metal_price_rows(session_number, created_at))
+        materials.extend(material_price_rows(session_number, created_at))
+    db.execute(insert(MetalPriceHistory), metals)
+    db.execute(insert(MaterialPriceHistory), materials)
+    for kind in COMMODITY_CATEGORIES:
+        revalue_commodity_holdings(db, kind)
+    return len(metals) + len(materials)
+
+
+def income_sources():
+    """SELECT of every (player, source, amount) income row owed each session."""
+    properties = select(
+        RealEstateProperty.player_id.label("player_id"),
+        literal("real_estate").label("source_type"),
+        RealEstateProperty.id.label("source_id"),
+        RealEstateProperty.income_per_session_oz_gold.label("amount_oz_gold"),
+    ).where(
+        RealEstateProperty.player_id.is_not(None),
+        RealEstateProperty.income_per_session_oz_gold != 0,
+    )
+    payouts = payout_stmt().subquery("payouts")
+    businesses = select(
+        payouts.c.player_id,
+        literal("business"),
+        payouts.c.business_id,
+        payouts.c.amount_oz_gold,
+    )
+    return union_all(properties, businesses)
+
+
+def income_source_account(source_type: str, source_id: int) -> str:
+    """Ledger account income is paid out of ("business:<id>", "real_estate:<id>").
+
+    It goes negative as it pays.
+    """
+    return f"{source_type}:{source_id}"
+
+
+def _income_stage(db: Session, plan: AdvancePlan) -> int:
+    # Replace rather than add, so re-running a session never pays twice
+    db.execute(delete(IncomeAccrual).where(IncomeAccrual.session_number.in_(plan.sessions)))
+    owed = income_sources().subquery("owed")
+    steps = plan.steps()
+    result = db.execute(
+        insert(IncomeAccrual).from_select(
+            ["session_number", "player_id", "source_type", "source_id", "amount_oz_gold"],
+            select(
+                steps.c.session_number,
+                owed.c.player_id,
+                owed.c.source_type,
+                owed.c.source_id,
+                owed.c.amount_oz_gold,
+            )
+            .select_from(steps)
+            .join(owed, true()),
+        )
+    )
+    # Credit the accruals to the players' bank accounts: one transaction per session and source
+    legs: dict[tuple, list] = defaultdict(list)
+    accruals = db.execute(
+        select(
+            IncomeAccrual.session_number,
+            IncomeAccrual.source_type,
+            IncomeAccrual.source_id,
+            IncomeAccrual.player_id,
+            IncomeAccrual.amount_oz_gold,
+        )
+        .where(IncomeAccrual.session_number.in_(plan.sessions))
+        .order_by(
+            IncomeAccrual.session_number,
+            IncomeAccrual.source_type,
+            IncomeAccrual.source_id,
+            IncomeAccrual.player_id,
+        )
+    )
+    for session_number, source_type, source_id, player_id, amount in accruals:
+        legs[(session_number, source_type, source_id)].append(
+            (player_account(player_id), to_units(amount))
+        )
+    post_transactions(
+        db,
+        (
+            Posting(
+                "income",
+                [
+                    *credits,
+                    (
+                        income_source_account(source_type, source_id),
+                        -sum(units for _, units in credits),
+                    ),
+                ],
+                f"{source_type.replace('_', ' ').capitalize()} {source_id} income",
+                session_number,
+            )
+            for (session_number, source_type, source_id), credits in legs.items()
+        ),
+    )
+    return result.rowcount or 0
+
+
+def _loans_stage(db: Session, plan: AdvancePlan) -> int:
+    return apply_loan_sessions(db, plan.sessions)
+
+
+def _interest_stage(db: Session, plan: AdvancePlan) -> int:
+    rows = accrue_interest(db, plan.sessions, plan.interest_percent, plan.interest_compounding)
+    if plan.growth_percent:
+        rows += _revalue_businesses(db, plan.growth_factor(len(plan.sessions)))
+    return rows
+
+
+def _revalue_businesses(db: Session, factor: float) -> int:
+    """Scale every business's net worth by `factor` and move its investors' totals to match."""
+    stake = BusinessInvestor.equity_percent / 100.0 * Business.net_worth_oz_gold
+    deltas = db.execute(
+        select(BusinessInvestor.player_id, func.sum(stake * (factor - 1)))
+        .join(Business, Business.id == BusinessInvestor.business_id)
+        .group_by(BusinessInvestor.player_id)
+    ).all()
+    apply_deltas(db, [(player_id, "businesses", delta or 0.0, 0) for player_id, delta in deltas])
+    result = db.execute(
+        update(Business)
+        .values(net_worth_oz_gold=Business.net_worth_oz_gold * factor)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+def _snapshots_stage(db: Session, plan: AdvancePlan) -> int:
+    # Re-running a session (e.g. after a sessions reset) replaces its snapshot
+    db.execute(delete(NetWorthHistory).where(NetWorthHistory.session_number.in_(plan.sessions)))
+    steps = plan.steps()
+    # Only business values move between the sessions of a fast-forward; discount them back per step
+    value = case(
+        (
+            PlayerPortfolioTotal.category == "businesses",
+            PlayerPortfolioTotal.value_oz_gold * steps.c.growth,
+        ),
+        else_=PlayerPortfolioTotal.value_oz_gold,
+    )
+    result = db.execute(
+        insert(NetWorthHistory).from_select(
+            ["player_id", "session_number", "category", "value_oz_gold", "items"],
+            select(
+                PlayerPortfolioTotal.player_id,
+                steps.c.session_number,
+                PlayerPortfolioTotal.category,
+                value,
+                PlayerPortfolioTotal.items,
+            )
+            .select_from(steps)
+            .join(PlayerPortfolioTotal, true()),
+        )
+    )
+    return result.rowcount or 0
+
+
+# (name, stage, per_session): per-session stages read balances the previous session changed,
+# so consecutive ones run together for one session before moving on to the next
+STAGES: tuple[tuple[str, Callable[[Session, AdvancePlan], int], bool], ...] = (
+    ("prices", _prices_stage, False),
+    ("income", _income_stage, True),
+    ("loans", _loans_stage, True),
+    ("interest", _interest_stage, True),
+    ("snapshots", _snapshots_stage, False),
+)
+
+
+def _run_stages(db: Session, plan: AdvancePlan) -> list[dict]:
+    rows: dict[str, int] = {name: 0 for name, _, _ in STAGES}
+    seconds: dict[str, float] = {name: 0.0 for name, _, _ in STAGES}
+    for per_session, grouped in groupby(STAGES, key=lambda entry: entry[2]):
+        group = list(grouped)
+        runs = [plan._replace(sessions=[s]) for s in plan.sessions] if per_session else [plan]
+        for run in runs:
+            for name, stage, _ in group:
+                stage_started = time.perf_counter()
+                rows[name] += stage(db, run)
+                seconds[name] += time.perf_counter() - stage_started
+    return [
+        {"stage": name, "rows": rows[name], "duration_ms": round(seconds[name] * 1000, 3)}
+        for name in rows
+    ]
+
+
+def advance_session(db: Session, count: int = 1) -> dict:
+    """Advance `count` sessions through every stage and commit once; returns per-stage timings."""
+    if not 1 <= count <= MAX_FAST_FORWARD:
+        raise ValueError(f"count must be between 1 and {MAX_FAST_FORWARD}")
+    started = time.perf_counter()
+    try:
+        # A first-ever read only flushes the default settings row; it commits with the advance
+        settings = gm_settings(db)
+        sessions = _bump_session(db, count)
+        plan = AdvancePlan(
+            sessions,
+            settings.growth_factor_percent,
+            settings.interest_rate_percent,
+            settings.interest_compounding,
+        )
+        stages = _run_stages(db, plan)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.expire_all()
+    duration_ms = round((time.perf_counter() - started) * 1000, 3)
+    logger.info(f"Advanced {count} session(s) to {sessions[-1]} in {duration_ms} ms: {stages}")
+    return {
+        "current_session": sessions[-1],
+        "sessions_advanced": count,
+        "stages": stages,
+        "duration_ms": duration_ms,
+    }
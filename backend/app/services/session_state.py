@@ -0,0 +1,85 @@
+"""The campaign session counter.
+
+``global_state`` holds a single row. It is created with an
+``INSERT ... SELECT ... WHERE NOT EXISTS`` so concurrent first reads cannot add
+a second row. Increments are one atomic
+``UPDATE ... SET current_session = current_session + n RETURNING``, so two
+simultaneous clicks always get distinct session numbers. Reads go through an
+epoch cache; an increment invalidates it when its transaction commits, so
+reading the session between advances costs no query.
+"""
+
+from sqlalchemy import exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..models.session import GlobalState
+from ..utils.cache import EpochCache, mark_cache_dirty
+
+_session_cache = EpochCache()
+
+
+def _state_row_id():
+    # Databases from older versions may carry stray extra rows; the oldest one is authoritative
+    return select(func.min(GlobalState.id)).scalar_subquery()
+
+
+def ensure_session_state(db: Session, initial: int = 0) -> bool:
+    """Create the global_state row if it is missing.
+
+    Returns True if it was created. Does not commit.
+    """
+    result = db.execute(
+        insert(GlobalState).from_select(
+            ["current_session"],
+            select(literal(initial)).where(~exists(select(GlobalState.id))),
+        )
+    )
+    if result.rowcount:
+        mark_cache_dirty(db)  # readers may have cached "no row yet"
+    return bool(result.rowcount)
+
+
+def _read_current_session(db: Session, initial: int) -> int:
+    value = db.execute(
+        select(GlobalState.current_session).where(GlobalState.id == _state_row_id())
+    ).scalar()
+    if value is None:
+        # Flush only: a commit here would also commit the caller's pending work. Until a row is
+        # committed, each `initial` caches its own answer; committing one bumps the epoch.
+        ensure_session_state(db, initial)
+        db.flush()
+        value = db.execute(
+            select(GlobalState.current_session).where(GlobalState.id == _state_row_id())
+        ).scalar_one()
+    return value
+
+
+def current_session(db: Session, initial: int = 0) -> int:
+    """The current session number, from cache unless the counter has changed since it was read."""
+    return _session_cache.get(
+        (db.get_bind(), initial), lambda: _read_current_session(db, initial)
+    )
+
+
+def reset_epoch(db: Session) -> int:
+    """How many times the session counter has been reset (0 for a fresh campaign)."""
+    return (
+        db.execute(
+            select(GlobalState.reset_epoch).where(GlobalState.id == _state_row_id())
+        ).scalar()
+        or 0
+    )
+
+
+def increment_session_counter(db: Session, count: int = 1) -> int:
+    """Atomically add `count` to the counter and return the new value. Does not commit."""
+    ensure_session_state(db)
+    new_value = db.execute(
+        update(GlobalState)
+        .where(GlobalState.id == _state_row_id())
+        .values(current_session=GlobalState.current_session + count)
+        .returning(GlobalState.current_session)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    mark_cache_dirty(db)
+    return new_value
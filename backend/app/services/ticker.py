@@ -0,0 +1,165 @@
+"""Live session and price ticker for connected player screens.
+
+When a session advance commits, :meth:`PriceTicker.publish_session` compares the
+session's prices with the last ones it broadcast and publishes a ``tick``: the
+new session number plus only the prices that moved, as parallel arrays. Each
+tick is JSON-encoded once by the broker and the same text frame goes to every
+WebSocket, so fan-out costs no per-client serialization.
+
+Clients get a full ``snapshot`` frame when they connect, again whenever they
+fall behind, and all at once after a reset or restore replaces the data
+(:meth:`PriceTicker.reload`). Every client has a bounded queue; a slow one that fills it
+has its backlog dropped and is sent the current snapshot instead, so one stalled
+socket never holds memory or delays the others.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy.orm import Session
+
+from ..utils.pubsub import Broker, Subscription
+from .scraper import fetch_latest_material_prices, fetch_latest_metal_prices
+from .session_state import current_session
+
+TICKER_TOPIC = "ticker"
+
+PriceBoard = dict[str, tuple[str, float, float]]  # name -> (unit, usd, oz gold)
+
+
+def _columns(board: PriceBoard) -> dict[str, list]:
+    names = sorted(board)
+    return {
+        "name": names,
+        "unit": [board[n][0] for n in names],
+        "usd": [board[n][1] for n in names],
+        "oz_gold": [board[n][2] for n in names],
+    }
+
+
+class PriceTicker:
+    def __init__(self, max_queue: int = 32) -> None:
+        self.broker = Broker(history=1, max_queue=max_queue)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._session: Optional[int] = None
+        self._boards: dict[str, PriceBoard] = {"metals": {}, "materials": {}}
+        self._snapshot = ""
+
+    def _read_boards(self, db: Session, session_number: Optional[int]) -> dict[str, PriceBoard]:
+        return {
+            "metals": {
+                r.metal_name: (r.unit, r.price_per_unit_usd, r.price_per_oz_gold)
+                for r in fetch_latest_metal_prices(db, session_number)
+            },
+            "materials": {
+                r.material_name: (r.unit, r.price_per_unit_usd, r.price_per_oz_gold)
+                for r in fetch_latest_material_prices(db, session_number)
+            },
+        }
+
+    def _encode_snapshot(self) -> dict:
+        frame = {
+            "type": "snapshot",
+            "session": self._session,
+            **{k: _columns(b) for k, b in self._boards.items()},
+        }
+        self._snapshot = json.dumps(frame, separators=(",", ":"))
+        return frame
+
+    def _load(self, db: Session) -> dict:
+        self._boards = self._read_boards(db, None)
+        self._session = current_session(db)
+        self._loaded = True
+        return self._encode_snapshot()
+
+    def snapshot(self, db: Session) -> str:
+        """The full board as one encoded frame, loaded from the database on first use."""
+        with self._lock:
+            if not self._loaded:
+                self._load(db)
+            return self._snapshot
+
+    def join(self, db: Session) -> tuple[Subscription, str]:
+        """Subscribe a new client, then read its snapshot.
+
+        Subscribing first means a tick published while the snapshot is read is
+        queued rather than lost; replaying it over the snapshot is harmless.
+        """
+        subscription, _ = self.broker.subscribe()
+        try:
+            return subscription, self.snapshot(db)
+        except Exception:
+            self.broker.unsubscribe(subscription)
+            raise
+
+    def reload(self, db: Session) -> dict:
+        """Re-read the whole board and push it to every client as a fresh snapshot."""
+        with self._lock:
+            frame = self._load(db)
+        self.broker.publish(TICKER_TOPIC, frame)
+        return frame
+
+    def publish_session(self, db: Session, session_number: int) -> dict:
+        """Broadcast the session number and the prices that changed since the last broadcast."""
+        boards = self._read_boards(db, session_number)
+        with self._lock:
+            delta = {
+                kind: {
+                    name: price
+                    for name, price in board.items()
+                    if self._boards[kind].get(name) != price
+                }
+                for kind, board in boards.items()
+            }
+            for kind, changed in delta.items():
+                self._boards[kind].update(changed)
+            self._session = session_number
+            self._loaded = True
+            self._encode_snapshot()
+        tick = {
+            "type": "tick",
+            "session": session_number,
+            **{k: _columns(changed) for k, changed in delta.items()},
+        }
+        self.broker.publish(TICKER_TOPIC, tick)
+        return tick
+
+    async def serve(self, websocket: WebSocket, subscription: Subscription, snapshot: str) -> None:
+        """Accept `websocket` and pump frames to it until it disconnects.
+
+        `subscription` and `snapshot` come from :meth:`join`; the subscription is
+        released here however the socket ends.
+        """
+        receiver: Optional[asyncio.Future] = None
+        try:
+            await websocket.accept()
+            # Completes (or fails) when the client goes away
+            receiver = asyncio.ensure_future(websocket.receive_text())
+            await websocket.send_text(snapshot)
+            while True:
+                getter = asyncio.ensure_future(subscription.queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, receiver}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    getter.cancel()
+                    if receiver.exception() is not None:
+                        break
+                    # Ignore client chatter
+                    receiver = asyncio.ensure_future(websocket.receive_text())
+                    continue
+                event = getter.result()
+                await websocket.send_text(self._snapshot if event is None else event.data)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self.broker.unsubscribe(subscription)
+            if receiver is not None:
+                receiver.cancel()
+
+
+price_ticker = PriceTicker()
@@ -0,0 +1,65 @@
+"""Process-local read caches invalidated by a global cache epoch.
+
+Writers mark a session with :func:`mark_cache_dirty` when they change data that a
+cached view is derived from; the epoch is bumped only once that transaction
+commits, so readers never cache a value computed from uncommitted rows.
+:class:`EpochCache` keeps one value per key and recomputes it whenever the
+epoch has moved since the value was stored.
+"""
+
+import threading
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_CACHE_DIRTY = "cache_dirty"
+
+_epoch = 0
+_lock = threading.Lock()
+
+
+def cache_epoch() -> int:
+    return _epoch
+
+
+def bump_cache_epoch() -> int:
+    global _epoch
+    with _lock:
+        _epoch += 1
+        return _epoch
+
+
+def mark_cache_dirty(db: Session) -> None:
+    """Bump the cache epoch when `db`'s current transaction commits."""
+    db.info[_CACHE_DIRTY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    if session.info.pop(_CACHE_DIRTY, False):
+        bump_cache_epoch()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_CACHE_DIRTY, None)
+
+
+class EpochCache:
+    """Values computed at a given epoch, reused until the epoch changes."""
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, tuple[int, Any]] = {}
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        epoch = _epoch  # read before computing so a concurrent bump forces a recompute
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == epoch:
+            return entry[1]
+        value = compute()
+        self._entries[key] = (epoch, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
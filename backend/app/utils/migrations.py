@@ -1,14 +1,18 @@
-from typing import TypedDict
+from functools import lru_cache
 from pathlib import Path
+from typing import TypedDict
+
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 try:  # Optional dependency during certain tooling phases
-    from alembic.config import Config  # type: ignore
     from alembic import command  # type: ignore
+    from alembic.config import Config  # type: ignore
+    from alembic.script import ScriptDirectory  # type: ignore
 except Exception:  # pragma: no cover - absence handled dynamically
     Config = None  # type: ignore
     command = None  # type: ignore
+    ScriptDirectory = None  # type: ignore
 
 class MigrationStatus(TypedDict):
     current: str | None
@@ -22,6 +26,16 @@ def _alembic_config():  # return type dynamic to avoid import issues
     return Config(str(Path(__file__).resolve().parents[3] / 'alembic.ini'))
 
 
+@lru_cache
+def head_revision() -> str | None:
+    """The newest revision in the migrations directory (None when alembic is unavailable)."""
+    if Config is None:
+        return None
+    cfg = Config()
+    cfg.set_main_option("script_location", str(Path(__file__).resolve().parents[3] / 'migrations'))
+    return ScriptDirectory.from_config(cfg).get_current_head()
+
+
 def get_migration_status(engine: Engine) -> MigrationStatus:
     cfg = _alembic_config()
     script_dir = None
@@ -0,0 +1,107 @@
+"""In-process publish/subscribe for push endpoints (SSE, WebSockets).
+
+A :class:`Broker` numbers every event and encodes its payload exactly once; each
+subscriber receives the same :class:`Event` object, so fan-out costs no
+per-client serialization. Publishers may run on any thread (sync endpoints run
+in the threadpool); delivery hops onto the subscriber's event loop. A bounded
+history lets a reconnecting client resume after the last event id it saw.
+
+Each subscriber has a bounded queue. A client that falls behind is not allowed
+to hold events for ever: once its queue is full the backlog is dropped and it is
+sent a single ``None``, meaning "you missed events, reload".
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Any, NamedTuple, Optional
+
+
+class Event(NamedTuple):
+    id: int
+    topic: str
+    data: str  # JSON, encoded once at publish time
+    sse: str  # the same event framed for text/event-stream
+
+
+class Subscription:
+    """One subscriber's queue, bound to the event loop it was created on."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[Optional[Event]] = asyncio.Queue(max_queue)
+
+    def _put(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Backpressure: drop the backlog and tell the client to resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    def deliver(self, event: Event) -> bool:
+        """Hand `event` to the subscriber's loop; False if that loop has gone away."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # loop closed
+            return False
+        return True
+
+
+class Broker:
+    def __init__(self, history: int = 1000, max_queue: int = 256) -> None:
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._history: deque[Event] = deque(maxlen=history)
+        self._subscribers: set[Subscription] = set()
+        self._max_queue = max_queue
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def publish(self, topic: str, payload: Any) -> Event:
+        data = json.dumps(payload, default=str, separators=(",", ":"))
+        with self._lock:
+            self._last_id += 1
+            event = Event(
+                self._last_id, topic, data, f"id: {self._last_id}\nevent: {topic}\ndata: {data}\n\n"
+            )
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if not subscription.deliver(event):
+                self.unsubscribe(subscription)
+        return event
+
+    def since(self, last_id: int) -> Optional[list[Event]]:
+        """Events after `last_id`, or None if some of them have already left the history."""
+        with self._lock:
+            if last_id > self._last_id:
+                return None  # an id from before a restart
+            if self._history and last_id < self._history[0].id - 1:
+                return None
+            if not self._history and last_id < self._last_id:
+                return None
+            return [event for event in self._history if event.id > last_id]
+
+    def subscribe(self) -> tuple[Subscription, int]:
+        """Register a subscriber on the running event loop.
+
+        Returns it with the id of the last event published before it joined, read under the
+        same lock, so every later event is queued and no earlier one is.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self._max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+            return subscription, self._last_id
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
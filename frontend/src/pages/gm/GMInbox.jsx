@@ -47,6 +47,23 @@ function GMInbox() {
   useEffect(() => {
     loadMessages();
     loadCurrencies();
+
+    // Apply pushed deltas instead of re-fetching the whole inbox
+    const source = gmService.streamInbox();
+    source.addEventListener('inbox', (event) => {
+      const { op, message, ids } = JSON.parse(event.data);
+      setMessages((prev) => {
+        if (op === 'archived') {
+          const archived = new Set(ids);
+          return prev.filter((m) => !archived.has(m.id));
+        }
+        return op === 'created'
+          ? [message, ...prev.filter((m) => m.id !== message.id)]
+          : prev.map((m) => (m.id === message.id ? message : m));
+      });
+    });
+    source.addEventListener('reset', () => loadMessages());
+    return () => source.close();
   }, []);
 
   const loadMessages = async () => {
@@ -76,6 +93,23 @@ function GMInbox() {
     }
   };
 
+  const pendingRegistrations = messages.filter(
+    (m) => m.type === 'account_registration' && m.status === 'pending'
+  );
+
+  const approveAllRegistrations = async () => {
+    try {
+      const result = await gmService.bulkUpdateInbox(
+        pendingRegistrations.map((m) => ({ message_id: m.id, action: 'approve_account' }))
+      );
+      if (result.failed) {
+        console.error('Some registrations were not approved:', result.results.filter((r) => !r.success));
+      }
+    } catch (error) {
+      console.error('Failed to approve registrations:', error);
+    }
+  };
+
   const handleViewDetails = (message) => {
     setSelectedMessage(message);
     setDetailsDialog(true);
@@ -158,7 +192,7 @@ function GMInbox() {
       } else {
         await gmService.updateMessageStatus(selectedMessage.id, actionType, responseData);
       }
-      await loadMessages(); // Refresh the list
+      // The list updates from the inbox stream
       setActionDialog(false);
       setSelectedMessage(null);
       setActionType('');
@@ -264,6 +298,16 @@ function GMInbox() {
           >
             Refresh
           </Button>
+          {pendingRegistrations.length > 0 && (
+            <Button
+              variant="contained"
+              color="success"
+              onClick={approveAllRegistrations}
+              sx={{ ml: 2 }}
+            >
+              Approve All Registrations ({pendingRegistrations.length})
+            </Button>
+          )}
         </Box>
 
         {/* Messages */}
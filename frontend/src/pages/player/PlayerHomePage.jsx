@@ -54,6 +54,21 @@ const PlayerHomePage = () => {
     fetchData();
   }, []);
 
+  // Apply session ticks pushed by the server instead of waiting for a manual refresh
+  useEffect(() => {
+    const socket = sessionService.openTicker();
+    socket.onmessage = (event) => {
+      const frame = JSON.parse(event.data);
+      const { name, usd } = frame.metals;
+      const changed = Object.fromEntries(name.map((metalName, i) => [metalName, usd[i]]));
+      setSessionData((prev) => ({ ...prev, current_session: frame.session }));
+      setMetalPrices((prev) => prev.map((metal) => (
+        metal.metal_name in changed ? { ...metal, price_per_unit_usd: changed[metal.metal_name] } : metal
+      )));
+    };
+    return () => socket.close();
+  }, []);
+
   if (loading) {
     return <LoadingSpinner />;
   }
@@ -15,6 +15,11 @@ export const sessionService = {
   increment: async () => {
     return await api.post('/sessions/increment');
   },
+  // WebSocket: a `snapshot` frame on connect (and after falling behind), then a `tick` per advance
+  // carrying the new session and only the prices that changed, as parallel arrays.
+  openTicker: () => {
+    return new WebSocket(`${api.defaults.baseURL.replace(/^http/, 'ws')}/sessions/ticker`);
+  },
 };
 
 // Currency Service
@@ -215,18 +220,36 @@ export const gmService = {
   updateSettings: async (settings) => {
     return await api.patch('/gm/settings', settings);
   },
-  getInbox: async () => {
-    return await api.get('/gm/inbox');
+  // params: { player_id, status, type, payload_player_id, item_type, min_amount, max_amount, include_payload, cursor, limit }
+  getInbox: async (params = {}) => {
+    return await api.get('/gm/inbox', { params });
+  },
+  countInbox: async (params = {}) => {
+    return await api.get('/gm/inbox/count', { params });
   },
   getInboxMessage: async (messageId) => {
     return await api.get(`/gm/inbox/${messageId}`);
   },
+  // Settled messages moved out of the live inbox; params: { player_id, status, type, q, cursor, limit }
+  searchInboxArchive: async (params = {}) => {
+    return await api.get('/gm/inbox/archive', { params });
+  },
+  // Server-Sent Events: `inbox` deltas ({ op, message }, or { op: 'archived', ids }) and `reset` when the list must be reloaded.
+  // EventSource reconnects on its own and resumes from the last event id it received.
+  streamInbox: () => {
+    return new EventSource(`${api.defaults.baseURL}/gm/inbox/stream`);
+  },
   updateMessageStatus: async (messageId, status, responseData = null) => {
     return await api.patch(`/gm/inbox/${messageId}/status`, null, {
       params: { status },
       data: responseData ? { response_data: responseData } : {}
     });
   },
+  // actions: [{ message_id, action: 'set_status' | 'approve_account' | 'reject_account', status?, response_data? }]
+  // Applied in one transaction; the response has a per-item { success, detail } result.
+  bulkUpdateInbox: async (actions) => {
+    return await api.post('/gm/inbox/bulk', { actions });
+  },
   createInboxMessage: async (messageType, payload, playerId = null) => {
     return await api.post('/gm/inbox', null, {
       params: { 
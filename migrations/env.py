@@ -1,7 +1,8 @@
+import os
+import sys
 from logging.config import fileConfig
+
 from sqlalchemy import engine_from_config, pool
-from typing import TYPE_CHECKING
-import os, sys
 
 try:
     from alembic import context  # type: ignore
@@ -12,7 +13,19 @@ except Exception:  # pragma: no cover
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.app.core.database import Base  # noqa: E402
-from backend.app.models import player, gemstone, currency, gm, metal, art, business  # noqa: E402
+from backend.app.models import (  # noqa: E402
+    art,
+    business,
+    currency,
+    gemstone,
+    gm,
+    income,
+    ledger,
+    loan,
+    metal,
+    player,
+    portfolio,
+)
 
 __all__ = [
     "player",
@@ -22,6 +35,10 @@ __all__ = [
     "metal",
     "art",
     "business",
+    "portfolio",
+    "income",
+    "ledger",
+    "loan",
 ]
 
 # this is the Alembic Config object, which provides
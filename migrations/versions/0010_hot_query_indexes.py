@@ -0,0 +1,70 @@
+"""Composite indexes for hot query shapes
+
+Revision ID: 0010_hot_query_indexes
+Revises: 0009_default_gemstones
+Create Date: 2026-10-19
+
+Each index mirrors a filter + sort used by the routers and services:
+latest-price lookups, keyset-paginated lists and per-player holdings.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0010_hot_query_indexes'
+down_revision: Union[str, None] = '0009_default_gemstones'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # (index name, table, columns)
+    (
+        "ix_metal_price_history_name_unit_created_at",
+        "metal_price_history",
+        ["metal_name", "unit", "created_at"],
+    ),
+    (
+        "ix_metal_price_history_session_created_at",
+        "metal_price_history",
+        ["session_number", "created_at"],
+    ),
+    ("ix_metal_price_history_created_at", "metal_price_history", ["created_at"]),
+    (
+        "ix_material_price_history_name_unit_created_at",
+        "material_price_history",
+        ["material_name", "unit", "created_at"],
+    ),
+    (
+        "ix_material_price_history_session_created_at",
+        "material_price_history",
+        ["session_number", "created_at"],
+    ),
+    ("ix_material_price_history_created_at", "material_price_history", ["created_at"]),
+    ("ix_inbox_messages_created_at", "inbox_messages", ["created_at"]),
+    ("ix_inbox_messages_status_created_at", "inbox_messages", ["status", "created_at"]),
+    ("ix_inbox_messages_player_created_at", "inbox_messages", ["player_id", "created_at"]),
+    ("ix_player_gemstones_player_created_at", "player_gemstones", ["player_id", "created_at"]),
+    ("ix_player_gemstones_gemstone_id", "player_gemstones", ["gemstone_id"]),
+    ("ix_art_items_created_at", "art_items", ["created_at"]),
+    ("ix_art_items_player_created_at", "art_items", ["player_id", "created_at"]),
+    ("ix_real_estate_properties_created_at", "real_estate_properties", ["created_at"]),
+    (
+        "ix_real_estate_properties_player_created_at",
+        "real_estate_properties",
+        ["player_id", "created_at"],
+    ),
+    ("ix_businesses_created_at", "businesses", ["created_at"]),
+    ("ix_business_investors_business_player", "business_investors", ["business_id", "player_id"]),
+    ("ix_business_investors_player_business", "business_investors", ["player_id", "business_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,59 @@
+"""Player portfolio totals read model
+
+Revision ID: 0011_player_portfolio_totals
+Revises: 0010_hot_query_indexes
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0011_player_portfolio_totals'
+down_revision: Union[str, None] = '0010_hot_query_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'player_portfolio_totals',
+        sa.Column(
+            'player_id',
+            sa.Integer(),
+            sa.ForeignKey('players.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('category', sa.String(), primary_key=True),
+        sa.Column('value_oz_gold', sa.Float(), default=0.0),
+        sa.Column('items', sa.Integer(), default=0),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    # Backfill from existing holdings
+    op.execute(
+        """
+        INSERT INTO player_portfolio_totals (player_id, category, value_oz_gold, items)
+        SELECT player_id, category, COALESCE(SUM(value_oz_gold), 0.0), COUNT(*)
+        FROM (
+            SELECT player_id, 'gemstones' AS category, appraised_value_oz_gold AS value_oz_gold
+            FROM player_gemstones WHERE player_id IS NOT NULL
+            UNION ALL
+            SELECT player_id, 'art', appraised_value_oz_gold
+            FROM art_items WHERE player_id IS NOT NULL
+            UNION ALL
+            SELECT player_id, 'real_estate', appraised_value_oz_gold
+            FROM real_estate_properties WHERE player_id IS NOT NULL
+            UNION ALL
+            SELECT bi.player_id, 'businesses', bi.equity_percent / 100.0 * b.net_worth_oz_gold
+            FROM business_investors bi JOIN businesses b ON b.id = bi.business_id
+            WHERE bi.player_id IS NOT NULL
+        )
+        GROUP BY player_id, category
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('player_portfolio_totals')
@@ -0,0 +1,37 @@
+"""Per-session net worth history
+
+Revision ID: 0012_net_worth_history
+Revises: 0011_player_portfolio_totals
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0012_net_worth_history'
+down_revision: Union[str, None] = '0011_player_portfolio_totals'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'net_worth_history',
+        sa.Column(
+            'player_id',
+            sa.Integer(),
+            sa.ForeignKey('players.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('session_number', sa.Integer(), primary_key=True),
+        sa.Column('category', sa.String(), primary_key=True),
+        sa.Column('value_oz_gold', sa.Float(), default=0.0),
+        sa.Column('items', sa.Integer(), default=0),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('net_worth_history')
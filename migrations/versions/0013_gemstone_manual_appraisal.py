@@ -0,0 +1,29 @@
+"""Manual appraisal flag on gemstone holdings
+
+Revision ID: 0013_gemstone_manual_appraisal
+Revises: 0012_net_worth_history
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0013_gemstone_manual_appraisal'
+down_revision: Union[str, None] = '0012_net_worth_history'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('player_gemstones') as batch_op:
+        batch_op.add_column(
+            sa.Column('manual_appraisal', sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('player_gemstones') as batch_op:
+        batch_op.drop_column('manual_appraisal')
@@ -0,0 +1,42 @@
+"""Player metal and material holdings
+
+Revision ID: 0014_player_commodity_holdings
+Revises: 0013_gemstone_manual_appraisal
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0014_player_commodity_holdings'
+down_revision: Union[str, None] = '0013_gemstone_manual_appraisal'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    ('player_metal_holdings', 'metal_name', 'oz'),
+    ('player_material_holdings', 'material_name', 'lb'),
+)
+
+
+def upgrade() -> None:
+    for table, name_col, default_unit in TABLES:
+        op.create_table(table,
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id', ondelete='CASCADE')),
+            sa.Column(name_col, sa.String()),
+            sa.Column('quantity', sa.Float(), default=0.0),
+            sa.Column('unit', sa.String(), default=default_unit),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index(f'ix_{table}_{name_col}', table, [name_col])
+        op.create_index(f'ix_{table}_player_created_at', table, ['player_id', 'created_at'])
+
+
+def downgrade() -> None:
+    for table, _name_col, _default_unit in TABLES:
+        op.drop_table(table)
@@ -0,0 +1,44 @@
+"""Per-session income accruals
+
+Revision ID: 0015_income_accruals
+Revises: 0014_player_commodity_holdings
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0015_income_accruals'
+down_revision: Union[str, None] = '0014_player_commodity_holdings'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'income_accruals',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('session_number', sa.Integer()),
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id', ondelete='CASCADE')),
+        sa.Column('source_type', sa.String()),
+        sa.Column('source_id', sa.Integer()),
+        sa.Column('amount_oz_gold', sa.Float(), default=0.0),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            'session_number',
+            'source_type',
+            'source_id',
+            'player_id',
+            name='uq_income_accruals_source',
+        ),
+    )
+    op.create_index(
+        'ix_income_accruals_player_session', 'income_accruals', ['player_id', 'session_number']
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('income_accruals')
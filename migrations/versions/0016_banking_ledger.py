@@ -0,0 +1,45 @@
+"""Banking ledger and account balances
+
+Revision ID: 0016_banking_ledger
+Revises: 0015_income_accruals
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0016_banking_ledger'
+down_revision: Union[str, None] = '0015_income_accruals'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ledger_entries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('transaction_id', sa.String()),
+        sa.Column('account', sa.String()),
+        sa.Column('kind', sa.String()),
+        sa.Column('units', sa.Integer()),
+        sa.Column('memo', sa.String(), nullable=True),
+        sa.Column('session_number', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        'ix_ledger_entries_account_created', 'ledger_entries', ['account', 'created_at', 'id']
+    )
+    op.create_index('ix_ledger_entries_transaction', 'ledger_entries', ['transaction_id'])
+    op.create_table('account_balances',
+        sa.Column('account', sa.String(), primary_key=True),
+        sa.Column('units', sa.Integer(), default=0),
+        sa.Column('entries', sa.Integer(), default=0),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('account_balances')
+    op.drop_table('ledger_entries')
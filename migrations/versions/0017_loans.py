@@ -0,0 +1,50 @@
+"""Bank loans
+
+Revision ID: 0017_loans
+Revises: 0016_banking_ledger
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0017_loans'
+down_revision: Union[str, None] = '0016_banking_ledger'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'loans',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id', ondelete='CASCADE')),
+        sa.Column(
+            'inbox_message_id',
+            sa.Integer(),
+            sa.ForeignKey('inbox_messages.id', ondelete='SET NULL'),
+            nullable=True,
+        ),
+        sa.Column('principal_units', sa.Integer()),
+        sa.Column('rate_percent', sa.Float(), default=0.0),
+        sa.Column('term_sessions', sa.Integer()),
+        sa.Column('payment_type', sa.String(), default='per_session'),
+        sa.Column('interest_method', sa.String(), default='flat'),
+        sa.Column('payment_units', sa.Integer(), default=0),
+        sa.Column('balance_units', sa.Integer()),
+        sa.Column('periods_paid', sa.Integer(), default=0),
+        sa.Column('interest_paid_units', sa.Integer(), default=0),
+        sa.Column('status', sa.String(), default='active'),
+        sa.Column('start_session', sa.Integer(), default=0),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_loans_status', 'loans', ['status'])
+    op.create_index('ix_loans_player_id', 'loans', ['player_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('loans')
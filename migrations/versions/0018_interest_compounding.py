@@ -0,0 +1,29 @@
+"""GM setting for how bank interest compounds
+
+Revision ID: 0018_interest_compounding
+Revises: 0017_loans
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0018_interest_compounding'
+down_revision: Union[str, None] = '0017_loans'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('gm_settings') as batch_op:
+        batch_op.add_column(
+            sa.Column('interest_compounding', sa.String(), nullable=False, server_default='session')
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('gm_settings') as batch_op:
+        batch_op.drop_column('interest_compounding')
@@ -0,0 +1,45 @@
+"""Inbox archive
+
+Revision ID: 0019_inbox_archive
+Revises: 0018_interest_compounding
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0019_inbox_archive'
+down_revision: Union[str, None] = '0018_interest_compounding'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'inbox_archive',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('type', sa.String()),
+        sa.Column('status', sa.String()),
+        sa.Column('payload', sa.JSON()),
+        sa.Column('created_at', sa.DateTime(timezone=True)),
+        sa.Column('updated_at', sa.DateTime(timezone=True)),
+        sa.Column(
+            'player_id',
+            sa.Integer(),
+            sa.ForeignKey('players.id', ondelete='SET NULL'),
+            nullable=True,
+        ),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_inbox_archive_type', 'inbox_archive', ['type'])
+    op.create_index('ix_inbox_archive_created_at', 'inbox_archive', ['created_at'])
+    op.create_index(
+        'ix_inbox_archive_player_created_at', 'inbox_archive', ['player_id', 'created_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('inbox_archive')
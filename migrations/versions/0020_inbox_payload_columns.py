@@ -0,0 +1,71 @@
+"""Indexed generated columns for inbox payload keys
+
+Revision ID: 0020_inbox_payload_columns
+Revises: 0019_inbox_archive
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0020_inbox_payload_columns'
+down_revision: Union[str, None] = '0019_inbox_archive'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PAYLOAD_PLAYER_ID = "json_extract(payload, '$.player_id')"
+PAYLOAD_ITEM_TYPE = "json_extract(payload, '$.item_type')"
+PAYLOAD_AMOUNT = (
+    "CAST(coalesce("
+    "json_extract(payload, '$.amount_requested'), "
+    "json_extract(payload, '$.requested_amount'), "
+    "json_extract(payload, '$.investment_amount'), "
+    "json_extract(payload, '$.initial_investment_oz_gold')"
+    ") AS REAL)"
+)
+
+
+def upgrade() -> None:
+    # VIRTUAL generated columns can be added in place (no table rebuild)
+    for table in ('inbox_messages', 'inbox_archive'):
+        op.add_column(
+            table,
+            sa.Column(
+                'payload_player_id', sa.Integer(), sa.Computed(PAYLOAD_PLAYER_ID, persisted=False)
+            ),
+        )
+        op.add_column(
+            table,
+            sa.Column(
+                'payload_item_type', sa.String(), sa.Computed(PAYLOAD_ITEM_TYPE, persisted=False)
+            ),
+        )
+        op.add_column(
+            table,
+            sa.Column('payload_amount', sa.Float(), sa.Computed(PAYLOAD_AMOUNT, persisted=False)),
+        )
+    op.create_index(
+        'ix_inbox_messages_payload_player_created_at',
+        'inbox_messages',
+        ['payload_player_id', 'created_at'],
+    )
+    op.create_index(
+        'ix_inbox_messages_item_type_created_at',
+        'inbox_messages',
+        ['payload_item_type', 'created_at'],
+    )
+    op.create_index('ix_inbox_messages_payload_amount', 'inbox_messages', ['payload_amount'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inbox_messages_payload_amount', 'inbox_messages')
+    op.drop_index('ix_inbox_messages_item_type_created_at', 'inbox_messages')
+    op.drop_index('ix_inbox_messages_payload_player_created_at', 'inbox_messages')
+    for table in ('inbox_archive', 'inbox_messages'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('payload_amount')
+            batch_op.drop_column('payload_item_type')
+            batch_op.drop_column('payload_player_id')
@@ -0,0 +1,88 @@
+"""Never reuse inbox message ids
+
+Revision ID: 0021_inbox_autoincrement
+Revises: 0020_inbox_payload_columns
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0021_inbox_autoincrement'
+down_revision: Union[str, None] = '0020_inbox_payload_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PAYLOAD_PLAYER_ID = "json_extract(payload, '$.player_id')"
+PAYLOAD_ITEM_TYPE = "json_extract(payload, '$.item_type')"
+PAYLOAD_AMOUNT = (
+    "CAST(coalesce("
+    "json_extract(payload, '$.amount_requested'), "
+    "json_extract(payload, '$.requested_amount'), "
+    "json_extract(payload, '$.investment_amount'), "
+    "json_extract(payload, '$.initial_investment_oz_gold')"
+    ") AS REAL)"
+)
+COPIED = "id, type, status, payload, created_at, updated_at, player_id"
+INDEXES = (
+    ('ix_inbox_messages_type', ['type']),
+    ('ix_inbox_messages_status', ['status']),
+    ('ix_inbox_messages_created_at', ['created_at']),
+    ('ix_inbox_messages_status_created_at', ['status', 'created_at']),
+    ('ix_inbox_messages_player_created_at', ['player_id', 'created_at']),
+    ('ix_inbox_messages_payload_player_created_at', ['payload_player_id', 'created_at']),
+    ('ix_inbox_messages_item_type_created_at', ['payload_item_type', 'created_at']),
+    ('ix_inbox_messages_payload_amount', ['payload_amount']),
+)
+
+
+def _rebuild(autoincrement: bool) -> None:
+    # Copy by hand: batch mode cannot carry the generated columns across
+    op.create_table(
+        '_inbox_messages_new',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('type', sa.String()),
+        sa.Column('status', sa.String()),
+        sa.Column('payload', sa.JSON()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column(
+            'player_id',
+            sa.Integer(),
+            sa.ForeignKey('players.id', ondelete='SET NULL'),
+            nullable=True,
+        ),
+        sa.Column(
+            'payload_player_id', sa.Integer(), sa.Computed(PAYLOAD_PLAYER_ID, persisted=False)
+        ),
+        sa.Column(
+            'payload_item_type', sa.String(), sa.Computed(PAYLOAD_ITEM_TYPE, persisted=False)
+        ),
+        sa.Column('payload_amount', sa.Float(), sa.Computed(PAYLOAD_AMOUNT, persisted=False)),
+        sqlite_autoincrement=autoincrement,
+    )
+    op.execute(f"INSERT INTO _inbox_messages_new ({COPIED}) SELECT {COPIED} FROM inbox_messages")
+    op.drop_table('inbox_messages')
+    op.rename_table('_inbox_messages_new', 'inbox_messages')
+    for name, columns in INDEXES:
+        op.create_index(name, 'inbox_messages', columns)
+
+
+def upgrade() -> None:
+    # Archived messages keep their ids, so a plain INTEGER PRIMARY KEY would hand the
+    # highest ones out again once they leave the table.
+    _rebuild(autoincrement=True)
+    # Start the sequence past every id already used, live or archived
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'inbox_messages'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'inbox_messages', max("
+        "coalesce((SELECT max(id) FROM inbox_messages), 0), "
+        "coalesce((SELECT max(id) FROM inbox_archive), 0))"
+    )
+
+
+def downgrade() -> None:
+    _rebuild(autoincrement=False)
@@ -0,0 +1,39 @@
+"""Store metal price_per_oz_gold per price unit for lb/kg metals
+
+Revision ID: 0022_price_per_unit_oz_gold
+Revises: 0021_inbox_autoincrement
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0022_price_per_unit_oz_gold'
+down_revision: Union[str, None] = '0021_inbox_autoincrement'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GOLD_USD = (
+    "(SELECT g.price_per_unit_usd FROM metal_price_history g"
+    " WHERE g.metal_name = 'Gold' AND g.unit = 'oz'"
+    " AND g.session_number = metal_price_history.session_number"
+    " ORDER BY g.created_at DESC, g.id DESC LIMIT 1)"
+)
+
+
+def upgrade() -> None:
+    # The scraper used to store lb/kg metals per ounce; every reader multiplies by price units.
+    # Recompute from the USD price and that session's gold price.
+    op.execute(
+        f"UPDATE metal_price_history SET price_per_oz_gold = price_per_unit_usd / {GOLD_USD}"
+        f" WHERE unit IN ('lb', 'kg') AND {GOLD_USD} > 0"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE metal_price_history SET price_per_oz_gold = price_per_oz_gold / "
+        "CASE unit WHEN 'lb' THEN 16.0 ELSE 35.274 END WHERE unit IN ('lb', 'kg')"
+    )
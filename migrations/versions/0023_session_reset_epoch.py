@@ -0,0 +1,28 @@
+"""Session counter reset epoch
+
+Revision ID: 0023_session_reset_epoch
+Revises: 0022_price_per_unit_oz_gold
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0023_session_reset_epoch'
+down_revision: Union[str, None] = '0022_price_per_unit_oz_gold'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'global_state', sa.Column('reset_epoch', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('global_state') as batch_op:
+        batch_op.drop_column('reset_epoch')
@@ -0,0 +1,56 @@
+"""Metal and material holdings in the portfolio totals
+
+Revision ID: 0024_commodity_portfolio_totals
+Revises: 0023_session_reset_epoch
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0024_commodity_portfolio_totals'
+down_revision: Union[str, None] = '0023_session_reset_epoch'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (category, holding table, price table, name column)
+COMMODITIES = (
+    ('metals', 'player_metal_holdings', 'metal_price_history', 'metal_name'),
+    ('materials', 'player_material_holdings', 'material_price_history', 'material_name'),
+)
+
+OUNCES = (
+    "CASE {unit} WHEN 'oz' THEN 1.0 WHEN 'lb' THEN 16.0 WHEN 'kg' THEN 35.27396195 "
+    "WHEN 'ton' THEN 32000.0 END"
+)
+
+
+def upgrade() -> None:
+    # Backfill at each holding's latest price, as services/commodity_holdings.py values them
+    for category, holdings, prices, name in COMMODITIES:
+        op.execute(
+            f"""
+            INSERT INTO player_portfolio_totals (player_id, category, value_oz_gold, items)
+            SELECT h.player_id, '{category}', COALESCE(SUM(
+                h.quantity
+                * CASE WHEN h.unit = p.unit THEN 1.0
+                  ELSE {OUNCES.format(unit='h.unit')} / {OUNCES.format(unit='p.unit')} END
+                * p.price_per_oz_gold
+            ), 0.0), COUNT(*)
+            FROM {holdings} h
+            LEFT JOIN {prices} p ON p.id = (
+                SELECT id FROM {prices} WHERE {name} = h.{name}
+                ORDER BY created_at DESC, id DESC LIMIT 1
+            )
+            WHERE h.player_id IS NOT NULL
+            GROUP BY h.player_id
+            """
+        )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DELETE FROM player_portfolio_totals WHERE category IN ('metals', 'materials')"
+    )
@@ -1,13 +1,13 @@
-from pathlib import Path
 import sys
+from contextlib import contextmanager
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -19,9 +19,13 @@ from backend.app.models import business as _business_models  # noqa: F401
 from backend.app.models import currency as _currency_models  # noqa: F401
 from backend.app.models import gemstone as _gemstone_models  # noqa: F401
 from backend.app.models import gm as _gm_models  # noqa: F401
+from backend.app.models import income as _income_models  # noqa: F401
+from backend.app.models import ledger as _ledger_models  # noqa: F401
+from backend.app.models import loan as _loan_models  # noqa: F401
 from backend.app.models import material as _material_models  # noqa: F401
 from backend.app.models import metal as _metal_models  # noqa: F401
 from backend.app.models import player as _player_models  # noqa: F401
+from backend.app.models import portfolio as _portfolio_models  # noqa: F401
 from backend.app.models.currency import Currency, CurrencyDenomination, PegType
 
 
@@ -87,6 +91,27 @@ def client(session_factory):
     app.dependency_overrides.pop(get_db, None)
 
 
+@pytest.fixture(scope="function")
+def capture_sql(session_factory):
+    """``with capture_sql() as statements:`` collects the SQL run on the test engine."""
+    engine = session_factory.kw["bind"]
+
+    @contextmanager
+    def capture():
+        statements: list[str] = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+    return capture
+
+
 @pytest.fixture(scope="function")
 def db_session(session_factory):
     db = session_factory()
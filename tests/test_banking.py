@@ -0,0 +1,228 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from backend.app.models.ledger import AccountBalance, LedgerEntry
+from backend.app.models.player import Player
+from backend.app.services.ledger import BANK_CASH, check_integrity, player_account
+
+
+def _player(db_session, name="Saver"):
+    player = Player(name=name)
+    db_session.add(player)
+    db_session.commit()
+    return player
+
+
+def _balance(client: TestClient, player) -> float:
+    return client.get(f"/banking/players/{player.id}/account").json()["balance_oz_gold"]
+
+
+def test_deposit_and_withdraw_post_balanced_entries(client: TestClient, db_session):
+    player = _player(db_session)
+    resp = client.post(
+        f"/banking/players/{player.id}/deposit", json={"amount_oz_gold": 12.5, "memo": "loot"}
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["balance_oz_gold"] == 12.5
+    resp = client.post(f"/banking/players/{player.id}/withdraw", json={"amount_oz_gold": 2.25})
+    assert resp.status_code == 200, resp.text
+
+    account = client.get(f"/banking/players/{player.id}/account").json()
+    assert account == {
+        "player_id": player.id,
+        "account": player_account(player.id),
+        "balance_oz_gold": 10.25,
+        "entries": 2,
+    }
+    # Every transaction has a matching leg on the bank's cash account
+    db_session.expire_all()
+    assert db_session.get(AccountBalance, BANK_CASH).units == -10_250_000
+    assert db_session.query(LedgerEntry).count() == 4
+    assert check_integrity(db_session)["ok"]
+
+
+def test_withdraw_cannot_overdraw(client: TestClient, db_session):
+    player = _player(db_session)
+    client.post(f"/banking/players/{player.id}/deposit", json={"amount_oz_gold": 1.0})
+    resp = client.post(f"/banking/players/{player.id}/withdraw", json={"amount_oz_gold": 1.5})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Insufficient funds"
+    assert client.get(f"/banking/players/{player.id}/account").json()["balance_oz_gold"] == 1.0
+    db_session.expire_all()
+    assert db_session.query(LedgerEntry).count() == 2
+
+    assert (
+        client.post(f"/banking/players/{player.id}/deposit", json={"amount_oz_gold": 0}).status_code
+        == 422
+    )
+    assert (
+        client.post("/banking/players/9999/deposit", json={"amount_oz_gold": 1}).status_code == 404
+    )
+
+
+def test_statement_pages_newest_first(client: TestClient, db_session):
+    player = _player(db_session)
+    for amount in (1, 2, 3, 4, 5):
+        client.post(f"/banking/players/{player.id}/deposit", json={"amount_oz_gold": amount})
+
+    first = client.get(f"/banking/players/{player.id}/statement", params={"limit": 3})
+    assert [e["amount_oz_gold"] for e in first.json()] == [5.0, 4.0, 3.0]
+    cursor = first.headers["X-Next-Cursor"]
+    rest = client.get(
+        f"/banking/players/{player.id}/statement", params={"limit": 3, "cursor": cursor}
+    )
+    assert [e["amount_oz_gold"] for e in rest.json()] == [2.0, 1.0]
+    assert "X-Next-Cursor" not in rest.headers
+    assert all(
+        e["kind"] == "deposit" and e["account"] == player_account(player.id) for e in rest.json()
+    )
+
+
+def test_integrity_check_reports_drift(client: TestClient, db_session):
+    player = _player(db_session)
+    client.post(f"/banking/players/{player.id}/deposit", json={"amount_oz_gold": 3.0})
+    assert client.get("/banking/integrity").json()["ok"] is True
+
+    db_session.execute(
+        update(AccountBalance)
+        .where(AccountBalance.account == player_account(player.id))
+        .values(units=1)
+    )
+    db_session.add(LedgerEntry(transaction_id="stray", account=BANK_CASH, kind="deposit", units=5))
+    db_session.commit()
+    report = client.get("/banking/integrity").json()
+    assert report["ok"] is False
+    assert report["unbalanced_transactions"] == ["stray"]
+    assert {
+        m["account"]: (m["balance_oz_gold"], m["ledger_oz_gold"])
+        for m in report["mismatched_accounts"]
+    } == {
+        BANK_CASH: (-3.0, -2.999995),
+        player_account(player.id): (0.000001, 3.0),
+    }
+
+
+def test_loan_quote_compares_offers(client: TestClient):
+    offers = [
+        {"principal_oz_gold": 100, "rate_percent": 5, "term_sessions": 10},
+        {
+            "principal_oz_gold": 100,
+            "rate_percent": 5,
+            "term_sessions": 10,
+            "interest_method": "declining",
+        },
+        {
+            "principal_oz_gold": 100,
+            "rate_percent": 5,
+            "term_sessions": 10,
+            "payment_type": "lump_sum",
+        },
+    ]
+    resp = client.post("/banking/loans/quote", json={"offers": offers})
+    assert resp.status_code == 200, resp.text
+    flat, declining, lump = resp.json()["offers"]
+    # Same arithmetic as the GM inbox approval dialog: (P + P x r x n) / n
+    assert flat["payment_per_session_oz_gold"] == 15.0
+    assert flat["total_paid_oz_gold"] == 150.0 and flat["total_interest_oz_gold"] == 50.0
+    assert flat["schedule"]["period"] == list(range(1, 11))
+    assert flat["schedule"]["balance_oz_gold"][-1] == 0.0
+    assert declining["total_interest_oz_gold"] < flat["total_interest_oz_gold"]
+    assert (
+        round(sum(declining["schedule"]["payment_oz_gold"]), 6) == declining["total_paid_oz_gold"]
+    )
+    assert lump["schedule"]["payment_oz_gold"] == [0.0] * 9 + [150.0]
+
+
+def test_approved_loan_request_is_repaid_at_session_advance(client: TestClient, db_session):
+    from backend.app.models.gm import InboxMessage
+    from backend.app.models.loan import Loan
+
+    player = _player(db_session, "Borrower")
+    message = InboxMessage(type="loan", payload={"amount_requested": "100.0"}, player_id=player.id)
+    db_session.add(message)
+    db_session.commit()
+
+    terms = {
+        "value": "100",
+        "currency": "oz gold",
+        "interest_rate": 5.0,
+        "term_sessions": 2,
+        "payment_type": "per_session",
+    }
+    resp = client.patch(f"/gm/inbox/{message.id}/status", params={"status": "approved"}, json=terms)
+    assert resp.status_code == 200, resp.text
+    loan_id = client.get(f"/gm/inbox/{message.id}").json()["payload"]["response"]["loan_id"]
+    loan = client.get(f"/banking/loans/{loan_id}").json()
+    assert (loan["player_id"], loan["payment_oz_gold"], loan["status"]) == (
+        player.id,
+        55.0,
+        "active",
+    )
+    assert client.get(f"/banking/players/{player.id}/account").json()["balance_oz_gold"] == 100.0
+
+    resp = client.post("/sessions/advance", params={"count": 3})
+    assert resp.status_code == 200, resp.text
+    assert {s["stage"]: s["rows"] for s in resp.json()["stages"]}["loans"] == 2
+    loan = client.get(f"/banking/loans/{loan_id}").json()
+    assert (
+        loan["status"],
+        loan["periods_paid"],
+        loan["balance_oz_gold"],
+        loan["interest_paid_oz_gold"],
+    ) == ("paid_off", 2, 0.0, 10.0)
+    # Repayments overdraw the account when the borrower has not saved enough
+    assert client.get(f"/banking/players/{player.id}/account").json()["balance_oz_gold"] == -10.0
+    entries = client.get(f"/banking/loans/{loan_id}/statement").json()
+    assert [e["kind"] for e in entries] == ["loan_payment", "loan_payment", "loan_disbursal"]
+    assert client.get("/banking/integrity").json()["ok"] is True
+    db_session.expire_all()
+    assert db_session.query(Loan).count() == 1
+
+
+def test_interest_accrues_once_per_session_for_every_account(client: TestClient, db_session):
+    from backend.app.services.interest import accrue_interest
+
+    saver, small = _player(db_session, "Saver"), _player(db_session, "Small")
+    client.post(f"/banking/players/{saver.id}/deposit", json={"amount_oz_gold": 100})
+    client.post(f"/banking/players/{small.id}/deposit", json={"amount_oz_gold": 50})
+    client.patch(
+        "/gm/settings", json={"interest_rate_percent": 10.0, "interest_compounding": "session"}
+    )
+
+    resp = client.post("/sessions/advance", params={"count": 2})
+    assert resp.status_code == 200, resp.text
+    assert (_balance(client, saver), _balance(client, small)) == (121.0, 60.5)
+    interest = [
+        e
+        for e in client.get(f"/banking/players/{saver.id}/statement").json()
+        if e["kind"] == "interest"
+    ]
+    assert [e["amount_oz_gold"] for e in interest] == [11.0, 10.0]
+
+    # Retrying the same sessions pays nothing
+    sessions = [e["session_number"] for e in interest]
+    assert accrue_interest(db_session, sessions, 10.0) == 0
+    db_session.commit()
+    assert _balance(client, saver) == 121.0
+    assert client.get("/banking/integrity").json()["ok"] is True
+
+    client.patch("/gm/settings", json={"interest_compounding": "simple"})
+    client.post("/sessions/advance", params={"count": 2})
+    # Simple interest is earned on the 100 deposited, not on the 21 already paid
+    assert _balance(client, saver) == 141.0
+    assert client.get("/banking/integrity").json()["ok"] is True
+
+
+def test_interest_is_paid_again_after_a_sessions_reset(client: TestClient, db_session):
+    saver = _player(db_session, "Rewinder")
+    client.post(f"/banking/players/{saver.id}/deposit", json={"amount_oz_gold": 100})
+    client.patch("/gm/settings", json={"interest_rate_percent": 10.0})
+    client.post("/sessions/advance", params={"count": 2})
+    account = f"/banking/players/{saver.id}/account"
+    assert client.get(account).json()["balance_oz_gold"] == 121.0
+
+    # The counter rewinds, so the same session numbers come round again and must earn interest
+    assert client.post("/data-management/reset/sessions").status_code == 200
+    client.post("/sessions/advance", params={"count": 2})
+    assert client.get(account).json()["balance_oz_gold"] == 146.41
+    assert client.get("/banking/integrity").json()["ok"] is True
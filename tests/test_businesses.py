@@ -142,3 +142,38 @@ def test_remove_investor_with_rebalance(client: TestClient, db_session):
     assert round(eq_map[player_a.id], 2) == 62.5
     assert round(eq_map[player_b.id], 2) == 37.5
     assert round(sum(eq_map.values()), 2) == 100.0
+
+
+def test_payout_preview_reconciles_to_the_micro_ounce(client: TestClient, db_session):
+    from backend.app.models.business import Business, BusinessInvestor
+
+    players = [Player(name=f"Thirds {i}") for i in range(3)]
+    guild = Business(name="Thirds Guild", income_per_session_oz_gold=1.0)
+    half = Business(name="Half Owned", income_per_session_oz_gold=5.0)
+    db_session.add_all([*players, guild, half])
+    db_session.flush()
+    db_session.add_all(
+        [
+            BusinessInvestor(business_id=guild.id, player_id=p.id, equity_percent=100 / 3)
+            for p in players
+        ]
+        + [BusinessInvestor(business_id=half.id, player_id=players[0].id, equity_percent=50.0)]
+    )
+    db_session.commit()
+
+    data = client.get("/businesses/payouts/preview").json()
+    payouts = data["payouts"]
+    guild_amounts = [
+        amount
+        for bid, amount in zip(payouts["business_id"], payouts["amount_oz_gold"])
+        if bid == guild.id
+    ]
+    assert sorted(guild_amounts, reverse=True) == [0.333334, 0.333333, 0.333333]
+    # The leftover micro-ounce goes to the lowest player id on a tie
+    first = payouts["player_id"].index(players[0].id)
+    assert payouts["amount_oz_gold"][first] == 0.333334
+
+    businesses = {bid: i for i, bid in enumerate(data["businesses"]["business_id"])}
+    assert data["businesses"]["paid_oz_gold"][businesses[guild.id]] == 1.0
+    assert data["businesses"]["retained_oz_gold"][businesses[guild.id]] == 0.0
+    assert data["businesses"]["retained_oz_gold"][businesses[half.id]] == 2.5
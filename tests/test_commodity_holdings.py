@@ -0,0 +1,195 @@
+from fastapi.testclient import TestClient
+
+from backend.app.models.material import MaterialPriceHistory
+from backend.app.models.metal import MetalPriceHistory
+from backend.app.models.player import Player
+from backend.app.models.portfolio import PlayerPortfolioTotal
+from backend.app.services.scraper import store_material_prices_in_db
+
+
+def _seed_prices(db_session):
+    player = Player(name="Smith")
+    db_session.add_all(
+        [
+            player,
+            MetalPriceHistory(
+                metal_name="Silver",
+                unit="oz",
+                price_per_unit_usd=20.0,
+                price_per_oz_gold=0.01,
+                session_number=1,
+            ),
+            # Newer row wins
+            MetalPriceHistory(
+                metal_name="Silver",
+                unit="oz",
+                price_per_unit_usd=25.0,
+                price_per_oz_gold=0.0125,
+                session_number=2,
+            ),
+            MetalPriceHistory(
+                metal_name="Steel",
+                unit="lb",
+                price_per_unit_usd=0.75,
+                price_per_oz_gold=0.000375,
+                session_number=2,
+            ),
+            MaterialPriceHistory(
+                material_name="Stone",
+                unit="ton",
+                price_per_unit_usd=18.0,
+                price_per_oz_gold=0.009,
+                session_number=2,
+            ),
+            MaterialPriceHistory(
+                material_name="Wood",
+                unit="board ft",
+                price_per_unit_usd=2.5,
+                price_per_oz_gold=0.00125,
+                session_number=2,
+            ),
+        ]
+    )
+    db_session.commit()
+    return player
+
+
+def test_metal_holdings_valued_with_unit_normalisation(client: TestClient, db_session):
+    player = _seed_prices(db_session)
+    silver = client.post(
+        f"/metals/holdings/players/{player.id}",
+        json={"metal_name": "Silver", "quantity": 2, "unit": "lb"},
+    )
+    assert silver.status_code == 200, silver.text
+    steel = client.post(
+        f"/metals/holdings/players/{player.id}",
+        json={"metal_name": "Steel", "quantity": 1, "unit": "ton"},
+    )
+    assert steel.status_code == 200, steel.text
+
+    data = client.get(f"/metals/holdings/players/{player.id}").json()
+    by_name = {h["metal_name"]: h for h in data["holdings"]}
+    assert by_name["Silver"]["value_oz_gold"] == 2 * 16 * 0.0125
+    assert by_name["Silver"]["session_number"] == 2
+    assert round(by_name["Steel"]["value_oz_gold"], 6) == round(2000 * 0.000375, 6)
+    assert round(data["total_oz_gold"], 6) == round(0.4 + 0.75, 6)
+
+    patched = client.patch(
+        f"/metals/holdings/{silver.json()['id']}", json={"quantity": 10, "unit": "oz"}
+    )
+    assert patched.status_code == 200
+    assert client.delete(f"/metals/holdings/{steel.json()['id']}").status_code == 200
+    data = client.get(f"/metals/holdings/players/{player.id}").json()
+    assert [h["value_oz_gold"] for h in data["holdings"]] == [0.125]
+
+
+def test_material_holdings_reject_unconvertible_units(client: TestClient, db_session):
+    player = _seed_prices(db_session)
+    url = f"/materials/holdings/players/{player.id}"
+    assert (
+        client.post(url, json={"material_name": "Stone", "quantity": 500, "unit": "kg"}).status_code
+        == 200
+    )
+    assert (
+        client.post(
+            url, json={"material_name": "Wood", "quantity": 3, "unit": "board ft"}
+        ).status_code
+        == 200
+    )
+    assert (
+        client.post(url, json={"material_name": "Wood", "quantity": 3, "unit": "kg"}).status_code
+        == 400
+    )
+    assert client.post(url, json={"material_name": "Mithril", "quantity": 1}).status_code == 404
+    assert (
+        client.post(
+            "/materials/holdings/players/9999", json={"material_name": "Wood", "quantity": 1}
+        ).status_code
+        == 404
+    )
+
+    data = client.get(url).json()
+    values = {h["material_name"]: h["value_oz_gold"] for h in data["holdings"]}
+    assert round(values["Stone"], 6) == round(500 * 35.27396195 / 32000 * 0.009, 6)
+    assert values["Wood"] == 3 * 0.00125
+
+
+def test_holdings_valued_against_session_advance_prices(client: TestClient, db_session):
+    player = Player(name="Miner")
+    db_session.add(player)
+    db_session.commit()
+    session = client.post("/sessions/increment").json()["current_session"]
+    prices = {
+        r.metal_name: r
+        for r in db_session.query(MetalPriceHistory).filter_by(session_number=session)
+    }
+    gold_usd = prices["Gold"].price_per_unit_usd
+    lb_metal = next(r for r in prices.values() if r.unit == "lb")
+
+    url = f"/metals/holdings/players/{player.id}"
+    client.post(url, json={"metal_name": lb_metal.metal_name, "quantity": 16, "unit": "lb"})
+    client.post(url, json={"metal_name": lb_metal.metal_name, "quantity": 16, "unit": "oz"})
+    values = [h["value_oz_gold"] for h in client.get(url).json()["holdings"]]
+    # 16 lb is worth 16 times the USD price per lb, expressed in gold; 16 oz is one lb
+    expected = 16 * lb_metal.price_per_unit_usd / gold_usd
+    assert [round(v, 9) for v in values] == [round(expected, 9), round(expected / 16, 9)]
+
+
+def _commodity_totals(db_session):
+    db_session.expire_all()
+    return {
+        t.category: (round(t.value_oz_gold, 9), t.items)
+        for t in db_session.query(PlayerPortfolioTotal).filter(
+            PlayerPortfolioTotal.category.in_(["metals", "materials"])
+        )
+    }
+
+
+def test_holdings_and_new_prices_keep_portfolio_totals_in_sync(
+    client: TestClient, db_session
+):
+    player = _seed_prices(db_session)
+    silver = client.post(
+        f"/metals/holdings/players/{player.id}",
+        json={"metal_name": "Silver", "quantity": 2, "unit": "lb"},
+    ).json()
+    client.post(
+        f"/metals/holdings/players/{player.id}",
+        json={"metal_name": "Steel", "quantity": 1, "unit": "ton"},
+    )
+    stone = client.post(
+        f"/materials/holdings/players/{player.id}",
+        json={"material_name": "Stone", "quantity": 2, "unit": "ton"},
+    ).json()
+    client.patch(f"/metals/holdings/{silver['id']}", json={"quantity": 10, "unit": "oz"})
+    assert _commodity_totals(db_session) == {
+        "metals": (round(0.125 + 0.75, 9), 2),
+        "materials": (round(2 * 0.009, 9), 1),
+    }
+
+    # A new Stone price revalues the holding; so does every session advance
+    store_material_prices_in_db(
+        [
+            {
+                "material_name": "Stone",
+                "unit": "ton",
+                "price_per_unit_usd": 20.0,
+                "price_per_oz_gold": 0.01,
+            }
+        ],
+        db_session,
+        3,
+    )
+    assert _commodity_totals(db_session)["materials"] == (0.02, 1)
+    client.delete(f"/materials/holdings/{stone['id']}")
+    assert client.post("/sessions/increment").status_code == 200
+
+    incremental = _commodity_totals(db_session)
+    assert incremental["materials"] == (0.0, 0)
+    net_worth = client.get(f"/players/{player.id}/net-worth").json()
+    categories = {c["category"]: c["value_oz_gold"] for c in net_worth["categories"]}
+    assert round(categories["metals"], 9) == incremental["metals"][0]
+    assert client.post("/data-management/portfolio/rebuild").status_code == 200
+    rebuilt = _commodity_totals(db_session)
+    assert rebuilt["metals"] == incremental["metals"]
+    assert rebuilt.get("materials", (0.0, 0)) == (0.0, 0)
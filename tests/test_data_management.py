@@ -0,0 +1,264 @@
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.app.models.art import ArtItem
+from backend.app.models.currency import Currency
+from backend.app.models.gemstone import Gemstone, PlayerGemstone
+from backend.app.models.metal import MetalPriceHistory
+from backend.app.models.player import Player
+from backend.app.models.session import GlobalState
+from backend.app.services import seed as seed_service
+from backend.app.utils.migrations import head_revision
+
+
+def _stamp(db_session, revision):
+    """Record an alembic revision like a migrated database (tests build the schema directly)."""
+    db_session.execute(
+        text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) PRIMARY KEY)")
+    )
+    db_session.execute(text("DELETE FROM alembic_version"))
+    db_session.execute(
+        text("INSERT INTO alembic_version (version_num) VALUES (:v)"), {"v": revision}
+    )
+    db_session.commit()
+
+
+def test_reset_all_restores_seed_snapshot(client: TestClient, db_session):
+    client.post("/gemstones/", json={"name": "Homebrew Stone", "value_per_carat_oz_gold": 9.0})
+    resp = client.post("/data-management/reset/all")
+    assert resp.status_code == 200, resp.text
+
+    seed = seed_service.load_seed()
+    assert db_session.query(Gemstone).count() == len(seed["gemstones"])
+    assert db_session.query(Gemstone).filter(Gemstone.name == "Homebrew Stone").first() is None
+    assert db_session.query(MetalPriceHistory).count() == len(seed["metal_price_history"])
+    assert db_session.query(GlobalState).one().current_session == 1
+    assert {p.name for p in db_session.query(Player).all()} == {"gm", "player1"}
+    usd = db_session.query(Currency).one()
+    assert usd.name == "USD"
+    assert {d.name for d in usd.denominations} == {"Dollar", "Cent"}
+
+
+def test_failed_reset_leaves_data_untouched(client: TestClient, db_session, monkeypatch):
+    client.post("/gemstones/", json={"name": "Keep Me", "value_per_carat_oz_gold": 1.0})
+    broken = dict(seed_service.load_seed())
+    broken["players"] = [{"no_such_column": 1}]
+    monkeypatch.setattr(seed_service, "load_seed", lambda: broken)
+
+    resp = client.post("/data-management/reset/all")
+    assert resp.status_code == 500
+    names = [g.name for g in db_session.query(Gemstone).all()]
+    assert names == ["Keep Me"]
+
+
+def test_section_reset_only_touches_its_tables(client: TestClient, db_session):
+    client.post("/gemstones/", json={"name": "Untouched", "value_per_carat_oz_gold": 1.0})
+    resp = client.post("/data-management/reset/sessions")
+    assert resp.status_code == 200, resp.text
+    assert db_session.query(GlobalState).one().current_session == 1
+    assert db_session.query(Gemstone).filter(Gemstone.name == "Untouched").first() is not None
+
+
+def test_resets_clear_rows_that_depend_on_reset_tables(client: TestClient, db_session):
+    player = Player(name="Hoarder", password_hash="x")
+    gem = Gemstone(name="Hoard Stone", value_per_carat_oz_gold=1.0)
+    db_session.add_all([player, gem])
+    db_session.flush()
+    db_session.add_all(
+        [
+            PlayerGemstone(player_id=player.id, gemstone_id=gem.id, carats=2.0),
+            ArtItem(name="Heirloom", player_id=player.id),
+        ]
+    )
+    db_session.commit()
+
+    assert client.post("/data-management/reset/gemstones").status_code == 200
+    db_session.expire_all()
+    assert db_session.query(PlayerGemstone).count() == 0
+
+    assert client.post("/data-management/reset/users").status_code == 200
+    db_session.expire_all()
+    assert db_session.query(Player).filter(Player.name == "Hoarder").first() is None
+    assert db_session.query(ArtItem).one().player_id is None
+
+
+def test_users_reset_clears_player_bank_accounts(client: TestClient, db_session):
+    from backend.app.services.ledger import BANK_CASH, get_balance
+
+    assert client.post("/data-management/reset/users").status_code == 200
+    player = db_session.query(Player).filter(Player.name == "player1").one()
+    client.post(f"/banking/players/{player.id}/deposit", json={"amount_oz_gold": 50})
+
+    assert client.post("/data-management/reset/users").status_code == 200
+    # The reseeded player gets the same id, and must not inherit the old account
+    reseeded = db_session.query(Player).filter(Player.name == "player1").one()
+    assert reseeded.id == player.id
+    account = client.get(f"/banking/players/{reseeded.id}/account").json()
+    assert account["balance_oz_gold"] == 0
+    assert client.get(f"/banking/players/{reseeded.id}/statement").json() == []
+    db_session.expire_all()
+    assert get_balance(db_session, BANK_CASH) == (0, 0)
+    assert client.get("/banking/integrity").json()["ok"] is True
+
+
+def test_backup_then_restore_round_trip(client: TestClient, db_session):
+    _stamp(db_session, head_revision())
+    client.post("/gemstones/", json={"name": "Snapshot Gem", "value_per_carat_oz_gold": 2.0})
+    backup = client.get("/data-management/backup")
+    assert backup.status_code == 200, backup.text
+    assert backup.content.startswith(b"SQLite format 3\x00")
+
+    client.post("/gemstones/", json={"name": "After Backup", "value_per_carat_oz_gold": 3.0})
+    restored = client.post(
+        "/data-management/restore",
+        content=backup.content,
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert restored.status_code == 200, restored.text
+
+    names = {g["name"] for g in client.get("/gemstones/").json()}
+    assert "Snapshot Gem" in names
+    assert "After Backup" not in names
+
+
+def test_restore_rejects_backup_from_older_schema(client: TestClient, db_session):
+    _stamp(db_session, "0001_initial")
+    client.post("/gemstones/", json={"name": "Old Schema Gem", "value_per_carat_oz_gold": 2.0})
+    backup = client.get("/data-management/backup")
+    assert backup.status_code == 200, backup.text
+
+    client.post("/gemstones/", json={"name": "Current Gem", "value_per_carat_oz_gold": 3.0})
+    resp = client.post("/data-management/restore", content=backup.content)
+    assert resp.status_code == 400
+    assert "0001_initial" in resp.json()["detail"]
+    assert any(g["name"] == "Current Gem" for g in client.get("/gemstones/").json())
+
+
+def test_restore_rejects_non_sqlite_upload(client: TestClient):
+    client.post("/gemstones/", json={"name": "Still Here", "value_per_carat_oz_gold": 1.0})
+    resp = client.post("/data-management/restore", content=b"definitely not a database")
+    assert resp.status_code == 400
+    assert any(g["name"] == "Still Here" for g in client.get("/gemstones/").json())
+
+
+def test_export_ndjson_selected_tables(client: TestClient, db_session):
+    db_session.add(Player(name="Exporter", password_hash="secret"))
+    db_session.add_all(
+        [
+            MetalPriceHistory(
+                metal_name="Tin",
+                unit="lb",
+                price_per_unit_usd=14.0,
+                price_per_oz_gold=0.01,
+                session_number=s,
+            )
+            for s in range(3)
+        ]
+    )
+    db_session.commit()
+
+    resp = client.get(
+        "/data-management/export", params={"tables": ["metal_price_history", "players"]}
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["table"] for line in lines] == ["metal_price_history"] * 3 + ["players"]
+    assert [line["data"]["session_number"] for line in lines[:3]] == [0, 1, 2]
+    assert "password_hash" not in lines[-1]["data"]
+
+
+def test_export_csv_single_table(client: TestClient):
+    client.post("/gemstones/", json={"name": "Csv Gem", "value_per_carat_oz_gold": 1.25})
+    resp = client.get("/data-management/export", params={"tables": "gemstones", "format": "csv"})
+    assert resp.status_code == 200, resp.text
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert rows[0]["name"] == "Csv Gem"
+    assert float(rows[0]["value_per_carat_oz_gold"]) == 1.25
+
+    bad = client.get(
+        "/data-management/export", params={"tables": ["gemstones", "players"], "format": "csv"}
+    )
+    assert bad.status_code == 400
+    unknown = client.get("/data-management/export", params={"tables": "dragons"})
+    assert unknown.status_code == 400
+
+
+def test_bulk_import_json_document(client: TestClient, db_session):
+    hoarder = Player(name="Hoarder")
+    db_session.add(hoarder)
+    db_session.commit()
+    doc = {
+        "gemstones": [
+            {"name": f"Bulk Gem {i}", "value_per_carat_oz_gold": 0.5 + i} for i in range(50)
+        ],
+        "currencies": [
+            {
+                "name": "Crown",
+                "peg_type": "metal",
+                "peg_target": "Gold",
+                "base_unit_value": 0.01,
+                "denominations": [{"name": "Crown", "value_in_base_units": 1.0}],
+            }
+        ],
+        "holdings": [
+            {"player_name": "Hoarder", "gemstone_name": f"Bulk Gem {i % 50}", "carats": 2.0}
+            for i in range(500)
+        ],
+    }
+    resp = client.post("/data-management/import", json=doc)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["inserted"] == {
+        "gemstones": 50,
+        "currencies": 1,
+        "denominations": 1,
+        "holdings": 500,
+    }
+
+    holdings = client.get(f"/gemstones/players/{hoarder.id}", params={"limit": 500}).json()
+    assert len(holdings) == 500
+    assert holdings[1]["appraised_value_oz_gold"] == 2.0 * 1.5
+
+
+def test_bulk_import_rejects_whole_document_on_error(client: TestClient, db_session):
+    ndjson = "\n".join(
+        json.dumps(line)
+        for line in [
+            {
+                "section": "gemstones",
+                "data": {"name": "Never Saved", "value_per_carat_oz_gold": 1.0},
+            },
+            {
+                "section": "holdings",
+                "data": {"player_name": "Nobody", "gemstone_name": "Never Saved", "carats": 1},
+            },
+            {
+                "section": "holdings",
+                "data": {"player_id": 999, "gemstone_name": "Missing", "carats": 1},
+            },
+        ]
+    )
+    resp = client.post(
+        "/data-management/import", content=ndjson, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert resp.status_code == 422
+    assert len(resp.json()["detail"]) == 3
+    assert db_session.query(Gemstone).filter(Gemstone.name == "Never Saved").first() is None
+
+
+def test_bulk_import_upsert_updates_catalog(client: TestClient, db_session):
+    client.post("/gemstones/", json={"name": "Opal", "value_per_carat_oz_gold": 0.3})
+    doc = {"gemstones": [{"name": "Opal", "value_per_carat_oz_gold": 0.9}]}
+    assert client.post("/data-management/import", json=doc).status_code == 422
+    resp = client.post("/data-management/import", params={"upsert": True}, json=doc)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["updated"]["gemstones"] == 1
+    db_session.expire_all()
+    assert (
+        db_session.query(Gemstone).filter(Gemstone.name == "Opal").one().value_per_carat_oz_gold
+        == 0.9
+    )
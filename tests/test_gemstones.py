@@ -60,3 +60,45 @@ def test_duplicate_without_upsert_then_with_upsert(client: TestClient):
     assert up.status_code == 200, up.text
     data = up.json()
     assert data["value_per_carat_oz_gold"] == 1.5
+
+
+def test_catalog_price_change_revalues_holdings(client: TestClient, db_session):
+    from backend.app.models.portfolio import PlayerPortfolioTotal
+
+    player = ensure_player(db_session, "Revaluer")
+    gem = client.post(
+        "/gemstones/", json={"name": "Reval Topaz", "value_per_carat_oz_gold": 1.0}
+    ).json()
+    priced = client.post(
+        f"/gemstones/players/{player.id}", json={"gemstone_id": gem["id"], "carats": 4}
+    ).json()
+    manual = client.post(
+        f"/gemstones/players/{player.id}",
+        json={"gemstone_id": gem["id"], "carats": 2, "appraised_value_oz_gold": 9.0},
+    ).json()
+    assert manual["manual_appraisal"] is True
+
+    resp = client.put(
+        f"/gemstones/{gem['id']}", json={"name": "Reval Topaz", "value_per_carat_oz_gold": 2.5}
+    )
+    assert resp.status_code == 200, resp.text
+    holdings = {h["id"]: h for h in client.get(f"/gemstones/players/{player.id}").json()}
+    assert holdings[priced["id"]]["appraised_value_oz_gold"] == 10.0
+    assert holdings[manual["id"]]["appraised_value_oz_gold"] == 9.0
+
+    # Upsert path re-prices too; returning a holding to catalog pricing picks up the current price
+    client.post(
+        "/gemstones/",
+        params={"upsert": True},
+        json={"name": "Reval Topaz", "value_per_carat_oz_gold": 3.0},
+    )
+    back = client.patch(
+        f"/gemstones/holdings/{manual['id']}", json={"manual_appraisal": False}
+    ).json()
+    assert back["appraised_value_oz_gold"] == 6.0
+    holdings = {h["id"]: h for h in client.get(f"/gemstones/players/{player.id}").json()}
+    assert holdings[priced["id"]]["appraised_value_oz_gold"] == 12.0
+
+    db_session.expire_all()
+    total = db_session.get(PlayerPortfolioTotal, (player.id, "gemstones"))
+    assert (total.value_oz_gold, total.items) == (18.0, 2)
@@ -23,3 +23,54 @@ def test_patch_toggle_hide_dollar(client: TestClient):
     resp2 = client.patch("/gm/settings", json={"hide_dollar_from_players": False})
     assert resp2.status_code == 200
     assert resp2.json()["hide_dollar_from_players"] is False
+
+
+def test_settings_reads_are_cached_until_patched(client: TestClient, db_session, capture_sql):
+    first = client.get("/gm/settings").json()
+    with capture_sql() as statements:
+        assert client.get("/gm/settings").json() == first
+    assert not any("gm_settings" in s for s in statements)
+
+    resp = client.patch("/gm/settings", json={"exchange_fee_percent": 2.5})
+    assert resp.status_code == 200
+    assert resp.json()["exchange_fee_percent"] == 2.5
+    assert client.get("/gm/settings").json()["exchange_fee_percent"] == 2.5
+
+
+def test_exchange_applies_fee(client: TestClient, db_session):
+    from backend.app.models.currency import Currency, PegType
+
+    db_session.add(
+        Currency(name="Crown", peg_type=PegType.CURRENCY, peg_target="USD", base_unit_value=2.0)
+    )
+    db_session.commit()
+    client.patch("/gm/settings", json={"exchange_fee_percent": 5.0})
+
+    resp = client.post(
+        "/currencies/exchange", json={"amount": 10, "from_currency": "Crown", "to_currency": "USD"}
+    )
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert round(data["rate"], 9) == 1.9
+    assert round(data["converted_amount"], 9) == 19.0
+    assert round(data["fee_amount"], 9) == 1.0
+    assert data["fee_percent"] == 5.0
+    # Converting a currency into itself is not an exchange and carries no fee
+    same = client.post(
+        "/currencies/exchange", json={"amount": 10, "from_currency": "USD", "to_currency": "USD"}
+    ).json()
+    assert (same["converted_amount"], same["fee_amount"]) == (10.0, 0.0)
+    bad = client.post(
+        "/currencies/exchange", json={"amount": 1, "from_currency": "Nope", "to_currency": "USD"}
+    )
+    assert bad.status_code == 400
+
+
+def test_first_settings_read_leaves_the_callers_transaction_open(db_session):
+    from backend.app.models.player import Player
+    from backend.app.services.gm_settings import gm_settings
+
+    db_session.add(Player(name="Uncommitted", password_hash="x"))
+    assert gm_settings(db_session).interest_compounding == "session"
+    db_session.rollback()
+    assert db_session.query(Player).filter(Player.name == "Uncommitted").first() is None
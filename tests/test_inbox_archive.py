@@ -0,0 +1,100 @@
+import json
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from backend.app.models.gm import ArchivedInboxMessage, InboxMessage
+from backend.app.models.player import Player
+from backend.app.services.inbox_archive import archive_inbox
+from backend.app.services.inbox_events import inbox_broker
+
+
+def _seed_inbox(db_session):
+    player = Player(name="Archivist")
+    db_session.add(player)
+    db_session.flush()
+    messages = [
+        InboxMessage(
+            type="appraisal",
+            status="resolved",
+            payload={"item_name": "Silver Chalice"},
+            player_id=player.id,
+        ),
+        InboxMessage(
+            type="loan", status="approved", payload={"purpose": "Ship repairs"}, player_id=player.id
+        ),
+        InboxMessage(
+            type="loan", status="pending", payload={"purpose": "Horses"}, player_id=player.id
+        ),
+    ]
+    db_session.add_all(messages)
+    db_session.commit()
+    return player, messages
+
+
+def test_archive_moves_settled_messages_only(client: TestClient, db_session):
+    player, (chalice, ship, horses) = _seed_inbox(db_session)
+    before = inbox_broker.last_id
+
+    # Nothing is old enough yet
+    assert archive_inbox(db_session, timedelta(days=30)) == []
+    later = datetime.utcnow() + timedelta(days=31)
+    assert archive_inbox(db_session, timedelta(days=30), now=later, batch_size=1) == [
+        chalice.id,
+        ship.id,
+    ]
+
+    assert [m["id"] for m in client.get("/gm/inbox").json()] == [horses.id]
+    archived = db_session.get(ArchivedInboxMessage, ship.id)
+    assert (archived.type, archived.status, archived.payload) == (
+        "loan",
+        "approved",
+        {"purpose": "Ship repairs"},
+    )
+    assert archived.created_at is not None and archived.archived_at is not None
+    # One delta per committed batch
+    assert [json.loads(e.data) for e in inbox_broker.since(before)] == [
+        {"op": "archived", "ids": [chalice.id]},
+        {"op": "archived", "ids": [ship.id]},
+    ]
+
+
+def test_archive_is_searchable(client: TestClient, db_session):
+    player, (chalice, ship, horses) = _seed_inbox(db_session)
+    # The configured threshold (30 days) leaves today's messages alone
+    assert client.post("/gm/inbox/archive").json() == {"success": True, "archived": 0}
+    resp = client.post("/gm/inbox/archive", params={"older_than_days": 0})
+    assert resp.json() == {"success": True, "archived": 2}
+
+    assert [m["id"] for m in client.get("/gm/inbox/archive").json()] == [ship.id, chalice.id]
+    found = client.get("/gm/inbox/archive", params={"q": "chalice"}).json()
+    assert [(m["id"], m["player_username"]) for m in found] == [(chalice.id, "Archivist")]
+    assert (
+        client.get("/gm/inbox/archive", params={"type": "loan", "player_id": player.id}).json()[0][
+            "id"
+        ]
+        == ship.id
+    )
+    assert client.get("/gm/inbox/archive", params={"status": "pending"}).json() == []
+
+    assert client.get(f"/gm/inbox/archive/{ship.id}").json()["payload"] == {
+        "purpose": "Ship repairs"
+    }
+    assert client.get(f"/gm/inbox/archive/{horses.id}").status_code == 404
+    assert client.get(f"/gm/inbox/{ship.id}").status_code == 404
+
+
+def test_ids_are_not_reused_after_archiving(db_session):
+    player, messages = _seed_inbox(db_session)
+    messages[-1].status = "resolved"
+    db_session.commit()
+    later = datetime.utcnow() + timedelta(days=31)
+    first = archive_inbox(db_session, timedelta(days=30), now=later)
+
+    # The table is empty now; the highest id must not come back
+    fresh = InboxMessage(type="appraisal", status="resolved", payload={"item_name": "Lamp"})
+    db_session.add(fresh)
+    db_session.commit()
+    assert fresh.id > max(m.id for m in messages)
+    assert archive_inbox(db_session, timedelta(days=30), now=later) == [fresh.id]
+    assert db_session.query(ArchivedInboxMessage).count() == len(first) + 1
@@ -0,0 +1,171 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.app.models.player import Player
+from backend.app.services.inbox_events import RESET_FRAME, inbox_broker, inbox_stream
+from backend.app.utils.pubsub import Broker
+
+
+def _deltas(since: int) -> list[tuple[str, int, str]]:
+    return [
+        (data["op"], data["message"]["id"], data["message"]["status"])
+        for data in (json.loads(event.data) for event in inbox_broker.since(since))
+    ]
+
+
+def test_inbox_writes_publish_deltas(client: TestClient, db_session):
+    before = inbox_broker.last_id
+    resp = client.post(
+        "/auth/register",
+        json={"username": "newbie", "password": "secret1", "confirm_password": "secret1"},
+    )
+    assert resp.status_code == 200, resp.text
+    player = Player(name="Merchant")
+    db_session.add(player)
+    db_session.commit()
+    resp = client.post("/businesses/petitions", json={"player_id": player.id, "name": "Tannery"})
+    petition_id = resp.json()["message_id"]
+    resp = client.post(
+        "/gm/inbox",
+        params={"message_type": "appraisal", "player_id": player.id},
+        json={"item": "ring"},
+    )
+    appraisal_id = resp.json()["message_id"]
+    client.patch(f"/gm/inbox/{appraisal_id}/status", params={"status": "resolved"})
+
+    deltas = _deltas(before)
+    assert [d[0] for d in deltas] == ["created", "created", "created", "updated"]
+    assert deltas[1:] == [
+        ("created", petition_id, "pending"),
+        ("created", appraisal_id, "pending"),
+        ("updated", appraisal_id, "resolved"),
+    ]
+    first = json.loads(inbox_broker.since(before)[0].data)["message"]
+    assert (first["type"], first["player_username"]) == ("account_registration", "newbie")
+
+
+def _collect(last_event_id, frames_wanted, publish=None):
+    async def run():
+        frames = []
+        polls = 0
+
+        async def is_disconnected():
+            nonlocal polls
+            polls += 1
+            if polls == 2 and publish:
+                publish()
+            return len(frames) >= frames_wanted or polls > 5
+
+        async for frame in inbox_stream(last_event_id, is_disconnected, keepalive=0.01):
+            if not frame.startswith(":"):
+                frames.append(frame)
+        return frames
+
+    return asyncio.run(run())
+
+
+def test_stream_resumes_from_last_event_id():
+    start = inbox_broker.last_id
+    first = inbox_broker.publish("inbox", {"op": "created", "message": {"id": 1}})
+    second = inbox_broker.publish("inbox", {"op": "updated", "message": {"id": 1}})
+    # Resuming replays only what was missed, then live events follow
+    frames = _collect(
+        first.id,
+        2,
+        publish=lambda: inbox_broker.publish("inbox", {"op": "created", "message": {"id": 2}}),
+    )
+    assert frames[0] == second.sse
+    assert frames[1].startswith(f"id: {second.id + 1}\nevent: inbox\n")
+    # An id the broker no longer remembers asks the client to reload
+    assert _collect(start + 10_000, 1) == [RESET_FRAME]
+
+
+def test_slow_subscriber_is_told_to_resync():
+    async def run():
+        broker = Broker(max_queue=2)
+        subscription, _ = broker.subscribe()
+        for i in range(3):
+            broker.publish("inbox", {"n": i})
+        await asyncio.sleep(0)
+        return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+    assert asyncio.run(run()) == [None]
+
+
+def test_subscribe_reports_where_the_queue_starts():
+    async def run():
+        broker = Broker()
+        broker.publish("inbox", {"n": 0})
+        subscription, joined_at = broker.subscribe()
+        broker.publish("inbox", {"n": 1})
+        await asyncio.sleep(0)
+        return joined_at, subscription.queue.get_nowait().id
+
+    # Everything after the returned id is queued, nothing at or before it
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_bulk_actions_commit_once_and_report_each_item(client: TestClient, db_session):
+    for name in ("alice", "bob"):
+        client.post(
+            "/auth/register",
+            json={"username": name, "password": "secret1", "confirm_password": "secret1"},
+        )
+    alice_msg, bob_msg = (
+        m["id"] for m in sorted(client.get("/gm/inbox").json(), key=lambda m: m["id"])
+    )
+    appraisal = client.post(
+        "/gm/inbox", params={"message_type": "appraisal"}, json={"item": "ring"}
+    ).json()["message_id"]
+    before = inbox_broker.last_id
+
+    resp = client.post(
+        "/gm/inbox/bulk",
+        json={
+            "actions": [
+                {"message_id": alice_msg, "action": "approve_account"},
+                {"message_id": bob_msg, "action": "reject_account"},
+                {
+                    "message_id": appraisal,
+                    "action": "set_status",
+                    "status": "resolved",
+                    "response_data": {"value": 3},
+                },
+                {"message_id": appraisal, "action": "approve_account"},
+                {"message_id": 9999, "action": "set_status", "status": "resolved"},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert (data["succeeded"], data["failed"]) == (3, 2)
+    assert [(r["success"], r["detail"]) for r in data["results"][3:]] == [
+        (False, "Message is not an account registration"),
+        (False, "Message not found"),
+    ]
+    assert data["results"][0]["detail"] == "Player 'alice' account has been approved"
+
+    db_session.expire_all()
+    players = {p.name: p for p in db_session.query(Player)}
+    assert players["alice"].is_approved and "bob" not in players
+    statuses = {m["id"]: m["status"] for m in client.get("/gm/inbox").json()}
+    assert [statuses[i] for i in (alice_msg, bob_msg, appraisal)] == [
+        "approved",
+        "rejected",
+        "resolved",
+    ]
+    # One delta per changed message, published after the single commit
+    assert sorted(_deltas(before)) == [
+        ("updated", alice_msg, "approved"),
+        ("updated", bob_msg, "rejected"),
+        ("updated", appraisal, "resolved"),
+    ]
+
+
+def test_bulk_set_status_requires_a_status(client: TestClient):
+    resp = client.post(
+        "/gm/inbox/bulk", json={"actions": [{"message_id": 1, "action": "set_status"}]}
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,166 @@
+from fastapi.testclient import TestClient
+
+from backend.app.models.art import ArtItem, RealEstateProperty
+from backend.app.models.business import Business, BusinessInvestor
+from backend.app.models.gemstone import Gemstone, PlayerGemstone
+from backend.app.models.player import Player
+from backend.app.models.portfolio import PlayerPortfolioTotal
+from backend.app.services.portfolio import rebuild_portfolio_totals
+
+
+def _seed_holdings(db_session):
+    player = Player(name="Magnate")
+    other = Player(name="Bystander")
+    gem = Gemstone(name="NW Ruby", value_per_carat_oz_gold=2.0)
+    biz = Business(name="NW Mill", net_worth_oz_gold=200.0)
+    db_session.add_all([player, other, gem, biz])
+    db_session.flush()
+    db_session.add_all(
+        [
+            PlayerGemstone(
+                player_id=player.id, gemstone_id=gem.id, carats=3, appraised_value_oz_gold=6.0
+            ),
+            PlayerGemstone(
+                player_id=player.id, gemstone_id=gem.id, carats=1, appraised_value_oz_gold=2.0
+            ),
+            PlayerGemstone(
+                player_id=other.id, gemstone_id=gem.id, carats=50, appraised_value_oz_gold=100.0
+            ),
+            ArtItem(name="NW Tapestry", player_id=player.id, appraised_value_oz_gold=12.0),
+            RealEstateProperty(name="NW Manor", player_id=player.id, appraised_value_oz_gold=30.0),
+            BusinessInvestor(business_id=biz.id, player_id=player.id, equity_percent=25.0),
+        ]
+    )
+    db_session.flush()
+    rebuild_portfolio_totals(db_session)
+    db_session.commit()
+    return player
+
+
+def test_net_worth_breakdown(client: TestClient, db_session):
+    player = _seed_holdings(db_session)
+    resp = client.get(f"/players/{player.id}/net-worth", params={"currencies": ["USD"]})
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    by_cat = {c["category"]: c for c in data["categories"]}
+    assert by_cat["gemstones"]["value_oz_gold"] == 8.0
+    assert by_cat["gemstones"]["items"] == 2
+    assert by_cat["art"]["value_oz_gold"] == 12.0
+    assert by_cat["real_estate"]["value_oz_gold"] == 30.0
+    assert by_cat["businesses"]["value_oz_gold"] == 50.0
+    assert data["total_oz_gold"] == 100.0
+    assert round(sum(c["share"] for c in data["categories"]), 6) == 1.0
+    # No gold price stored: conversion falls back to $2000/oz
+    assert data["conversions"]["USD"]["amount"] == 200000.0
+    assert by_cat["art"]["converted"]["USD"] == 24000.0
+
+
+def test_net_worth_empty_and_missing_player(client: TestClient, db_session):
+    player = Player(name="Pauper")
+    db_session.add(player)
+    db_session.commit()
+    data = client.get(f"/players/{player.id}/net-worth").json()
+    assert data["total_oz_gold"] == 0.0
+    assert all(c["value_oz_gold"] == 0.0 for c in data["categories"])
+    assert client.get("/players/9999/net-worth").status_code == 404
+
+
+def _totals(db_session):
+    db_session.expire_all()
+    return {
+        (t.player_id, t.category): (round(t.value_oz_gold, 6), t.items)
+        for t in db_session.query(PlayerPortfolioTotal).all()
+        if t.items or t.value_oz_gold
+    }
+
+
+def test_write_paths_keep_portfolio_totals_in_sync(client: TestClient, db_session):
+    alice, bob = Player(name="Alice"), Player(name="Bob")
+    db_session.add_all([alice, bob])
+    db_session.commit()
+
+    gem_id = client.post(
+        "/gemstones/", json={"name": "Sync Opal", "value_per_carat_oz_gold": 3.0}
+    ).json()["id"]
+    assert (
+        client.post(
+            f"/gemstones/players/{alice.id}", json={"gemstone_id": gem_id, "carats": 2}
+        ).status_code
+        == 200
+    )
+    art_id = client.post("/art/", json={"name": "Sync Bust", "player_id": alice.id}).json()["id"]
+    client.patch(f"/art/{art_id}", json={"appraised_value_oz_gold": 40.0})
+    client.patch(f"/art/{art_id}", json={"player_id": bob.id})
+    biz_id = client.post(
+        "/businesses/", json={"name": "Sync Forge", "net_worth_oz_gold": 100.0}
+    ).json()["id"]
+    client.post(
+        f"/businesses/{biz_id}/investors",
+        json=[
+            {"player_id": alice.id, "equity_percent": 30},
+            {"player_id": bob.id, "equity_percent": 10},
+        ],
+    )
+    client.patch(f"/businesses/{biz_id}", json={"net_worth_oz_gold": 200.0})
+    client.delete(f"/businesses/{biz_id}/investors/{bob.id}", params={"rebalance": True})
+
+    incremental = _totals(db_session)
+    assert incremental[(alice.id, "gemstones")] == (6.0, 1)
+    assert incremental[(bob.id, "art")] == (40.0, 1)
+    assert incremental[(alice.id, "businesses")] == (80.0, 1)
+    assert (bob.id, "businesses") not in incremental
+
+    client.delete(f"/gemstones/{gem_id}")
+    incremental = _totals(db_session)
+    assert (alice.id, "gemstones") not in incremental
+
+    assert client.post("/data-management/portfolio/rebuild").status_code == 200
+    assert _totals(db_session) == incremental
+
+
+
+def test_session_advance_snapshots_net_worth_series(client: TestClient, db_session):
+    player = _seed_holdings(db_session)
+    first = client.post("/sessions/increment").json()["current_session"]
+    client.patch(
+        f"/art/{db_session.query(ArtItem).first().id}", json={"appraised_value_oz_gold": 52.0}
+    )
+    client.post("/sessions/increment")
+
+    series = client.get(f"/players/{player.id}/net-worth/series").json()
+    assert series["sessions"] == [first, first + 1]
+    assert series["categories"]["art"] == [12.0, 52.0]
+    assert series["categories"]["gemstones"] == [8.0, 8.0]
+    assert series["total_oz_gold"] == [100.0, 140.0]
+
+    ranged = client.get(
+        f"/players/{player.id}/net-worth/series", params={"from_session": first + 1}
+    ).json()
+    assert ranged["sessions"] == [first + 1]
+    assert client.get("/players/9999/net-worth/series").status_code == 404
+
+
+def test_gm_wealth_dashboard_columns_and_cache(client: TestClient, db_session, capture_sql):
+    player = _seed_holdings(db_session)
+    first = client.get("/gm/wealth").json()
+    # Tied on 100 oz: same rank, ordered by id
+    assert first["name"] == ["Magnate", "Bystander"]
+    assert first["rank"] == [1, 1]
+    assert first["total_oz_gold"] == [100.0, 100.0]
+    idx = first["player_id"].index(player.id)
+    assert first["categories"]["businesses"][idx] == 50.0
+    assert first["category_shares"]["real_estate"][idx] == 0.3
+    assert round(sum(first["share"]), 6) == 1.0
+    assert first["campaign_total_oz_gold"] == 200.0
+
+    with capture_sql() as statements:
+        again = client.get("/gm/wealth").json()
+    assert again == first
+    assert not any("player_portfolio_totals" in s for s in statements)
+
+    art_id = db_session.query(ArtItem).first().id
+    client.patch(f"/art/{art_id}", json={"appraised_value_oz_gold": 112.0})
+    after = client.get("/gm/wealth").json()
+    assert after["epoch"] > first["epoch"]
+    assert after["player_id"][0] == player.id
+    assert after["total_oz_gold"][0] == 200.0
@@ -0,0 +1,139 @@
+from fastapi.testclient import TestClient
+
+from backend.app.models.business import Business
+from backend.app.models.gm import InboxMessage
+from backend.app.models.metal import MetalPriceHistory
+from backend.app.models.player import Player
+from backend.app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+def test_art_pages_follow_cursor_without_gaps(client: TestClient):
+    for i in range(7):
+        resp = client.post(
+            "/art/", json={"name": f"Relic {i}", "description": "", "player_id": None}
+        )
+        assert resp.status_code == 200, resp.text
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/art/", params=params)
+        assert resp.status_code == 200, resp.text
+        seen.extend(item["name"] for item in resp.json())
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert seen == [f"Relic {i}" for i in range(7)]
+
+
+def test_lists_are_unbounded_without_limit(client: TestClient, db_session):
+    # The frontend reads these lists in one request, so a page size only applies when asked for
+    db_session.add_all([Business(name=f"Shop {i}") for i in range(DEFAULT_PAGE_SIZE + 5)])
+    db_session.commit()
+
+    resp = client.get("/businesses/")
+    assert len(resp.json()) == DEFAULT_PAGE_SIZE + 5
+    assert resp.headers.get("X-Next-Cursor") is None
+    assert client.get("/businesses/", params={"limit": 10}).headers.get("X-Next-Cursor")
+
+
+def test_inbox_filters_and_newest_first(client: TestClient, db_session):
+    player = Player(name="Pager")
+    db_session.add(player)
+    db_session.commit()
+    db_session.add_all(
+        [
+            InboxMessage(type="loan", status="pending", payload={"n": 1}, player_id=player.id),
+            InboxMessage(type="loan", status="approved", payload={"n": 2}, player_id=player.id),
+            InboxMessage(type="appraisal", status="pending", payload={"n": 3}, player_id=None),
+        ]
+    )
+    db_session.commit()
+
+    resp = client.get("/gm/inbox", params={"type": "loan", "player_id": player.id})
+    assert resp.status_code == 200
+    assert [m["payload"]["n"] for m in resp.json()] == [2, 1]
+    assert resp.headers.get("X-Next-Cursor") is None
+
+    pending = client.get("/gm/inbox", params={"status": "pending"}).json()
+    assert {m["payload"]["n"] for m in pending} == {1, 3}
+
+
+
+def test_inbox_filters_on_payload_keys(client: TestClient, db_session):
+    db_session.add_all(
+        [
+            InboxMessage(type="account_registration", payload={"player_id": 7, "username": "neo"}),
+            InboxMessage(type="appraisal", payload={"item_type": "art", "item_name": "Vase"}),
+            InboxMessage(type="loan", payload={"amount_requested": "100.0"}),
+            InboxMessage(type="loan", payload={"requested_amount": 40}),
+        ]
+    )
+    db_session.commit()
+
+    assert [
+        m["payload"]["username"]
+        for m in client.get("/gm/inbox", params={"payload_player_id": 7}).json()
+    ] == ["neo"]
+    art = client.get("/gm/inbox", params={"item_type": "art", "include_payload": False}).json()
+    assert [(m["item_type"], m["payload"]) for m in art] == [("art", None)]
+    loans = client.get("/gm/inbox", params={"min_amount": 50}).json()
+    assert [m["amount"] for m in loans] == [100.0]
+    assert client.get("/gm/inbox/count", params={"type": "loan", "max_amount": 100}).json() == {
+        "count": 2
+    }
+    assert client.get("/gm/inbox/count").json() == {"count": 4}
+
+
+def test_price_history_next_token(client: TestClient, db_session):
+    db_session.add_all(
+        [
+            MetalPriceHistory(
+                metal_name="Gold", unit="oz", price_per_unit_usd=2000.0 + i,
+                price_per_oz_gold=1.0, session_number=i,
+            )
+            for i in range(5)
+        ]
+    )
+    db_session.commit()
+
+    first = client.get("/metals/prices/history", params={"metal_name": "Gold", "limit": 4}).json()
+    assert first["count"] == 4 and first["next"]
+    second = client.get(
+        "/metals/prices/history", params={"metal_name": "Gold", "limit": 4, "cursor": first["next"]}
+    ).json()
+    assert second["count"] == 1 and second["next"] is None
+    ids = [r["id"] for r in first["records"] + second["records"]]
+    assert len(set(ids)) == 5
+
+
+def test_price_history_limit_is_capped_not_rejected(client: TestClient, db_session):
+    db_session.add_all(
+        [
+            MetalPriceHistory(
+                metal_name="Gold", unit="oz", price_per_unit_usd=2000.0 + i,
+                price_per_oz_gold=1.0, session_number=i,
+            )
+            for i in range(MAX_PAGE_SIZE + 1)
+        ]
+    )
+    db_session.commit()
+
+    for path in ("/metals/prices/history", "/materials/prices/history"):
+        assert client.get(path, params={"limit": 1000}).status_code == 200
+    page = client.get(
+        "/metals/prices/history", params={"metal_name": "Gold", "limit": 1000}
+    ).json()
+    assert page["count"] == MAX_PAGE_SIZE and page["next"]
+
+
+def test_invalid_cursor_rejected(client: TestClient):
+    resp = client.get("/art/", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
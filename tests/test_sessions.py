@@ -0,0 +1,203 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.models.art import RealEstateProperty
+from backend.app.models.business import Business, BusinessInvestor
+from backend.app.models.gm import GMSettings
+from backend.app.models.income import IncomeAccrual
+from backend.app.models.material import MaterialPriceHistory
+from backend.app.models.metal import MetalPriceHistory
+from backend.app.models.player import Player
+from backend.app.models.portfolio import NetWorthHistory, PlayerPortfolioTotal
+from backend.app.services.portfolio import rebuild_portfolio_totals
+
+
+def _seed_economy(db_session):
+    owner, partner = Player(name="Landlord"), Player(name="Partner")
+    mill = Business(name="Water Mill", net_worth_oz_gold=100.0, income_per_session_oz_gold=10.0)
+    db_session.add_all([owner, partner, mill, GMSettings(growth_factor_percent=10.0)])
+    db_session.flush()
+    db_session.add_all(
+        [
+            RealEstateProperty(name="Inn", player_id=owner.id, income_per_session_oz_gold=3.0),
+            RealEstateProperty(name="Ruin", player_id=None, income_per_session_oz_gold=99.0),
+            BusinessInvestor(business_id=mill.id, player_id=owner.id, equity_percent=60.0),
+            BusinessInvestor(business_id=mill.id, player_id=partner.id, equity_percent=40.0),
+        ]
+    )
+    db_session.flush()
+    rebuild_portfolio_totals(db_session)  # rows added directly bypass the write paths
+    db_session.commit()
+    return owner, partner, mill
+
+
+def test_increment_runs_every_stage_in_one_transaction(client: TestClient, db_session):
+    owner, partner, mill = _seed_economy(db_session)
+    resp = client.post("/sessions/increment")
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    session = data["current_session"]
+    assert [s["stage"] for s in data["stages"]] == [
+        "prices",
+        "income",
+        "loans",
+        "interest",
+        "snapshots",
+    ]
+    assert all(s["duration_ms"] >= 0 for s in data["stages"])
+    assert client.get("/sessions/state").json()["current_session"] == session
+
+    db_session.expire_all()
+    assert db_session.query(MetalPriceHistory).filter_by(session_number=session).count() > 0
+    assert db_session.query(MaterialPriceHistory).filter_by(session_number=session).count() > 0
+    income = {
+        (a.player_id, a.source_type): a.amount_oz_gold
+        for a in db_session.query(IncomeAccrual).filter_by(session_number=session)
+    }
+    assert income == {
+        (owner.id, "real_estate"): 3.0,
+        (owner.id, "business"): 6.0,
+        (partner.id, "business"): 4.0,
+    }
+    # ... and paid into the players' bank accounts
+    balances = [
+        client.get(f"/banking/players/{p.id}/account").json()["balance_oz_gold"]
+        for p in (owner, partner)
+    ]
+    assert balances == [9.0, 4.0]
+    assert client.get("/banking/integrity").json()["ok"] is True
+    assert round(db_session.get(Business, mill.id).net_worth_oz_gold, 6) == 110.0
+    # Snapshot taken after growth
+    snap = db_session.get(NetWorthHistory, (partner.id, session, "businesses"))
+    assert round(snap.value_oz_gold, 6) == 44.0
+
+
+def test_advance_moves_business_totals_without_a_rebuild(
+    client: TestClient, db_session, capture_sql
+):
+    owner, partner, _ = _seed_economy(db_session)
+    with capture_sql() as statements:
+        assert client.post("/sessions/advance", params={"count": 2}).status_code == 200
+    assert not any(s.startswith("DELETE FROM player_portfolio_totals") for s in statements)
+
+    db_session.expire_all()
+    totals = {
+        t.player_id: round(t.value_oz_gold, 6)
+        for t in db_session.query(PlayerPortfolioTotal).filter_by(category="businesses")
+    }
+    assert totals == {owner.id: round(60 * 1.1**2, 6), partner.id: round(40 * 1.1**2, 6)}
+
+
+def test_increment_rolls_back_when_a_stage_fails(client: TestClient, db_session, monkeypatch):
+    from backend.app.services import session_advance
+
+    before = client.get("/sessions/state").json()["current_session"]
+
+    def _boom(db, session_number):
+        raise RuntimeError("stage failed")
+
+    monkeypatch.setattr(
+        session_advance, "STAGES", session_advance.STAGES[:2] + (("interest", _boom, True),)
+    )
+    assert client.post("/sessions/increment").status_code == 500
+    db_session.expire_all()
+    assert client.get("/sessions/state").json()["current_session"] == before
+    assert db_session.query(MetalPriceHistory).count() == 0
+
+
+@pytest.mark.parametrize("fast_forward", [True, False])
+def test_fast_forward_matches_single_increments(client: TestClient, db_session, fast_forward):
+    saver = Player(name="Saver")
+    db_session.add_all([saver, GMSettings(interest_rate_percent=10.0)])
+    db_session.flush()
+    db_session.add(
+        RealEstateProperty(name="Mill", player_id=saver.id, income_per_session_oz_gold=10.0)
+    )
+    db_session.commit()
+    client.post(f"/banking/players/{saver.id}/deposit", json={"amount_oz_gold": 100})
+
+    if fast_forward:
+        assert client.post("/sessions/advance", params={"count": 3}).status_code == 200
+    else:
+        for _ in range(3):
+            assert client.post("/sessions/increment").status_code == 200
+    # Each session income lands, then earns interest: (((100 + 10) * 1.1 + 10) * 1.1 + 10) * 1.1
+    account = client.get(f"/banking/players/{saver.id}/account").json()
+    assert account["balance_oz_gold"] == 169.51
+    assert client.get("/banking/integrity").json()["ok"] is True
+
+
+def test_fast_forward_persists_every_session(client: TestClient, db_session):
+    owner, partner, mill = _seed_economy(db_session)
+    start = client.get("/sessions/state").json()["current_session"]
+    resp = client.post("/sessions/advance", params={"count": 4})
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["current_session"] == start + 4
+    assert data["sessions_advanced"] == 4
+    sessions = list(range(start + 1, start + 5))
+
+    db_session.expire_all()
+    priced = {s for (s,) in db_session.query(MetalPriceHistory.session_number).distinct()}
+    assert priced == set(sessions)
+    latest = client.get("/metals/prices/current").json()
+    assert latest["prices"][0]["session_number"] == start + 4
+    assert db_session.query(IncomeAccrual).count() == 3 * 4
+    assert round(db_session.get(Business, mill.id).net_worth_oz_gold, 6) == round(100 * 1.1**4, 6)
+
+    series = client.get(f"/players/{partner.id}/net-worth/series").json()
+    assert series["sessions"] == sessions
+    assert [round(v, 6) for v in series["categories"]["businesses"]] == [
+        round(40 * 1.1**k, 6) for k in range(1, 5)
+    ]
+
+    assert client.post("/sessions/advance", params={"count": 0}).status_code == 422
+
+
+def test_session_reads_are_cached_until_the_counter_moves(
+    client: TestClient, db_session, capture_sql
+):
+    from backend.app.models.session import GlobalState
+
+    first = client.get("/sessions/state").json()["current_session"]
+    with capture_sql() as statements:
+        assert client.get("/sessions/state").json()["current_session"] == first
+    assert not any("global_state" in s for s in statements)
+
+    advanced = client.post("/sessions/increment").json()["current_session"]
+    assert advanced == first + 1
+    assert client.get("/sessions/state").json()["current_session"] == advanced
+    db_session.expire_all()
+    assert db_session.query(GlobalState).count() == 1
+
+
+def test_first_session_read_leaves_the_callers_transaction_open(db_session):
+    from backend.app.services.session_state import current_session
+
+    db_session.add(Player(name="Uncommitted", password_hash="x"))
+    assert current_session(db_session) == 0
+    db_session.rollback()
+    assert db_session.query(Player).filter(Player.name == "Uncommitted").first() is None
+
+
+def test_first_session_reads_with_different_initial_values_do_not_share_a_cache(db_session):
+    from backend.app.services.session_state import current_session
+
+    assert current_session(db_session, initial=1) == 1
+    db_session.rollback()  # the row the read created is gone again
+    assert current_session(db_session) == 0
+    db_session.commit()
+    # Once a row is stored, every reader sees it whatever default it passes
+    assert current_session(db_session, initial=1) == 0
+
+
+def test_counter_increment_is_a_single_atomic_update(db_session):
+    from backend.app.models.session import GlobalState
+    from backend.app.services.session_state import increment_session_counter
+
+    # A stray second row (older databases) is never touched; the oldest row is the counter
+    db_session.add_all([GlobalState(current_session=7), GlobalState(current_session=99)])
+    db_session.commit()
+    assert increment_session_counter(db_session, 3) == 10
+    db_session.commit()
+    assert sorted(s.current_session for s in db_session.query(GlobalState)) == [10, 99]
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.app.models.metal import MetalPriceHistory
+from backend.app.routers import data_management, sessions
+from backend.app.services.ticker import PriceTicker
+
+
+def test_ticker_sends_snapshot_then_session_deltas(client: TestClient, db_session, monkeypatch):
+    ticker = PriceTicker()
+    monkeypatch.setattr(sessions, "price_ticker", ticker)
+    with client.websocket_connect("/sessions/ticker") as ws:
+        snapshot = json.loads(ws.receive_text())
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["session"] == client.get("/sessions/state").json()["current_session"]
+
+        session = client.post("/sessions/increment").json()["current_session"]
+        tick = json.loads(ws.receive_text())
+        assert (tick["type"], tick["session"]) == ("tick", session)
+        stored = {
+            r.metal_name: r.price_per_unit_usd
+            for r in db_session.query(MetalPriceHistory).filter_by(session_number=session)
+        }
+        metals = tick["metals"]
+        assert set(metals) == {"name", "unit", "usd", "oz_gold"}
+        assert dict(zip(metals["name"], metals["usd"])) == stored
+        assert len(metals["unit"]) == len(metals["oz_gold"]) == len(stored)
+        assert tick["materials"]["name"]
+
+
+def test_tick_published_while_joining_is_not_lost(db_session):
+    ticker = PriceTicker()
+    read_snapshot = ticker.snapshot
+
+    def snapshot_then_tick(db):
+        frame = read_snapshot(db)
+        ticker.broker.publish("ticker", {"type": "tick", "session": 99})  # advance lands mid-join
+        return frame
+
+    ticker.snapshot = snapshot_then_tick  # type: ignore[method-assign]
+
+    async def run():
+        subscription, _ = ticker.join(db_session)
+        await asyncio.sleep(0)
+        return subscription.queue.get_nowait()
+
+    assert json.loads(asyncio.run(run()).data)["session"] == 99
+
+
+def test_reset_pushes_a_fresh_snapshot(client: TestClient, monkeypatch):
+    ticker = PriceTicker()
+    monkeypatch.setattr(sessions, "price_ticker", ticker)
+    monkeypatch.setattr(data_management, "price_ticker", ticker)
+    with client.websocket_connect("/sessions/ticker") as ws:
+        ws.receive_text()
+        client.post("/sessions/increment")
+        assert json.loads(ws.receive_text())["type"] == "tick"
+
+        assert client.post("/data-management/reset/sessions").status_code == 200
+        snapshot = json.loads(ws.receive_text())
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["session"] == client.get("/sessions/state").json()["current_session"]
+        assert snapshot["metals"]["name"]
+
+
+def test_unchanged_prices_are_left_out_of_the_tick(client: TestClient, db_session):
+    ticker = PriceTicker()
+    session = client.post("/sessions/increment").json()["current_session"]
+    ticker.snapshot(db_session)
+    no_change = {"name": [], "unit": [], "usd": [], "oz_gold": []}
+    assert ticker.publish_session(db_session, session)["metals"] == no_change
+    db_session.query(MetalPriceHistory).filter_by(session_number=session, metal_name="Gold").update(
+        {"price_per_unit_usd": 1.0}
+    )
+    assert ticker.publish_session(db_session, session)["metals"]["name"] == ["Gold"]
+
+
+def test_one_encoded_frame_fans_out_to_every_client():
+    async def run():
+        ticker = PriceTicker(max_queue=1)
+        (fast, _), (slow, _) = ticker.broker.subscribe(), ticker.broker.subscribe()
+        ticker.broker.publish("ticker", {"type": "tick", "session": 1})
+        await asyncio.sleep(0)
+        first = fast.queue.get_nowait()
+        ticker.broker.publish("ticker", {"type": "tick", "session": 2})
+        await asyncio.sleep(0)
+        # The fast client got the same Event object; the stalled one must resync from a snapshot
+        return first, slow.queue.get_nowait(), fast.queue.get_nowait()
+
+    first, slow, second = asyncio.run(run())
+    assert slow is None
+    assert json.loads(first.data)["session"] == 1 and json.loads(second.data)["session"] == 2